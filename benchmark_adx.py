@@ -0,0 +1,65 @@
+import sys
+import time
+import numpy as np
+from src.indicators.technical import calculate_adx
+
+def legacy_calculate_adx(highs, lows, closes, period=14):
+    """
+    Implementasi ADX lama (loop Python) sebagai pembanding
+    """
+    if len(highs) < period + 1:
+        return 25.0
+    tr_values, plus_dm, minus_dm = [], [], []
+    for i in range(1, len(highs)):
+        tr_values.append(max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1])))
+        up_move = highs[i] - highs[i-1]
+        down_move = lows[i-1] - lows[i]
+        plus_dm.append(up_move if up_move > down_move and up_move > 0 else 0)
+        minus_dm.append(down_move if down_move > up_move and down_move > 0 else 0)
+
+    smoothed_tr = [sum(tr_values[:period])]
+    smoothed_plus_dm = [sum(plus_dm[:period])]
+    smoothed_minus_dm = [sum(minus_dm[:period])]
+    for i in range(period, len(tr_values)):
+        smoothed_tr.append(smoothed_tr[-1] - (smoothed_tr[-1] / period) + tr_values[i])
+        smoothed_plus_dm.append(smoothed_plus_dm[-1] - (smoothed_plus_dm[-1] / period) + plus_dm[i])
+        smoothed_minus_dm.append(smoothed_minus_dm[-1] - (smoothed_minus_dm[-1] / period) + minus_dm[i])
+
+    dx_values = []
+    for tr, pdm, mdm in zip(smoothed_tr, smoothed_plus_dm, smoothed_minus_dm):
+        plus_di = (pdm / tr) * 100 if tr != 0 else 0
+        minus_di = (mdm / tr) * 100 if tr != 0 else 0
+        total_di = plus_di + minus_di
+        dx_values.append((abs(plus_di - minus_di) / total_di) * 100 if total_di != 0 else 0)
+
+    if len(dx_values) >= period:
+        return float(sum(dx_values[-period:]) / period)
+    return 25.0
+
+def make_prices(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    closes = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    highs = closes * (1 + rng.uniform(0, 0.003, n))
+    lows = closes * (1 - rng.uniform(0, 0.003, n))
+    return highs.tolist(), lows.tolist(), closes.tolist()
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [300, 10_000, 1_000_000]
+    print(f"{'bars':>10} | {'legacy (ms)':>12} | {'vectorized (ms)':>15} | {'speedup':>8} | {'abs diff':>9}")
+    for n in sizes:
+        highs, lows, closes = make_prices(n)
+        repeat = 5 if n <= 10_000 else 1
+        legacy_value = legacy_calculate_adx(highs, lows, closes)
+        vectorized_value = calculate_adx(highs, lows, closes)
+        legacy_time = best_of(lambda: legacy_calculate_adx(highs, lows, closes), repeat)
+        vectorized_time = best_of(lambda: calculate_adx(highs, lows, closes), repeat)
+        print(f"{n:>10} | {legacy_time * 1000:>12.2f} | {vectorized_time * 1000:>15.2f} | "
+              f"{legacy_time / vectorized_time:>7.1f}x | {abs(legacy_value - vectorized_value):>9.1e}")
@@ -0,0 +1,61 @@
+import sys
+import time
+import numpy as np
+from src.indicators.atr import atr_from_true_range
+from src.indicators.batch import batch_ema, batch_rsi, batch_macd, batch_atr, batch_adx
+from src.indicators.technical import calculate_rsi, calculate_ema, calculate_macd, calculate_adx, true_range
+
+def make_matrix(symbols: int, bars: int, seed: int = 0):
+    """
+    Matriks harga (symbols x bars); sebagian symbol punya histori pendek (NaN di awal)
+    """
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, (symbols, bars)), axis=1))
+    highs = closes * (1 + rng.uniform(0, 0.003, (symbols, bars)))
+    lows = closes * (1 - rng.uniform(0, 0.003, (symbols, bars)))
+    starts = rng.integers(0, bars // 2, symbols) * (rng.uniform(size=symbols) < 0.1)
+    for row, start in enumerate(starts):
+        highs[row, :start] = lows[row, :start] = closes[row, :start] = np.nan
+    return highs, lows, closes
+
+def per_symbol(highs, lows, closes):
+    """
+    Fungsi skalar per symbol (pekerjaan yang dilakukan satu worker process pool)
+    """
+    for high, low, close in zip(highs, lows, closes):
+        valid = np.isfinite(close)
+        high, low, close = high[valid], low[valid], close[valid]
+        calculate_rsi(close)
+        for period in (12, 26, 200):
+            calculate_ema(close, period)
+        calculate_macd(close)
+        atr_from_true_range(true_range(high, low, close))
+        calculate_adx(high, low, close)
+
+def batched(highs, lows, closes):
+    batch_rsi(closes)
+    for period in (12, 26, 200):
+        batch_ema(closes, period)
+    batch_macd(closes)
+    batch_atr(highs, lows, closes)
+    batch_adx(highs, lows, closes)
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+if __name__ == "__main__":
+    # python benchmark_batch_indicators.py [jumlah_symbol ...]
+    universes = [int(arg) for arg in sys.argv[1:]] or [50, 200, 1000]
+    bars = 1000
+    print(f"{'symbols':>8} | {'per-symbol (ms)':>15} | {'batched (ms)':>12} | {'speedup':>8}")
+    for symbols in universes:
+        highs, lows, closes = make_matrix(symbols, bars)
+        per_symbol_time = best_of(lambda: per_symbol(highs, lows, closes), 3)
+        batched_time = best_of(lambda: batched(highs, lows, closes), 3)
+        print(f"{symbols:>8} | {per_symbol_time * 1000:>15.2f} | {batched_time * 1000:>12.2f} | "
+              f"{per_symbol_time / batched_time:>7.1f}x")
@@ -43,4 +43,88 @@ RISK_MANAGEMENT = {
     'min_confidence': 0.50,      # Minimum confidence to trade - disesuaikan berdasarkan hasil backtest untuk keseimbangan optimal
     'atr_multiplier_sl': 2,      # Multiplier untuk ATR stop loss
     'atr_multiplier_tp': 3,      # Multiplier untuk ATR take profit
-}
\ No newline at end of file
+}
+
+# Binance REST API
+BINANCE_BASE_URL = "https://api.binance.com"
+
+BINANCE_WEIGHT_LIMIT = 6000          # Request weight maksimum per menit per IP
+BINANCE_WEIGHT_SAFETY_MARGIN = 0.95  # Sisakan sedikit ruang di bawah batas
+BINANCE_RATE_LIMIT_RETRIES = 3       # Percobaan ulang setelah 429/418 (menunggu Retry-After)
+MATRIX_FETCH_MAX_WORKERS = 8         # Request bersamaan saat mengambil banyak symbol/timeframe
+
+# HTTP client bersama (Binance & Telegram)
+HTTP_POOL_SIZE = 20          # Jumlah koneksi keep-alive per host
+HTTP_MAX_RETRIES = 3         # Jumlah percobaan per request
+HTTP_BACKOFF_BASE = 0.5      # Detik, dikali 2^attempt dengan jitter
+HTTP_BACKOFF_MAX = 8.0       # Batas atas jeda backoff (detik)
+HTTP_DEFAULT_TIMEOUT = 10    # Timeout default (detik)
+HTTP_TIMEOUTS = {            # Timeout per host (detik)
+    'api.binance.com': 10,
+    'api.telegram.org': 15,
+}
+
+# Penyimpanan candle lokal (memory-mapped, satu folder per symbol/interval)
+CANDLE_STORE_DIR = "data/candles"
+
+BACKFILL_PAGE_SIZE = 1000   # Jumlah kline maksimum per request Binance
+BACKFILL_MAX_WORKERS = 4    # Jumlah halaman yang diambil bersamaan saat backfill
+
+# Cache LRU untuk hasil indikator dan analyze_market (per symbol, interval, candle terakhir)
+INDICATOR_CACHE_SIZE = 256
+
+# Timeframe filter tren, dibangun lokal dari candle INTERVAL (tanpa request terpisah)
+HIGHER_INTERVAL = "1h"
+
+# Backtest engine
+BACKTEST_FEE_RATE = 0.001          # Fee per sisi (0.1% taker Binance spot)
+BACKTEST_SLIPPAGE = 0.0005         # Slippage entry dan stop loss (fraksi harga)
+BACKTEST_INITIAL_EQUITY = 10000.0  # Modal awal (USDT)
+
+# Parameter sweep (process pool, satu worker per core)
+SWEEP_MAX_WORKERS = os.cpu_count() or 1
+
+# Walk-forward optimization (jumlah candle INTERVAL per window)
+WALK_FORWARD_TRAIN_BARS = 2000  # Window optimasi parameter
+WALK_FORWARD_TEST_BARS = 500    # Window out-of-sample sesudahnya (juga langkah pergeseran window)
+
+# Resolusi SL/TP di dalam candle: interval sub-bar yang dibaca dari candle store (backtest --intrabar)
+INTRABAR_INTERVAL = "1m"
+
+# Scanner multi-symbol
+SCANNER_QUOTE_ASSET = "USDT"            # Hanya pasangan dengan quote asset ini
+SCANNER_TOP_SYMBOLS = 200               # Jumlah symbol dengan volume 24 jam terbesar yang dipindai
+SCANNER_LOOKBACK = 1000                 # Candle INTERVAL per symbol yang dianalisis
+SCANNER_MAX_WORKERS = os.cpu_count() or 1
+SCANNER_CHUNKS_PER_WORKER = 4           # Jumlah chunk symbol per worker (menyeimbangkan beban)
+
+# Scheduler TradingBot: bangun di setiap batas interval candle (sejajar jam Binance, UTC)
+SCHEDULER_GRACE_SECONDS = 2.0   # Jeda setelah batas interval sebelum candle tertutup diambil
+SCHEDULER_RETRY_SECONDS = 2.0   # Jeda percobaan ulang jika candle tertutup belum tersedia di API
+SCHEDULER_MAX_RETRIES = 15      # Batas percobaan per candle sebelum menunggu candle berikutnya
+
+# Live engine asyncio: banyak symbol x interval dalam satu proses
+LIVE_SYMBOLS = [SYMBOL]
+LIVE_INTERVALS = [INTERVAL]
+LIVE_HIGHER_INTERVALS = {   # Timeframe filter tren per interval stream (di-resample dari candle stream)
+    '1m': '15m',
+    '5m': '1h',
+    '15m': '1h',
+    '30m': '4h',
+    '1h': '4h',
+    '4h': '1d',
+}
+LIVE_QUEUE_SIZE = 256                      # Kapasitas antrian antar tahap (backpressure)
+LIVE_ANALYSIS_WORKERS = os.cpu_count() or 1  # Worker thread analisis (indikator streaming per stream)
+LIVE_FETCH_WORKERS = MATRIX_FETCH_MAX_WORKERS  # Thread I/O untuk sinkronisasi candle store
+LIVE_NOTIFY_WORKERS = 4                    # Thread pengiriman Telegram
+LIVE_FETCH_LIMIT = 99                      # Kline per request saat sinkronisasi rutin (weight 1)
+LIVE_STATE_FILE = "data/live_state.json"
+
+# WebSocket kline stream Binance (combined stream)
+BINANCE_WS_URL = "wss://stream.binance.com:9443"
+BINANCE_WS_MAX_STREAMS = 1024   # Batas stream per koneksi combined stream
+WS_RECONNECT_DELAY = 1.0        # Jeda awal sebelum reconnect (detik), dikali 2 setiap kegagalan
+WS_RECONNECT_DELAY_MAX = 30.0   # Batas atas jeda reconnect (detik)
+WS_PENDING_CANDLES = 100       # Candle tertutup per stream yang menunggu disimpan; yang tertua dibuang lalu diisi ulang dari REST
+LIVE_SOURCE = "websocket"       # Sumber candle live engine: "websocket" (kline stream) atau "rest" (polling di batas candle)
@@ -1,25 +1,32 @@
-from src.data.binance_api import fetch_ohlcv_data, fetch_ohlcv_data_multiple_timeframes
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.data.resample import resample_candles
 from src.strategy.signal_generator import analyze_market
-from config import SYMBOL, INTERVAL
+from src.indicators.cache import get_indicator_cache
+from config import SYMBOL, INTERVAL, HIGHER_INTERVAL
 
-# Ambil data
+# Ambil data dari candle store lokal (hanya candle baru yang diunduh)
 limit = 1000
-data = fetch_ohlcv_data(SYMBOL, INTERVAL, limit)
-higher_timeframe_data = fetch_ohlcv_data(SYMBOL, "1h", limit)
+store = CandleStore(SYMBOL, INTERVAL)
+sync_candle_store(store)
+data = store.tail(limit, as_series=True)
+# Higher timeframe di-resample dari candle yang sama (periode sama, tanpa request tambahan)
+higher_timeframe_data = resample_candles(data, HIGHER_INTERVAL)
 
 print(f"Fetched {len(data)} candles for {INTERVAL}")
-print(f"Fetched {len(higher_timeframe_data)} candles for 1h")
+print(f"Resampled {len(higher_timeframe_data)} candles for {HIGHER_INTERVAL}")
 
 if len(data) > 200:
     # Coba analisis dengan data awal yang cukup
     sample_data = data[200:400] # Ambil 200 candle setelah index 20
-    sample_higher_tf = higher_timeframe_data[200:400] if len(higher_timeframe_data) > 200 else None
+    # analyze_market hanya memakai candle higher timeframe yang sudah tertutup pada candle terakhir sample
+    sample_higher_tf = higher_timeframe_data if len(higher_timeframe_data) > 0 else None
     
     print(f"Sample data length: {len(sample_data)}")
     print(f"Sample higher tf length: {len(sample_higher_tf) if sample_higher_tf else 0}")
     
-    result = analyze_market(sample_data, sample_higher_tf)
+    result = analyze_market(sample_data, sample_higher_tf, symbol=SYMBOL, interval=INTERVAL)
     print(f"Analysis result: {result}")
+    print(f"Indicator cache: {get_indicator_cache().stats()}")
     
     if len(result) > 2:
         print(f"Indicators: {result[2]}")
@@ -0,0 +1,21 @@
+import asyncio
+import sys
+from itertools import product
+from config import LIVE_SYMBOLS, LIVE_INTERVALS, SCANNER_QUOTE_ASSET
+from src.data.binance_api import fetch_top_symbols
+from src.strategy.live_engine import LiveEngine
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+def run_live(symbols, intervals):
+    engine = LiveEngine(list(product(symbols, intervals)))
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        logger.info("Live engine stopped by user")
+
+if __name__ == "__main__":
+    # Opsional: python live.py <jumlah_symbol_teratas> untuk memantau symbol dengan volume terbesar
+    symbols = fetch_top_symbols(SCANNER_QUOTE_ASSET, int(sys.argv[1])) if len(sys.argv) > 1 else LIVE_SYMBOLS
+    run_live(symbols, LIVE_INTERVALS)
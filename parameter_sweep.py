@@ -0,0 +1,36 @@
+import logging
+import sys
+from backtest import load_backtest_data
+from src.backtest.sweep import run_parameter_sweep, format_sweep_table
+from config import SYMBOL, INTERVAL
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger()
+
+# Grid parameter yang diuji; parameter yang tidak disebut memakai nilai config.py
+PARAMETER_GRID = {
+    'min_confidence': [0.40, 0.50, 0.60],
+    'rsi_overbought': [65, 70, 75],
+    'rsi_oversold': [25, 30, 35],
+    'ema_short_period': [9, 12],
+    'ema_long_period': [21, 26],
+    'atr_multiplier_sl': [1.5, 2, 2.5],
+    'atr_multiplier_tp': [2, 3, 4],
+}
+
+def run_sweep(days: int = None, top: int = 20):
+    logger.info(f"Starting parameter sweep for {SYMBOL} {INTERVAL}...")
+    data, higher_timeframe_data = load_backtest_data(days)
+    if not data:
+        logger.error("Failed to fetch data")
+        return
+
+    results = run_parameter_sweep(data, PARAMETER_GRID, higher_timeframe_data)
+    logger.info("-" * 40)
+    logger.info(f"TOP {min(top, len(results))} OF {len(results)} PARAMETER SETS (ranked by net PnL)")
+    logger.info(format_sweep_table(results, top))
+    return results
+
+if __name__ == "__main__":
+    # Opsional: python parameter_sweep.py <jumlah_hari>
+    run_sweep(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,33 @@
+import logging
+import sys
+import time
+from src.data.binance_api import fetch_top_symbols
+from src.strategy.scanner import MarketScanner
+from config import INTERVAL, SCANNER_QUOTE_ASSET, SCANNER_TOP_SYMBOLS
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger()
+
+def run_scan(count: int = SCANNER_TOP_SYMBOLS, top: int = 20):
+    symbols = fetch_top_symbols(SCANNER_QUOTE_ASSET, count)
+    logger.info(f"Scanning {len(symbols)} {SCANNER_QUOTE_ASSET} pairs on {INTERVAL}...")
+
+    with MarketScanner(symbols) as scanner:
+        started = time.monotonic()
+        scanner.sync()
+        synced = time.monotonic()
+        results = scanner.analyze()
+        finished = time.monotonic()
+
+    logger.info(f"Sync: {synced - started:.2f}s | Analysis: {finished - synced:.2f}s | Failed: {len(scanner.errors)}")
+    logger.info("-" * 40)
+    for rank, result in enumerate(results[:top], start=1):
+        indicators = result['indicators']
+        logger.info(f"{rank:3d}. {result['symbol']:<12} | {result['signal']:<4} | Conf: {result['confidence']:.2f} | "
+                    f"Price: {result['price']:.6g} | RSI: {indicators.get('rsi', 0):.1f} | ADX: {indicators.get('adx', 0):.1f}")
+    logger.info("-" * 40)
+    return results
+
+if __name__ == "__main__":
+    # Opsional: python scanner.py <jumlah_symbol>
+    run_scan(int(sys.argv[1]) if len(sys.argv) > 1 else SCANNER_TOP_SYMBOLS)
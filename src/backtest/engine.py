@@ -0,0 +1,199 @@
+import numpy as np
+from typing import List, Dict, Tuple, Union
+from config import BACKTEST_FEE_RATE, BACKTEST_SLIPPAGE, BACKTEST_INITIAL_EQUITY, RISK_MANAGEMENT
+from src.data.intrabar import SubBarResolver
+from src.data.candle_series import CandleSeries, candle_column
+
+# Jumlah bar pertama yang diperiksa saat mencari exit; diperbesar dua kali lipat jika belum ketemu
+EXIT_SEARCH_CHUNK = 256
+
+
+def signal_directions(signals) -> np.ndarray:
+    """
+    Mengubah array sinyal (BUY/SELL/HOLD atau angka +1/-1/0) menjadi arah posisi +1/-1/0
+    """
+    signals = np.asarray(signals)
+    if signals.dtype.kind in ('U', 'S', 'O'):
+        return np.where(signals == "BUY", 1, np.where(signals == "SELL", -1, 0)).astype(np.int8)
+    return np.sign(signals).astype(np.int8)
+
+
+def find_first_exit(highs: np.ndarray, lows: np.ndarray, start: int, side: int, stop_loss: float,
+                    take_profit: float, chunk: int = EXIT_SEARCH_CHUNK) -> Tuple[int, bool, bool]:
+    """
+    Mencari bar pertama mulai `start` yang menyentuh stop loss atau take profit (vektor per blok)
+    Returns: (index bar, sl_hit, tp_hit); index -1 jika tidak pernah tersentuh
+    """
+    n = len(highs)
+    while start < n:
+        stop = min(start + chunk, n)
+        high = highs[start:stop]
+        low = lows[start:stop]
+        if side > 0:
+            sl_hit = low <= stop_loss
+            tp_hit = high >= take_profit
+        else:
+            sl_hit = high >= stop_loss
+            tp_hit = low <= take_profit
+        hits = np.flatnonzero(sl_hit | tp_hit)
+        if len(hits):
+            offset = hits[0]
+            return start + offset, bool(sl_hit[offset]), bool(tp_hit[offset])
+        start = stop
+        chunk *= 2
+    return -1, False, False
+
+
+def run_signal_backtest(data: Union[CandleSeries, List[Dict]], signals, atr, sl_multiplier: float = None,
+                        tp_multiplier: float = None, fee_rate: float = BACKTEST_FEE_RATE,
+                        slippage: float = BACKTEST_SLIPPAGE, max_positions: int = 1, position_size: float = 1.0,
+                        initial_equity: float = BACKTEST_INITIAL_EQUITY, sub_bars: SubBarResolver = None) -> Dict:
+    """
+    Mensimulasikan entry/exit dari array sinyal yang sejajar dengan candle.
+
+    - Entry di close bar sinyal (ditambah slippage berlawanan arah), SL/TP dari ATR bar tersebut
+    - Exit pada bar pertama setelah entry yang menyentuh SL atau TP; jika keduanya tersentuh pada
+      bar yang sama, diasumsikan SL (konservatif) dan trade ditandai `ambiguous` kecuali sub-bar
+      menunjukkan TP tersentuh lebih dulu
+    - Stop loss dan exit END terisi dengan slippage, take profit (limit) tepat di levelnya; fee dikenakan per sisi
+    - max_positions=1: sinyal baru hanya diambil setelah bar exit posisi sebelumnya;
+      lebih dari 1 mengizinkan beberapa posisi terbuka sekaligus
+    - Setiap posisi memakai notional position_size * initial_equity
+    - Posisi yang masih terbuka di akhir data ditutup di close terakhir (exit_reason "END");
+      sinyal pada bar terakhir diabaikan karena tidak ada bar setelahnya untuk exit
+    - sub_bars (SubBarResolver, opsional): bar ambigu diselesaikan dengan sub-bar (mis. 1m) dari candle
+      store; hanya bar ambigu yang membaca sub-bar, sisanya tetap memakai high/low candle biasa
+
+    Returns: dict dengan 'trades' (trade log), 'equity' (equity mark-to-market per bar) dan 'stats'
+    """
+    if sl_multiplier is None:
+        sl_multiplier = RISK_MANAGEMENT['atr_multiplier_sl']
+    if tp_multiplier is None:
+        tp_multiplier = RISK_MANAGEMENT['atr_multiplier_tp']
+
+    highs = np.asarray(candle_column(data, 'high'), dtype=float)
+    lows = np.asarray(candle_column(data, 'low'), dtype=float)
+    closes = np.asarray(candle_column(data, 'close'), dtype=float)
+    close_times = np.asarray(candle_column(data, 'close_time'), dtype=np.int64)
+    open_times = np.asarray(candle_column(data, 'open_time'), dtype=np.int64) if sub_bars is not None else None
+    directions = signal_directions(signals)
+    atr = np.asarray(atr, dtype=float)
+    n = len(closes)
+    notional = position_size * initial_equity
+
+    trades = []
+    open_exits = []  # index bar exit posisi yang sedang terbuka
+    for i in np.flatnonzero((directions[:-1] != 0) & (atr[:-1] > 0)):
+        open_exits = [exit_index for exit_index in open_exits if exit_index >= i]
+        if len(open_exits) >= max_positions:
+            continue
+
+        side = int(directions[i])
+        signal_price = closes[i]
+        stop_loss = signal_price - side * sl_multiplier * atr[i]
+        take_profit = signal_price + side * tp_multiplier * atr[i]
+        entry_price = signal_price * (1 + side * slippage)
+
+        exit_index, sl_hit, tp_hit = find_first_exit(highs, lows, i + 1, side, stop_loss, take_profit)
+        ambiguous = sl_hit and tp_hit
+        intrabar = None
+        if ambiguous and sub_bars is not None:
+            intrabar = sub_bars.first_touch(side, open_times[exit_index], close_times[exit_index], stop_loss, take_profit)
+            if intrabar == "TP":
+                sl_hit = False
+
+        if exit_index < 0:
+            exit_index = n - 1
+            exit_reason = "END"
+            exit_price = closes[-1] * (1 - side * slippage)
+        elif sl_hit:
+            exit_reason = "SL"
+            exit_price = stop_loss * (1 - side * slippage)
+        else:
+            exit_reason = "TP"
+            exit_price = take_profit
+
+        quantity = notional / entry_price
+        fees = fee_rate * quantity * (entry_price + exit_price)
+        pnl = side * quantity * (exit_price - entry_price) - fees
+        trades.append({
+            'type': "BUY" if side > 0 else "SELL",
+            'entry_index': int(i),
+            'exit_index': int(exit_index),
+            'entry_time': int(close_times[i]),
+            'exit_time': int(close_times[exit_index]),
+            'entry_price': float(entry_price),
+            'exit_price': float(exit_price),
+            'sl': float(stop_loss),
+            'tp': float(take_profit),
+            'exit_reason': exit_reason,
+            'ambiguous': ambiguous,
+            'intrabar_resolved': intrabar is not None,
+            'fees': float(fees),
+            'pnl': float(pnl),
+            'pnl_pct': float(pnl / notional * 100),
+            'result': "WIN" if pnl > 0 else "LOSS"
+        })
+        open_exits.append(exit_index)
+
+    equity = equity_curve(trades, closes, initial_equity, notional, fee_rate)
+    return {'trades': trades, 'equity': equity, 'stats': summarize_trades(trades, equity, initial_equity)}
+
+
+def equity_curve(trades: List[Dict], closes: np.ndarray, initial_equity: float, notional: float,
+                 fee_rate: float) -> np.ndarray:
+    """
+    Equity per bar: PnL trade yang sudah ditutup + PnL belum terealisasi posisi terbuka (mark-to-market)
+    Dibangun dengan difference array sehingga biayanya O(bar + trade).
+    """
+    n = len(closes)
+    realized = np.zeros(n)
+    exposure = np.zeros(n + 1)  # sum(side * quantity) posisi terbuka
+    cost_basis = np.zeros(n + 1)  # sum(side * quantity * entry_price) posisi terbuka
+    for trade in trades:
+        side = 1 if trade['type'] == "BUY" else -1
+        quantity = notional / trade['entry_price']
+        entry, exit_ = trade['entry_index'], trade['exit_index']
+        # Fee entry langsung terealisasi; sisa PnL terealisasi pada bar exit
+        entry_fee = fee_rate * quantity * trade['entry_price']
+        realized[entry] -= entry_fee
+        realized[exit_] += trade['pnl'] + entry_fee
+        exposure[entry] += side * quantity
+        exposure[exit_] -= side * quantity
+        cost_basis[entry] += side * quantity * trade['entry_price']
+        cost_basis[exit_] -= side * quantity * trade['entry_price']
+
+    unrealized = np.cumsum(exposure[:n]) * closes - np.cumsum(cost_basis[:n])
+    return initial_equity + np.cumsum(realized) + unrealized
+
+
+def summarize_trades(trades: List[Dict], equity: np.ndarray, initial_equity: float) -> Dict:
+    """
+    Ringkasan hasil backtest: jumlah trade, win rate, PnL bersih, fee, profit factor, max drawdown
+    """
+    pnls = np.array([trade['pnl'] for trade in trades], dtype=float)
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls <= 0]
+    drawdown = np.zeros(0)
+    if len(equity):
+        peak = np.maximum.accumulate(equity)
+        drawdown = (peak - equity) / peak
+
+    if losses.sum() < 0:
+        profit_factor = float(wins.sum() / -losses.sum())
+    else:
+        profit_factor = float('inf') if len(wins) else 0.0
+
+    return {
+        'total_trades': len(trades),
+        'wins': len(wins),
+        'losses': len(losses),
+        'win_rate': len(wins) / len(trades) * 100 if trades else 0.0,
+        'net_pnl': float(pnls.sum()),
+        'net_pnl_pct': float(pnls.sum() / initial_equity * 100),
+        'total_fees': float(sum(trade['fees'] for trade in trades)),
+        'profit_factor': profit_factor,
+        'max_drawdown_pct': float(drawdown.max() * 100) if len(drawdown) else 0.0,
+        'ambiguous_exits': sum(1 for trade in trades if trade['ambiguous']),
+        'intrabar_resolved': sum(1 for trade in trades if trade['intrabar_resolved'])
+    }
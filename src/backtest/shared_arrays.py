@@ -0,0 +1,53 @@
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+# Spesifikasi satu array di shared memory: (nama blok, shape, dtype)
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArrays:
+    """
+    Menyalin sekumpulan array NumPy ke shared memory sekali di proses utama sehingga worker
+    process pool cukup menerima `spec` (nama blok, shape, dtype) dan membuka view tanpa pickling data.
+    Dipakai sebagai context manager: blok di-unlink saat keluar.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, ArraySpec] = {}
+        for key, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            if values.dtype.hasobject:
+                raise TypeError(f"Array '{key}' ber-dtype object tidak bisa dibagikan lewat shared memory")
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+            self.blocks.append(block)
+            self.spec[key] = (block.name, values.shape, values.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_shared_arrays(spec: Dict[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """
+    Membuka view read-only atas array dari SharedArrays.spec (dipanggil di worker)
+    Returns: (arrays, blocks) - blocks harus tetap dirujuk selama arrays dipakai
+    """
+    arrays = {}
+    blocks = []
+    for key, (name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        values = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        values.flags.writeable = False
+        arrays[key] = values
+        blocks.append(block)
+    return arrays, blocks
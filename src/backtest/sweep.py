@@ -0,0 +1,189 @@
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Union
+from config import (RISK_MANAGEMENT, RSI_OVERBOUGHT, RSI_OVERSOLD, EMA_SHORT_PERIOD, EMA_LONG_PERIOD,
+                    EMA_TREND_PERIOD, SWEEP_MAX_WORKERS)
+from src.backtest.engine import run_signal_backtest
+from src.backtest.shared_arrays import SharedArrays, attach_shared_arrays
+from src.data.candle_series import CandleSeries, candle_column
+from src.strategy.signal_generator import analyze_market_history, score_market_history
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Parameter yang memengaruhi skor/sinyal (satu kali scoring per kombinasi)
+SCORE_PARAMETERS = ('min_confidence', 'rsi_overbought', 'rsi_oversold', 'ema_short_period', 'ema_long_period',
+                    'ema_trend_period')
+# Parameter yang hanya memengaruhi simulasi trade (memakai ulang sinyal yang sama)
+TRADE_PARAMETERS = ('atr_multiplier_sl', 'atr_multiplier_tp')
+EMA_PARAMETERS = ('ema_short_period', 'ema_long_period', 'ema_trend_period')
+
+# Array worker (view ke shared memory), diisi oleh _init_worker
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_blocks = []
+
+
+def default_parameters() -> Dict:
+    """
+    Nilai parameter saat ini dari config.py
+    """
+    return {
+        'min_confidence': RISK_MANAGEMENT['min_confidence'],
+        'rsi_overbought': RSI_OVERBOUGHT,
+        'rsi_oversold': RSI_OVERSOLD,
+        'ema_short_period': EMA_SHORT_PERIOD,
+        'ema_long_period': EMA_LONG_PERIOD,
+        'ema_trend_period': EMA_TREND_PERIOD,
+        'atr_multiplier_sl': RISK_MANAGEMENT['atr_multiplier_sl'],
+        'atr_multiplier_tp': RISK_MANAGEMENT['atr_multiplier_tp'],
+    }
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Semua kombinasi grid parameter; parameter yang tidak ada di grid memakai nilai config
+    """
+    unknown = set(grid) - set(SCORE_PARAMETERS + TRADE_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Parameter sweep tidak dikenal: {sorted(unknown)}")
+    keys = list(grid)
+    combinations = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = default_parameters()
+        params.update(zip(keys, values))
+        combinations.append(params)
+    return combinations
+
+
+def group_by_score_parameters(combinations: List[Dict]) -> List[Tuple[Dict, List[Dict]]]:
+    """
+    Mengelompokkan kombinasi berdasarkan parameter scoring sehingga sinyal dihitung sekali per
+    kelompok dan hanya simulasi trade yang diulang untuk setiap multiplier SL/TP
+    """
+    groups = {}
+    for params in combinations:
+        score_key = tuple(params[key] for key in SCORE_PARAMETERS)
+        groups.setdefault(score_key, []).append({key: params[key] for key in TRADE_PARAMETERS})
+    return [(dict(zip(SCORE_PARAMETERS, score_key)), trades) for score_key, trades in groups.items()]
+
+
+def sweep_arrays(data: Union[CandleSeries, List[Dict]], higher_timeframe_data=None,
+                 ema_periods: Tuple[int, ...] = ()) -> Dict[str, np.ndarray]:
+    """
+    Indikator yang tidak bergantung pada parameter sweep (RSI, ATR, ADX, MACD, S/R, ngtCV, engulfing,
+    EMA higher timeframe) plus seri EMA untuk setiap periode di grid, dihitung sekali untuk seluruh histori.
+    High/low candle disertakan dengan prefix 'candle_' untuk simulasi SL/TP.
+    """
+    arrays = analyze_market_history(data, higher_timeframe_data, ema_periods=ema_periods)
+    arrays['candle_high'] = np.asarray(candle_column(data, 'high'), dtype=float)
+    arrays['candle_low'] = np.asarray(candle_column(data, 'low'), dtype=float)
+    return arrays
+
+
+def backtest_parameters(arrays: Dict[str, np.ndarray], score_params: Dict, trade_params: List[Dict],
+                        backtest_kwargs: Dict = None, start: int = 0, stop: int = None) -> List[Dict]:
+    """
+    Scoring sekali untuk score_params, lalu backtest untuk setiap kombinasi multiplier SL/TP
+    atas bar [start, stop) dari array histori penuh (potongan view, indikator tidak dihitung ulang)
+    Returns: hasil run_signal_backtest per kombinasi, sejajar dengan trade_params
+    """
+    window = slice(start, stop)
+    history = {key: values[window] for key, values in arrays.items() if not key.startswith('candle_')}
+    data = CandleSeries({
+        'high': arrays['candle_high'][window], 'low': arrays['candle_low'][window],
+        'close': history['close'], 'close_time': history['close_time']
+    })
+    signals = score_market_history(history, first_index=start, **score_params)['signal']
+    return [
+        run_signal_backtest(data, signals, history['atr'], sl_multiplier=params['atr_multiplier_sl'],
+                            tp_multiplier=params['atr_multiplier_tp'], **(backtest_kwargs or {}))
+        for params in trade_params
+    ]
+
+
+def run_parameter_group(arrays: Dict[str, np.ndarray], score_params: Dict, trade_params: List[Dict],
+                        backtest_kwargs: Dict = None, start: int = 0, stop: int = None) -> List[Dict]:
+    """
+    Returns: satu baris (parameter + statistik backtest) per kombinasi multiplier SL/TP
+    """
+    results = backtest_parameters(arrays, score_params, trade_params, backtest_kwargs, start, stop)
+    return [{**score_params, **params, **result['stats']} for params, result in zip(trade_params, results)]
+
+
+def _init_worker(spec):
+    global _worker_arrays, _worker_blocks
+    _worker_arrays, _worker_blocks = attach_shared_arrays(spec)
+
+
+def _call_with_worker_arrays(function, *args):
+    return function(_worker_arrays, *args)
+
+
+def map_shared(arrays: Dict[str, np.ndarray], function, tasks: List[Tuple], max_workers: int = SWEEP_MAX_WORKERS) -> List:
+    """
+    Menjalankan function(arrays, *task) untuk setiap task, berurutan sesuai tasks.
+    Dengan lebih dari satu worker, arrays disalin sekali ke shared memory dan setiap proses
+    membuka view-nya; function harus fungsi level modul agar bisa di-pickle.
+    """
+    workers = min(max_workers, len(tasks))
+    if workers <= 1:
+        return [function(arrays, *task) for task in tasks]
+
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.spec,)) as executor:
+            futures = [executor.submit(_call_with_worker_arrays, function, *task) for task in tasks]
+            return [future.result() for future in futures]
+
+
+def rank_results(rows: List[Dict], rank_by: str = 'net_pnl') -> List[Dict]:
+    """
+    Mengurutkan hasil sweep dari nilai `rank_by` terbesar dan menambahkan kolom 'rank'
+    """
+    ranked = sorted(rows, key=lambda row: row[rank_by], reverse=True)
+    return [{'rank': rank, **row} for rank, row in enumerate(ranked, start=1)]
+
+
+def run_parameter_sweep(data: Union[CandleSeries, List[Dict]], grid: Dict[str, List], higher_timeframe_data=None,
+                        max_workers: int = SWEEP_MAX_WORKERS, rank_by: str = 'net_pnl', **backtest_kwargs) -> List[Dict]:
+    """
+    Menjalankan backtest untuk setiap kombinasi grid parameter di process pool.
+
+    - Indikator dihitung sekali di proses utama dan dibagikan ke worker lewat shared memory
+    - Satu task per kombinasi parameter scoring; multiplier SL/TP memakai ulang sinyal yang sama
+    - backtest_kwargs diteruskan ke run_signal_backtest (fee_rate, slippage, max_positions, ...)
+
+    Returns: tabel hasil (list of dict) terurut berdasarkan `rank_by`
+    """
+    combinations = expand_grid(grid)
+    groups = group_by_score_parameters(combinations)
+    ema_periods = tuple(sorted({params[key] for params in combinations for key in EMA_PARAMETERS}))
+    arrays = sweep_arrays(data, higher_timeframe_data, ema_periods)
+    logger.info(f"Parameter sweep: {len(combinations)} kombinasi, {len(groups)} set sinyal, {len(data)} candle")
+
+    tasks = [(score_params, trade_params, backtest_kwargs) for score_params, trade_params in groups]
+    results = map_shared(arrays, run_parameter_group, tasks, max_workers)
+    return rank_results([row for rows in results for row in rows], rank_by)
+
+
+def format_sweep_table(rows: List[Dict], top: int = 20) -> str:
+    """
+    Tabel teks hasil sweep (parameter + metrik utama) untuk dicetak ke log
+    """
+    columns = ['rank'] + list(SCORE_PARAMETERS + TRADE_PARAMETERS) + [
+        'total_trades', 'win_rate', 'net_pnl', 'profit_factor', 'max_drawdown_pct'
+    ]
+    headers = {'min_confidence': 'min_conf', 'rsi_overbought': 'rsi_ob', 'rsi_oversold': 'rsi_os',
+               'ema_short_period': 'ema_s', 'ema_long_period': 'ema_l', 'ema_trend_period': 'ema_t',
+               'atr_multiplier_sl': 'sl_x', 'atr_multiplier_tp': 'tp_x', 'total_trades': 'trades',
+               'win_rate': 'win%', 'profit_factor': 'pf', 'max_drawdown_pct': 'mdd%'}
+
+    def cell(value) -> str:
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+
+    table = [[headers.get(column, column) for column in columns]]
+    table += [[cell(row[column]) for column in columns] for row in rows[:top]]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    return "\n".join(" | ".join(value.rjust(width) for value, width in zip(line, widths)) for line in table)
@@ -0,0 +1,116 @@
+import numpy as np
+from typing import List, Dict, Tuple, Union
+from config import BACKTEST_INITIAL_EQUITY, SWEEP_MAX_WORKERS, WALK_FORWARD_TRAIN_BARS, WALK_FORWARD_TEST_BARS
+from src.backtest.engine import summarize_trades
+from src.backtest.sweep import (EMA_PARAMETERS, SCORE_PARAMETERS, TRADE_PARAMETERS, expand_grid,
+                                group_by_score_parameters, sweep_arrays, backtest_parameters, run_parameter_group,
+                                map_shared)
+from src.data.candle_series import CandleSeries
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def walk_forward_windows(n: int, train_bars: int = WALK_FORWARD_TRAIN_BARS, test_bars: int = WALK_FORWARD_TEST_BARS,
+                         start: int = 0) -> List[Tuple[int, int, int, int]]:
+    """
+    Window train/test bergulir: train [a, a+train_bars) lalu test tepat sesudahnya, digeser test_bars
+    sehingga window test berurutan tanpa tumpang tindih. Window test terakhir boleh lebih pendek.
+    Returns: list (train_start, train_end, test_start, test_end), end eksklusif
+    """
+    windows = []
+    train_start = start
+    while train_start + train_bars < n:
+        test_start = train_start + train_bars
+        windows.append((train_start, test_start, test_start, min(test_start + test_bars, n)))
+        train_start += test_bars
+    return windows
+
+
+def run_walk_forward_window(arrays: Dict[str, np.ndarray], window: Tuple[int, int, int, int],
+                            groups: List[Tuple[Dict, List[Dict]]], rank_by: str, backtest_kwargs: Dict) -> Dict:
+    """
+    Memilih parameter terbaik (berdasarkan rank_by) pada window train, lalu menjalankannya pada window test
+    """
+    train_start, train_end, test_start, test_end = window
+    best = None
+    for score_params, trade_params in groups:
+        for row in run_parameter_group(arrays, score_params, trade_params, backtest_kwargs, train_start, train_end):
+            if best is None or row[rank_by] > best[rank_by]:
+                best = row
+
+    params = {key: best[key] for key in SCORE_PARAMETERS + TRADE_PARAMETERS}
+    score_params = {key: params[key] for key in SCORE_PARAMETERS}
+    trade_params = {key: params[key] for key in TRADE_PARAMETERS}
+    test = backtest_parameters(arrays, score_params, [trade_params], backtest_kwargs, test_start, test_end)[0]
+    for trade in test['trades']:
+        trade['entry_index'] += test_start
+        trade['exit_index'] += test_start
+
+    return {
+        'train_start': train_start,
+        'train_end': train_end,
+        'test_start': test_start,
+        'test_end': test_end,
+        'params': params,
+        'train_stats': {key: value for key, value in best.items() if key not in params},
+        'test_stats': test['stats'],
+        'trades': test['trades'],
+        'equity': test['equity'],
+    }
+
+
+def stitch_equity(results: List[Dict], initial_equity: float) -> np.ndarray:
+    """
+    Menyambung equity setiap window test menjadi satu kurva out-of-sample:
+    PnL setiap window ditambahkan pada equity akhir window sebelumnya
+    """
+    segments = []
+    offset = 0.0
+    for result in results:
+        segments.append(result['equity'] - initial_equity + offset)
+        offset = segments[-1][-1] if len(segments[-1]) else offset
+    return initial_equity + (np.concatenate(segments) if segments else np.zeros(0))
+
+
+def run_walk_forward(data: Union[CandleSeries, List[Dict]], grid: Dict[str, List], higher_timeframe_data=None,
+                     train_bars: int = WALK_FORWARD_TRAIN_BARS, test_bars: int = WALK_FORWARD_TEST_BARS,
+                     max_workers: int = SWEEP_MAX_WORKERS, rank_by: str = 'net_pnl', **backtest_kwargs) -> Dict:
+    """
+    Walk-forward optimization di atas parameter sweep.
+
+    - Indikator dihitung sekali untuk seluruh histori lalu setiap window memakai potongan (view) array
+    - Setiap window memilih parameter terbaik pada data train dan diuji pada data test sesudahnya
+    - Window independen dan dijalankan paralel di process pool (array dibagikan lewat shared memory)
+    - Window pertama dimulai setelah warmup EMA trend sehingga train tidak berisi bar tanpa sinyal
+
+    Returns: dict dengan 'windows' (parameter dan statistik train/test per window), 'trades' (trade out-of-sample),
+             'equity' (kurva equity out-of-sample yang disambung), 'equity_index' (index candle setiap titik equity)
+             dan 'stats' (ringkasan seluruh trade out-of-sample)
+    """
+    initial_equity = backtest_kwargs.get('initial_equity', BACKTEST_INITIAL_EQUITY)
+    combinations = expand_grid(grid)
+    groups = group_by_score_parameters(combinations)
+    warmup = max(30, max(params['ema_trend_period'] for params in combinations)) - 1
+    windows = walk_forward_windows(len(data), train_bars, test_bars, start=warmup)
+    if not windows:
+        raise ValueError(f"Data ({len(data)} candle) terlalu pendek untuk window train {train_bars} bar setelah warmup {warmup}")
+
+    ema_periods = tuple(sorted({params[key] for params in combinations for key in EMA_PARAMETERS}))
+    arrays = sweep_arrays(data, higher_timeframe_data, ema_periods)
+    logger.info(f"Walk-forward: {len(windows)} window, {len(combinations)} kombinasi parameter per window")
+
+    tasks = [(window, groups, rank_by, backtest_kwargs) for window in windows]
+    results = map_shared(arrays, run_walk_forward_window, tasks, max_workers)
+
+    trades = [trade for result in results for trade in result['trades']]
+    equity = stitch_equity(results, initial_equity)
+    equity_index = np.concatenate([np.arange(result['test_start'], result['test_end']) for result in results])
+    windows = [{key: value for key, value in result.items() if key not in ('trades', 'equity')} for result in results]
+    return {
+        'windows': windows,
+        'trades': trades,
+        'equity': equity,
+        'equity_index': equity_index,
+        'stats': summarize_trades(trades, equity, initial_equity),
+    }
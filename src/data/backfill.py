@@ -0,0 +1,147 @@
+import os
+import time
+import numpy as np
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional
+from config import BACKFILL_PAGE_SIZE, BACKFILL_MAX_WORKERS
+from src.data.binance_api import fetch_klines, interval_to_milliseconds
+from src.data.candle_store import CandleStore, KLINE_DTYPE, candles_to_records
+from src.data.rate_limiter import PRIORITY_BACKFILL
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class BackfillError(Exception):
+    """
+    Sebagian halaman backfill gagal diambil; halaman yang berhasil tetap tersimpan untuk dilanjutkan
+    """
+    def __init__(self, store: CandleStore, pages: List[Tuple[int, int]]):
+        super().__init__(f"Backfill {store.symbol} {store.interval}: {len(pages)} halaman gagal, jalankan ulang untuk melanjutkan")
+        self.pages = pages
+
+
+def plan_backfill_pages(start_time: int, end_time: int, interval: str,
+                        page_size: int = BACKFILL_PAGE_SIZE) -> List[Tuple[int, int]]:
+    """
+    Membagi rentang waktu [start_time, end_time] (ms) menjadi halaman startTime/endTime
+    yang masing-masing berisi paling banyak `page_size` candle.
+    Halaman sejajar dengan grid tetap (kelipatan page_size * interval sejak epoch), sehingga rentang
+    yang digeser (mis. end_time dari jam saat ini) tetap menghasilkan halaman yang sama.
+    """
+    interval_ms = interval_to_milliseconds(interval)
+    page_ms = interval_ms * page_size
+    page_start = start_time - (start_time % page_ms)
+
+    pages = []
+    while page_start <= end_time:
+        pages.append((page_start, min(page_start + page_ms - 1, end_time)))
+        page_start += page_ms
+    return pages
+
+
+def _page_path(pages_dir: str, page: Tuple[int, int]) -> str:
+    return os.path.join(pages_dir, f"{page[0]}_{page[1]}.npy")
+
+
+def _saved_pages(pages_dir: str) -> Dict[int, int]:
+    """
+    Halaman yang sudah tersimpan: start halaman -> akhir rentang yang sudah diambil
+    """
+    saved = {}
+    for name in os.listdir(pages_dir):
+        if name.endswith('.npy'):
+            page_start, page_end = (int(part) for part in name[:-len('.npy')].split('_'))
+            saved[page_start] = max(page_end, saved.get(page_start, page_end))
+    return saved
+
+
+def _store_covers(store: CandleStore, page: Tuple[int, int], interval_ms: int) -> bool:
+    """
+    True jika store sudah berisi semua candle halaman ini (halaman tidak perlu diambil lagi)
+    """
+    if len(store) == 0:
+        return False
+    open_time = store.series().open_time
+    expected = (page[1] - page[0]) // interval_ms + 1
+    first = int(np.searchsorted(open_time, page[0], side='left'))
+    last = int(np.searchsorted(open_time, page[1], side='right'))
+    return last - first == expected
+
+
+def _fetch_page(store: CandleStore, page: Tuple[int, int], page_size: int, pages_dir: str,
+                base_url: Optional[str]) -> int:
+    """
+    Mengambil satu halaman lalu langsung menyimpannya ke disk (tulis atomik)
+    """
+    candles = fetch_klines(store.symbol, store.interval, page_size, start_time=page[0], end_time=page[1],
+                           base_url=base_url, priority=PRIORITY_BACKFILL)
+    now_ms = int(time.time() * 1000)
+    records = candles_to_records([c for c in candles if c['close_time'] < now_ms])
+
+    path = _page_path(pages_dir, page)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, records)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def backfill_ohlcv(store: CandleStore, start_time: int, end_time: int, max_workers: int = BACKFILL_MAX_WORKERS,
+                   page_size: int = BACKFILL_PAGE_SIZE, base_url: Optional[str] = None) -> int:
+    """
+    Mengisi candle store untuk rentang waktu berapa pun, melewati batas 1000 kline per request.
+    Halaman yang sudah ada di store dilewati; halaman lain diambil bersamaan dengan worker pool terbatas
+    dan disimpan satu per satu di <store>/backfill, sehingga backfill yang terputus dilanjutkan dari
+    halaman yang belum selesai meskipun rentang waktunya sedikit bergeser.
+    Returns: jumlah candle baru di store
+    Raises BackfillError jika masih ada halaman yang gagal (store tidak diubah)
+    """
+    interval_ms = interval_to_milliseconds(store.interval)
+    pages = [page for page in plan_backfill_pages(start_time, end_time, store.interval, page_size)
+             if not _store_covers(store, page, interval_ms)]
+    pages_dir = os.path.join(store.path, 'backfill')
+    os.makedirs(pages_dir, exist_ok=True)
+
+    saved = _saved_pages(pages_dir)
+    # Halaman tersimpan dipakai ulang jika mencakup sampai akhir halaman yang diminta
+    pages = [(page[0], max(page[1], saved.get(page[0], -1))) for page in pages]
+    pending = [page for page in pages if saved.get(page[0], -1) < page[1]]
+    if len(pending) < len(pages):
+        logger.info(f"Backfill {store.symbol} {store.interval}: melanjutkan, {len(pages) - len(pending)}/{len(pages)} halaman sudah tersimpan")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_page, store, page, page_size, pages_dir, base_url): page
+            for page in pending
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (requests.exceptions.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                # Halaman dengan response rusak (gagal di-parse) dilaporkan sama seperti error jaringan
+                failed.append(futures[future])
+                logger.error(f"Backfill page {futures[future]} gagal: {e}")
+
+    if failed:
+        error = BackfillError(store, sorted(failed))
+        logger.error(str(error))
+        raise error
+
+    # Gabungkan halaman sesuai urutan waktu; merge() mengurutkan dan membuang duplikat open_time
+    records = [np.load(_page_path(pages_dir, page)) for page in pages]
+    records = np.concatenate(records) if records else np.zeros(0, dtype=KLINE_DTYPE)
+    added = store.merge(records) if len(records) else 0
+
+    # Halaman yang sudah masuk store (termasuk versi lama yang lebih pendek) dihapus
+    merged = {page[0] for page in pages}
+    for name in os.listdir(pages_dir):
+        if name.endswith('.npy') and int(name.split('_')[0]) in merged:
+            os.remove(os.path.join(pages_dir, name))
+    if not os.listdir(pages_dir):
+        os.rmdir(pages_dir)
+
+    logger.info(f"Backfill {store.symbol} {store.interval}: {added} candle baru dari {len(pages)} halaman")
+    return added
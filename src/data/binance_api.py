@@ -1,64 +1,185 @@
 import requests
-import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterator, Tuple, Union
+from config import BINANCE_BASE_URL, BINANCE_RATE_LIMIT_RETRIES, MATRIX_FETCH_MAX_WORKERS
+from src.data.candle_series import CandleSeries
+from src.data.rate_limiter import get_weight_scheduler, kline_request_weight, PRIORITY_LIVE
+from src.utils.http_client import get_http_client
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
-def fetch_ohlcv_data(symbol: str, interval: str, limit: int) -> List[Dict]:
+# Weight GET /api/v3/ticker/24hr tanpa parameter symbol (semua symbol)
+TICKER_24HR_ALL_WEIGHT = 80
+
+# Durasi interval Binance dalam milidetik (interval bulanan "1M" tidak punya durasi tetap)
+INTERVAL_UNITS_MS = {
+    's': 1000,
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+}
+
+def interval_to_milliseconds(interval: str) -> int:
     """
-    Mengambil data OHLCV dari API Binance dengan error handling dan retry
+    Mengubah string interval Binance (mis. "15m", "1h", "1d") menjadi milidetik
+    """
+    unit = interval[-1]
+    if unit not in INTERVAL_UNITS_MS or not interval[:-1].isdigit():
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(interval[:-1]) * INTERVAL_UNITS_MS[unit]
+
+def parse_kline(item: List) -> Dict:
+    """
+    Mengonversi satu kline mentah Binance ke format dict yang dipakai bot
+    """
+    return {
+        'open_time': item[0],
+        'open': float(item[1]),
+        'high': float(item[2]),
+        'low': float(item[3]),
+        'close': float(item[4]),
+        'volume': float(item[5]),
+        'close_time': item[6],
+        'quote_asset_volume': float(item[7]),
+        'number_of_trades': item[8],
+        'taker_buy_base_asset_volume': float(item[9]),
+        'taker_buy_quote_asset_volume': float(item[10])
+    }
+
+def binance_get(path: str, params: Dict, weight: int, priority: int = PRIORITY_LIVE,
+                base_url: Optional[str] = None):
+    """
+    GET ke REST API Binance dan mengembalikan JSON response (retry ditangani HttpClient)
+    Request diantrikan di WeightScheduler sesuai weight dan prioritasnya; response 429/418
+    membuat scheduler berhenti selama Retry-After lalu request dicoba lagi.
+    Raises requests.exceptions.RequestException jika semua percobaan gagal.
+    """
+    url = f"{base_url or BINANCE_BASE_URL}{path}"
+    scheduler = get_weight_scheduler()
+
+    for attempt in range(BINANCE_RATE_LIMIT_RETRIES):
+        scheduler.acquire(weight, priority)
+        try:
+            # Retry dengan backoff dan connection pooling ditangani oleh HTTP client bersama
+            response = get_http_client().get(url, params=params)
+            scheduler.update_from_headers(response.headers)
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            response = e.response
+            if response is not None and response.status_code in (429, 418) and attempt < BINANCE_RATE_LIMIT_RETRIES - 1:
+                retry_after = scheduler.retry_after_seconds(response.headers)
+                logger.warning(f"Binance rate limit (HTTP {response.status_code}), menunggu {retry_after:.0f}s")
+                scheduler.update_from_headers(response.headers)
+                scheduler.block_for(retry_after)
+                continue
+            logger.error(f"Error fetching data from Binance API: {e}", exc_info=True)
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching data from Binance API: {e}", exc_info=True)
+            raise
+
+def fetch_klines(symbol: str, interval: str, limit: int, start_time: Optional[int] = None,
+                 end_time: Optional[int] = None, base_url: Optional[str] = None,
+                 priority: int = PRIORITY_LIVE, as_series: bool = False) -> Union[List[Dict], CandleSeries]:
+    """
+    Mengambil data OHLCV dari API Binance (lihat binance_get untuk rate limit dan retry)
+    as_series=True mengembalikan CandleSeries langsung dari response mentah.
+    Raises requests.exceptions.RequestException jika semua percobaan gagal.
     """
-    url = "https://api.binance.com/api/v3/klines"
     params = {
         'symbol': symbol,
         'interval': interval,
         'limit': limit
     }
-    
-    max_retries = 3
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Mengonversi data ke format yang lebih mudah digunakan
-            ohlcv_data = []
-            for item in data:
-                candle = {
-                    'open_time': item[0],
-                    'open': float(item[1]),
-                    'high': float(item[2]),
-                    'low': float(item[3]),
-                    'close': float(item[4]),
-                    'volume': float(item[5]),
-                    'close_time': item[6],
-                    'quote_asset_volume': float(item[7]),
-                    'number_of_trades': item[8],
-                    'taker_buy_base_asset_volume': float(item[9]),
-                    'taker_buy_quote_asset_volume': float(item[10])
-                }
-                ohlcv_data.append(candle)
-            
-            return ohlcv_data
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching data from Binance API (Attempt {attempt+1}/{max_retries}): {e}", exc_info=True)
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-            else:
-                return []
-    return []
+    if start_time is not None:
+        params['startTime'] = start_time
+    if end_time is not None:
+        params['endTime'] = end_time
 
+    data = binance_get("/api/v3/klines", params, kline_request_weight(limit), priority, base_url)
 
-def fetch_ohlcv_data_multiple_timeframes(symbol: str, intervals: List[str], limit: int) -> Dict[str, List[Dict]]:
+    # Mengonversi data ke format yang lebih mudah digunakan
+    if as_series:
+        return CandleSeries.from_klines(data)
+    return [parse_kline(item) for item in data]
+
+def fetch_top_symbols(quote_asset: str = "USDT", count: int = 200, base_url: Optional[str] = None) -> List[str]:
+    """
+    Symbol dengan quote_asset tertentu, diurutkan dari volume quote 24 jam terbesar
+    (GET /api/v3/ticker/24hr untuk semua symbol, weight 80)
+    """
+    tickers = binance_get("/api/v3/ticker/24hr", {}, TICKER_24HR_ALL_WEIGHT, base_url=base_url)
+    tickers = [ticker for ticker in tickers if ticker['symbol'].endswith(quote_asset)]
+    tickers.sort(key=lambda ticker: float(ticker['quoteVolume']), reverse=True)
+    return [ticker['symbol'] for ticker in tickers[:count]]
+
+def fetch_ohlcv_data(symbol: str, interval: str, limit: int, start_time: Optional[int] = None,
+                     end_time: Optional[int] = None, base_url: Optional[str] = None,
+                     priority: int = PRIORITY_LIVE, as_series: bool = False) -> Union[List[Dict], CandleSeries]:
+    """
+    Mengambil data OHLCV dari API Binance dengan error handling dan retry
+    start_time/end_time (ms) opsional untuk membatasi rentang candle yang diambil
+    as_series=True mengembalikan CandleSeries (struct-of-arrays) alih-alih list of dict
+    Mengembalikan data kosong jika request gagal.
     """
-    Mengambil data OHLCV dari API Binance untuk beberapa timeframe sekaligus
+    try:
+        return fetch_klines(symbol, interval, limit, start_time, end_time, base_url, priority, as_series)
+    except requests.exceptions.RequestException:
+        return CandleSeries.empty() if as_series else []
+
+
+def iter_ohlcv_matrix(symbols: List[str], intervals: List[str], limit: int,
+                      max_workers: int = MATRIX_FETCH_MAX_WORKERS, priority: int = PRIORITY_LIVE,
+                      base_url: Optional[str] = None) -> Iterator[Tuple[str, str, List[Dict], Optional[Exception]]]:
+    """
+    Mengambil matriks (symbols x intervals) secara bersamaan dengan batas jumlah worker.
+    Hasil di-yield segera setelah selesai sebagai (symbol, interval, candles, error);
+    error berisi exception jika kombinasi tersebut gagal (candles kosong).
+    """
+    jobs = [(symbol, interval) for symbol in symbols for interval in intervals]
+    if not jobs:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)))
+    try:
+        futures = {
+            executor.submit(fetch_klines, symbol, interval, limit, base_url=base_url, priority=priority): (symbol, interval)
+            for symbol, interval in jobs
+        }
+        for future in as_completed(futures):
+            symbol, interval = futures[future]
+            try:
+                yield symbol, interval, future.result(), None
+            except requests.exceptions.RequestException as e:
+                yield symbol, interval, [], e
+    finally:
+        # Jika pemanggil berhenti lebih awal, request yang belum berjalan dibatalkan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_ohlcv_matrix(symbols: List[str], intervals: List[str], limit: int,
+                       max_workers: int = MATRIX_FETCH_MAX_WORKERS, priority: int = PRIORITY_LIVE,
+                       base_url: Optional[str] = None) -> Tuple[Dict[Tuple[str, str], List[Dict]], Dict[Tuple[str, str], Exception]]:
+    """
+    Versi terkumpul dari iter_ohlcv_matrix
+    Returns: (results, errors) dengan key (symbol, interval); kombinasi yang gagal hanya ada di errors
     """
     results = {}
-    for interval in intervals:
-        results[interval] = fetch_ohlcv_data(symbol, interval, limit)
-    return results
+    errors = {}
+    for symbol, interval, candles, error in iter_ohlcv_matrix(symbols, intervals, limit, max_workers, priority, base_url):
+        if error is not None:
+            errors[(symbol, interval)] = error
+        else:
+            results[(symbol, interval)] = candles
+    return results, errors
+
+
+def fetch_ohlcv_data_multiple_timeframes(symbol: str, intervals: List[str], limit: int) -> Dict[str, List[Dict]]:
+    """
+    Mengambil data OHLCV dari API Binance untuk beberapa timeframe sekaligus (bersamaan)
+    Timeframe yang gagal bernilai list kosong; gunakan fetch_ohlcv_matrix untuk detail error.
+    """
+    results, errors = fetch_ohlcv_matrix([symbol], intervals, limit)
+    return {interval: results.get((symbol, interval), []) for interval in intervals}
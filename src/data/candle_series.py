@@ -0,0 +1,124 @@
+import numpy as np
+from typing import List, Dict, Iterator, Union, Sequence
+
+# Kolom kline Binance dengan dtype tetap (urutan sama dengan response /api/v3/klines)
+KLINE_FIELDS = [
+    ('open_time', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.float64),
+    ('close_time', np.int64),
+    ('quote_asset_volume', np.float64),
+    ('number_of_trades', np.int64),
+    ('taker_buy_base_asset_volume', np.float64),
+    ('taker_buy_quote_asset_volume', np.float64),
+]
+KLINE_DTYPE = np.dtype(KLINE_FIELDS)
+
+
+class CandleSeries:
+    """
+    Kumpulan candle dalam bentuk struct-of-arrays: satu array NumPy kontigu per kolom.
+    - series.close / series.high / ... : akses kolom O(1) tanpa menyalin
+    - series[a:b]                       : slicing zero-copy (view), hasilnya CandleSeries
+    - series[i]                         : satu candle sebagai dict (kompatibel dengan kode lama)
+    """
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Semua kolom CandleSeries harus sama panjang")
+        self.columns = columns
+
+    @classmethod
+    def from_candles(cls, candles: List[Dict]) -> 'CandleSeries':
+        """
+        Adapter dari format lama (list of dict)
+        """
+        return cls({field: np.array([c[field] for c in candles], dtype=dtype) for field, dtype in KLINE_FIELDS})
+
+    @classmethod
+    def from_klines(cls, klines: List[List]) -> 'CandleSeries':
+        """
+        Membangun langsung dari response mentah /api/v3/klines (tanpa dict per candle)
+        """
+        if not klines:
+            return cls.empty()
+        raw_columns = list(zip(*klines))
+        return cls({field: np.array(raw_columns[index], dtype=dtype) for index, (field, dtype) in enumerate(KLINE_FIELDS)})
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> 'CandleSeries':
+        """
+        View kolom dari structured array KLINE_DTYPE
+        """
+        return cls({field: records[field] for field, _ in KLINE_FIELDS})
+
+    @classmethod
+    def empty(cls) -> 'CandleSeries':
+        return cls({field: np.zeros(0, dtype=dtype) for field, dtype in KLINE_FIELDS})
+
+    def __len__(self) -> int:
+        return len(self.columns['open_time'])
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict, 'CandleSeries']:
+        if isinstance(key, slice):
+            return CandleSeries({field: values[key] for field, values in self.columns.items()})
+        return {field: values[key].item() for field, values in self.columns.items()}
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self.columns['open_time']
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.columns['open']
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.columns['high']
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.columns['low']
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.columns['close']
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.columns['volume']
+
+    @property
+    def close_time(self) -> np.ndarray:
+        return self.columns['close_time']
+
+    def to_candles(self) -> List[Dict]:
+        columns = {field: values.tolist() for field, values in self.columns.items()}
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def to_records(self) -> np.ndarray:
+        records = np.empty(len(self), dtype=KLINE_DTYPE)
+        for field, values in self.columns.items():
+            records[field] = values
+        return records
+
+
+def candle_column(data: Union[CandleSeries, List[Dict]], field: str) -> Sequence:
+    """
+    Mengambil satu kolom dari CandleSeries (array tanpa salinan) atau list of dict (list baru)
+    """
+    if isinstance(data, CandleSeries):
+        return data.column(field)
+    return [candle[field] for candle in data]
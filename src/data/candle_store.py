@@ -0,0 +1,195 @@
+import json
+import os
+import time
+import numpy as np
+from typing import List, Dict, Optional, Union
+from config import CANDLE_STORE_DIR
+from src.data.binance_api import fetch_ohlcv_data
+from src.data.candle_series import CandleSeries, KLINE_FIELDS, KLINE_DTYPE
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Manifest merge(): ditulis setelah semua kolom sementara lengkap, dihapus setelah semua kolom diganti
+MERGE_MANIFEST = "merge.json"
+
+
+def candles_to_records(candles: List[Dict]) -> np.ndarray:
+    """
+    Mengonversi list candle dict menjadi structured array dengan KLINE_DTYPE
+    """
+    return np.array([tuple(candle[field] for field, _ in KLINE_FIELDS) for candle in candles], dtype=KLINE_DTYPE)
+
+
+class CandleStore:
+    """
+    Penyimpanan candle kolumnar di disk untuk satu (symbol, interval), dibaca lewat memory map
+    Layout: <root>/<SYMBOL>/<interval>/<kolom>.bin
+    """
+    def __init__(self, symbol: str, interval: str, root: str = CANDLE_STORE_DIR):
+        self.symbol = symbol
+        self.interval = interval
+        self.path = os.path.join(root, symbol.upper(), interval)
+        self._recover()
+
+    def _column_path(self, field: str) -> str:
+        return os.path.join(self.path, f"{field}.bin")
+
+    def _recover(self):
+        """
+        Menuntaskan merge() yang terputus saat store dibuka. Manifest ada berarti semua kolom sementara
+        sudah lengkap: penggantian kolom diselesaikan dan panjangnya diperiksa. Tanpa manifest, kolom
+        sementara adalah sisa merge yang belum di-commit dan dibuang.
+        """
+        manifest_path = os.path.join(self.path, MERGE_MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                length = json.load(f)['length']
+            for field, dtype in KLINE_FIELDS:
+                path = self._column_path(field)
+                if os.path.exists(path + '.tmp'):
+                    os.replace(path + '.tmp', path)
+                if not os.path.exists(path) or os.path.getsize(path) != length * np.dtype(dtype).itemsize:
+                    raise IOError(f"Candle store {self.symbol} {self.interval}: kolom {field} tidak sesuai manifest merge")
+            os.remove(manifest_path)
+            logger.warning(f"Candle store {self.symbol} {self.interval}: merge yang terputus diselesaikan")
+        for field, _ in KLINE_FIELDS:
+            if os.path.exists(self._column_path(field) + '.tmp'):
+                os.remove(self._column_path(field) + '.tmp')
+
+    def __len__(self) -> int:
+        # Jumlah baris = kolom terpendek, sehingga append yang terputus di tengah tidak terbaca
+        lengths = []
+        for field, dtype in KLINE_FIELDS:
+            path = self._column_path(field)
+            if not os.path.exists(path):
+                return 0
+            lengths.append(os.path.getsize(path) // np.dtype(dtype).itemsize)
+        return min(lengths)
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """
+        Membuka semua kolom sebagai memory map read-only (tanpa menyalin data)
+        """
+        length = len(self)
+        columns = {}
+        for field, dtype in KLINE_FIELDS:
+            if length == 0:
+                columns[field] = np.zeros(0, dtype=dtype)
+            else:
+                columns[field] = np.memmap(self._column_path(field), dtype=dtype, mode='r', shape=(length,))
+        return columns
+
+    def last_close_time(self) -> Optional[int]:
+        length = len(self)
+        if length == 0:
+            return None
+        close_time = np.memmap(self._column_path('close_time'), dtype=np.int64, mode='r', shape=(length,))
+        return int(close_time[-1])
+
+    def append(self, candles: List[Dict]) -> int:
+        """
+        Menambahkan candle yang lebih baru dari candle terakhir di store
+        Returns: jumlah candle yang ditambahkan
+        """
+        length = len(self)
+        last_open_time = None
+        if length:
+            open_time = np.memmap(self._column_path('open_time'), dtype=np.int64, mode='r', shape=(length,))
+            last_open_time = int(open_time[-1])
+
+        new_candles = []
+        for candle in sorted(candles, key=lambda c: c['open_time']):
+            if last_open_time is None or candle['open_time'] > last_open_time:
+                new_candles.append(candle)
+                last_open_time = candle['open_time']
+        if not new_candles:
+            return 0
+
+        os.makedirs(self.path, exist_ok=True)
+        for field, dtype in KLINE_FIELDS:
+            path = self._column_path(field)
+            values = np.array([candle[field] for candle in new_candles], dtype=dtype)
+            with open(path, 'ab') as f:
+                # Buang sisa append yang terputus agar semua kolom tetap sejajar
+                f.truncate(length * np.dtype(dtype).itemsize)
+                f.write(values.tobytes())
+        return len(new_candles)
+
+    def merge(self, records: np.ndarray) -> int:
+        """
+        Menggabungkan record (KLINE_DTYPE) di posisi mana pun dalam histori, diurutkan dan
+        dideduplikasi berdasarkan open_time. Data yang sudah ada di store diprioritaskan.
+        Returns: jumlah candle baru
+        """
+        existing = np.empty(len(self), dtype=KLINE_DTYPE)
+        for field, values in self.load().items():
+            existing[field] = values
+
+        combined = np.concatenate([existing, records.astype(KLINE_DTYPE)])
+        combined = combined[np.argsort(combined['open_time'], kind='stable')]
+        _, first_index = np.unique(combined['open_time'], return_index=True)
+        combined = combined[first_index]
+
+        # Semua kolom ditulis ke file sementara dulu, lalu di-commit bersama lewat manifest (lihat _recover)
+        os.makedirs(self.path, exist_ok=True)
+        for field, _ in KLINE_FIELDS:
+            with open(self._column_path(field) + '.tmp', 'wb') as f:
+                f.write(np.ascontiguousarray(combined[field]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        manifest_path = os.path.join(self.path, MERGE_MANIFEST)
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump({'length': len(combined)}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(manifest_path + '.tmp', manifest_path)
+        self._recover()
+        return len(combined) - len(existing)
+
+    def series(self, start: Optional[int] = None, stop: Optional[int] = None) -> CandleSeries:
+        """
+        Mengembalikan candle[start:stop] sebagai CandleSeries di atas memory map (tanpa menyalin)
+        """
+        return CandleSeries(self.load())[start:stop]
+
+    def to_candles(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[Dict]:
+        """
+        Mengembalikan candle[start:stop] dalam format fetch_ohlcv_data (list of dict)
+        """
+        return self.series(start, stop).to_candles()
+
+    def tail(self, count: int, as_series: bool = False) -> Union[List[Dict], CandleSeries]:
+        """
+        `count` candle terakhir; as_series=True mengembalikan CandleSeries di atas memory map
+        """
+        start = max(len(self) - count, 0)
+        return self.series(start) if as_series else self.to_candles(start)
+
+
+def sync_candle_store(store: CandleStore, limit: int = 1000, base_url: Optional[str] = None) -> int:
+    """
+    Mengambil dari Binance hanya candle yang lebih baru dari close_time terakhir di store
+    Hanya candle yang sudah tertutup yang disimpan.
+    Returns: jumlah candle baru
+    """
+    added = 0
+    while True:
+        last_close_time = store.last_close_time()
+        start_time = last_close_time + 1 if last_close_time is not None else None
+        candles = fetch_ohlcv_data(store.symbol, store.interval, limit, start_time=start_time, base_url=base_url)
+        if not candles:
+            break
+
+        now_ms = int(time.time() * 1000)
+        closed = [c for c in candles if c['close_time'] < now_ms]
+        appended = store.append(closed)
+        added += appended
+
+        # Jika satu halaman penuh berisi candle tertutup, kemungkinan masih ada candle berikutnya
+        if start_time is None or appended == 0 or len(candles) < limit or len(closed) < len(candles):
+            break
+
+    if added:
+        logger.info(f"Candle store {store.symbol} {store.interval}: {added} candle baru")
+    return added
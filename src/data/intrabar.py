@@ -0,0 +1,57 @@
+import numpy as np
+from typing import Dict, Optional
+from src.data.candle_store import CandleStore
+
+
+class SubBarResolver:
+    """
+    Menentukan urutan sentuhan SL/TP di dalam satu candle memakai candle interval kecil (mis. 1m)
+    dari CandleStore. Memory map baru dibuka saat resolve pertama kali dipanggil dan hanya
+    potongan sub-bar milik candle yang ditanyakan yang dibaca dari disk.
+    """
+    def __init__(self, store: CandleStore):
+        self.store = store
+        self.columns: Optional[Dict[str, np.ndarray]] = None
+        self.resolved = 0
+        self.unresolved = 0
+        self.sub_bars_loaded = 0
+
+    def _load(self) -> Dict[str, np.ndarray]:
+        if self.columns is None:
+            self.columns = self.store.load()
+        return self.columns
+
+    def first_touch(self, side: int, open_time: int, close_time: int, stop_loss: float,
+                    take_profit: float) -> Optional[str]:
+        """
+        Level yang tersentuh lebih dulu di antara sub-bar candle [open_time, close_time]
+        Returns: "SL", "TP", atau None jika sub-bar tidak tersedia, tidak menyentuh level mana pun,
+                 atau satu sub-bar menyentuh keduanya (urutan tetap tidak diketahui)
+        """
+        columns = self._load()
+        open_times = columns['open_time']
+        start = int(np.searchsorted(open_times, open_time, side='left'))
+        stop = int(np.searchsorted(open_times, close_time, side='right'))
+        if stop <= start:
+            self.unresolved += 1
+            return None
+
+        highs = np.asarray(columns['high'][start:stop])
+        lows = np.asarray(columns['low'][start:stop])
+        self.sub_bars_loaded += stop - start
+        if side > 0:
+            sl_hit = lows <= stop_loss
+            tp_hit = highs >= take_profit
+        else:
+            sl_hit = highs >= stop_loss
+            tp_hit = lows <= take_profit
+
+        hits = np.flatnonzero(sl_hit | tp_hit)
+        if len(hits) == 0 or (sl_hit[hits[0]] and tp_hit[hits[0]]):
+            self.unresolved += 1
+            return None
+        self.resolved += 1
+        return "SL" if sl_hit[hits[0]] else "TP"
+
+    def stats(self) -> Dict:
+        return {'resolved': self.resolved, 'unresolved': self.unresolved, 'sub_bars_loaded': self.sub_bars_loaded}
@@ -0,0 +1,178 @@
+import asyncio
+import json
+from collections import deque
+from typing import List, Dict, Set, Tuple, Callable, Optional
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+from config import (CANDLE_STORE_DIR, BACKFILL_PAGE_SIZE, BINANCE_WS_URL, BINANCE_WS_MAX_STREAMS, WS_RECONNECT_DELAY,
+                    WS_RECONNECT_DELAY_MAX, WS_PENDING_CANDLES)
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def stream_name(symbol: str, interval: str) -> str:
+    """
+    Nama stream kline Binance, mis. "btcusdt@kline_15m"
+    """
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def combined_stream_url(ws_url: str, streams: List[Tuple[str, str]]) -> str:
+    return f"{ws_url}/stream?streams=" + "/".join(stream_name(symbol, interval) for symbol, interval in streams)
+
+
+def parse_stream_kline(message: Dict) -> Tuple[str, str, Dict, bool]:
+    """
+    Mengonversi event kline combined stream ({"stream": ..., "data": {"e": "kline", "k": {...}}})
+    ke format candle bot
+    Returns: (symbol, interval, candle, sudah tertutup)
+    """
+    kline = message['data']['k']
+    candle = {
+        'open_time': kline['t'],
+        'open': float(kline['o']),
+        'high': float(kline['h']),
+        'low': float(kline['l']),
+        'close': float(kline['c']),
+        'volume': float(kline['v']),
+        'close_time': kline['T'],
+        'quote_asset_volume': float(kline['q']),
+        'number_of_trades': kline['n'],
+        'taker_buy_base_asset_volume': float(kline['V']),
+        'taker_buy_quote_asset_volume': float(kline['Q'])
+    }
+    return kline['s'], kline['i'], candle, kline['x']
+
+
+class KlineStream:
+    """
+    Client combined kline stream Binance untuk banyak (symbol, interval).
+    Reader WebSocket tidak pernah menunggu I/O: candle tertutup dimasukkan ke antrian per stream
+    (put tanpa menunggu; jika penuh, candle tertua dibuang lalu celahnya diisi ulang dari REST).
+    Task persist per stream menyimpan antrian itu ke candle store di thread pool, lalu meneruskan candle
+    terbaru ke on_candle(symbol, interval, candle); on_candle dipanggil di event loop dan tidak boleh blocking.
+    Setiap (re)connect dan setiap candle yang tidak bersambung dengan store mengisi celah lewat REST
+    (sync_candle_store). Koneksi yang terputus dibuka ulang dengan backoff eksponensial; stream dibagi
+    ke beberapa koneksi bila melebihi max_streams.
+    """
+    def __init__(self, streams: List[Tuple[str, str]], on_candle: Callable[[str, str, Dict], None],
+                 root: str = CANDLE_STORE_DIR, ws_url: str = BINANCE_WS_URL, base_url: Optional[str] = None,
+                 max_streams: int = BINANCE_WS_MAX_STREAMS, reconnect_delay: float = WS_RECONNECT_DELAY,
+                 reconnect_delay_max: float = WS_RECONNECT_DELAY_MAX, pending_candles: int = WS_PENDING_CANDLES):
+        self.streams = [(symbol.upper(), interval) for symbol, interval in dict.fromkeys(streams)]
+        self.on_candle = on_candle
+        self.ws_url = ws_url
+        self.base_url = base_url
+        self.max_streams = max_streams
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_delay_max = reconnect_delay_max
+        self.stores = {key: CandleStore(key[0], key[1], root) for key in self.streams}
+        self.pending: Dict[Tuple[str, str], deque] = {key: deque(maxlen=pending_candles) for key in self.streams}
+        self.resync: Set[Tuple[str, str]] = set()  # Stream yang perlu diisi dari REST (setelah (re)connect)
+        self.wakeups: Dict[Tuple[str, str], asyncio.Event] = {}
+        self.emitted: Dict[Tuple[str, str], int] = {}  # close_time terakhir yang diteruskan per stream
+        self.connections = 0
+        self.gap_fills = 0  # Jumlah celah di tengah stream yang diisi dari REST
+        self.dropped = 0  # Candle yang dibuang karena antrian persist penuh (celahnya diisi dari REST)
+
+    def fill_gap(self, key: Tuple[str, str]) -> int:
+        """
+        Mengambil candle yang terlewat dari REST (dipanggil di thread persist)
+        """
+        return sync_candle_store(self.stores[key], limit=BACKFILL_PAGE_SIZE, base_url=self.base_url)
+
+    def persist(self, key: Tuple[str, str], candles: List[Dict], resync: bool) -> Tuple[Optional[Dict], int]:
+        """
+        Menyimpan candle tertutup ke candle store (di thread pool, satu panggilan per stream pada satu waktu)
+        Returns: (candle terakhir di store jika lebih baru dari yang sudah diteruskan atau None, jumlah celah diisi)
+        """
+        store = self.stores[key]
+        gaps = 0
+        if resync:
+            self.fill_gap(key)
+        for candle in candles:
+            last_close_time = store.last_close_time()
+            if last_close_time is not None and candle['open_time'] > last_close_time + 1:
+                logger.warning(f"Kline stream {key[0]} {key[1]}: celah sebelum {candle['open_time']}, isi dari REST")
+                gaps += 1
+                self.fill_gap(key)
+            store.append([candle])
+        if len(store) and store.last_close_time() > self.emitted.get(key, -1):
+            return store.tail(1)[0], gaps
+        return None, gaps
+
+    def handle_message(self, raw: str):
+        """
+        Memasukkan candle tertutup ke antrian stream-nya tanpa I/O dan tanpa menunggu
+        """
+        message = json.loads(raw)
+        if message.get('data', {}).get('e') != 'kline':
+            return
+        symbol, interval, candle, closed = parse_stream_kline(message)
+        key = (symbol, interval)
+        if not closed or key not in self.stores:
+            return
+        pending = self.pending[key]
+        if len(pending) == pending.maxlen:
+            self.dropped += 1
+        pending.append(candle)
+        self.wakeups[key].set()
+
+    def request_resync(self, key: Tuple[str, str]):
+        self.resync.add(key)
+        self.wakeups[key].set()
+
+    async def persist_stream(self, key: Tuple[str, str]):
+        """
+        Task per stream: menyimpan candle yang menumpuk dalam satu kali panggilan thread pool
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.wakeups[key].wait()
+            self.wakeups[key].clear()
+            candles = list(self.pending[key])
+            self.pending[key].clear()
+            resync = key in self.resync
+            self.resync.discard(key)
+            try:
+                latest, gaps = await loop.run_in_executor(None, self.persist, key, candles, resync)
+            except Exception as e:
+                logger.error(f"Kline stream {key[0]} {key[1]}: gagal menyimpan candle: {e}, isi ulang dari REST")
+                self.request_resync(key)
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            self.gap_fills += gaps
+            if latest is not None:
+                self.emitted[key] = latest['close_time']
+                self.on_candle(key[0], key[1], latest)
+
+    async def run_connection(self, streams: List[Tuple[str, str]]):
+        """
+        Satu koneksi combined stream; dibuka ulang selamanya sampai task dibatalkan
+        """
+        url = combined_stream_url(self.ws_url, streams)
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with connect(url) as websocket:
+                    self.connections += 1
+                    logger.info(f"Kline stream terhubung ({len(streams)} stream)")
+                    # Candle yang tertutup selama terputus diambil dari REST oleh task persist
+                    for key in streams:
+                        self.request_resync(key)
+                    delay = self.reconnect_delay
+                    async for raw in websocket:
+                        self.handle_message(raw)
+                logger.warning(f"Kline stream ditutup server, menghubungkan ulang dalam {delay:.1f}s")
+            except (WebSocketException, OSError, asyncio.TimeoutError) as e:
+                logger.warning(f"Kline stream terputus: {e}, mencoba lagi dalam {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_delay_max)
+
+    async def run(self):
+        self.wakeups = {key: asyncio.Event() for key in self.streams}
+        groups = [self.streams[i:i + self.max_streams] for i in range(0, len(self.streams), self.max_streams)]
+        persisters = [self.persist_stream(key) for key in self.streams]
+        await asyncio.gather(*persisters, *(self.run_connection(group) for group in groups))
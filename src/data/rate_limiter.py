@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Mapping, Optional
+from config import BINANCE_WEIGHT_LIMIT, BINANCE_WEIGHT_SAFETY_MARGIN
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Prioritas antrian (angka kecil dilayani lebih dulu)
+PRIORITY_LIVE = 0
+PRIORITY_BACKFILL = 10
+
+WEIGHT_HEADERS = ('X-MBX-USED-WEIGHT-1M', 'X-MBX-USED-WEIGHT')
+
+
+def kline_request_weight(limit: int) -> int:
+    """
+    Bobot request GET /api/v3/klines sesuai tabel Binance berdasarkan `limit`
+    """
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightScheduler:
+    """
+    Penjadwal request Binance berbasis token bucket atas request weight per menit.
+    Request menunggu dalam antrian prioritas (live sebelum backfill), bucket disinkronkan
+    dengan header X-MBX-USED-WEIGHT-1M, dan response 429/418 menghentikan semua request
+    selama Retry-After yang diberikan server.
+    """
+    def __init__(self, weight_limit: int = BINANCE_WEIGHT_LIMIT, window_seconds: float = 60.0,
+                 safety_margin: float = BINANCE_WEIGHT_SAFETY_MARGIN):
+        self.capacity = weight_limit * safety_margin
+        self.refill_rate = self.capacity / window_seconds  # weight per detik
+        self.window_seconds = window_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiters = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def acquire(self, weight: int, priority: int = PRIORITY_LIVE):
+        """
+        Menunggu sampai giliran request ini tiba dan bucket punya cukup weight
+        """
+        weight = min(weight, self.capacity)
+        ticket = (priority, next(self.counter))
+        with self.condition:
+            heapq.heappush(self.waiters, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.waiters[0] == ticket:
+                    wait = max(self.blocked_until - now, (weight - self.tokens) / self.refill_rate)
+                    if wait <= 0:
+                        heapq.heappop(self.waiters)
+                        self.tokens -= weight
+                        self.condition.notify_all()
+                        return
+                else:
+                    wait = None  # Tunggu sampai request di depan selesai
+                self.condition.wait(timeout=wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Menyelaraskan bucket dengan weight terpakai yang dilaporkan server (hanya bisa mengurangi token)
+        """
+        for header in WEIGHT_HEADERS:
+            used = headers.get(header)
+            if used is not None:
+                with self.condition:
+                    self._refill(time.monotonic())
+                    self.tokens = min(self.tokens, self.capacity - int(used))
+                return
+
+    def block_for(self, seconds: float):
+        """
+        Menghentikan semua request selama `seconds` (dari header Retry-After pada 429/418)
+        """
+        with self.condition:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+            self.condition.notify_all()
+
+    def retry_after_seconds(self, headers: Mapping[str, str]) -> float:
+        """
+        Lama jeda dari header Retry-After; jika tidak ada, tunggu satu window penuh
+        """
+        retry_after: Optional[str] = headers.get('Retry-After')
+        return float(retry_after) if retry_after is not None else self.window_seconds
+
+
+_scheduler: Optional[WeightScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_weight_scheduler() -> WeightScheduler:
+    """
+    WeightScheduler bersama untuk semua request ke Binance dalam proses ini
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = WeightScheduler()
+    return _scheduler
@@ -0,0 +1,167 @@
+import numpy as np
+from collections import deque
+from typing import List, Dict, Optional, Union
+from src.data.binance_api import interval_to_milliseconds
+from src.data.candle_series import CandleSeries, KLINE_FIELDS
+
+# Kolom yang dijumlahkan saat beberapa candle digabung menjadi satu
+SUM_FIELDS = ('volume', 'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume')
+
+# Candle mingguan Binance dimulai hari Senin 00:00 UTC, sedangkan epoch (1970-01-01) jatuh pada hari Kamis
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def bucket_open_time(open_time, interval: str):
+    """
+    open_time candle `interval` yang memuat candle dengan open_time tersebut (UTC, sejajar Binance)
+    """
+    interval_ms = interval_to_milliseconds(interval)
+    offset = WEEK_OFFSET_MS if interval.endswith('w') else 0
+    return (open_time - offset) // interval_ms * interval_ms + offset
+
+
+def resample_candles(data: Union[CandleSeries, List[Dict]], interval: str, include_partial: bool = False) -> CandleSeries:
+    """
+    Menggabungkan candle dasar (mis. 1m/15m) menjadi candle `interval` yang lebih besar (1h/4h/1d/...)
+    secara vektor: open pertama, high maksimum, low minimum, close terakhir, volume/quote volume/
+    jumlah trade dijumlahkan. Bucket yang tidak lengkap di awal data dan bucket terakhir yang belum
+    tertutup dibuang kecuali include_partial=True.
+    """
+    series = data if isinstance(data, CandleSeries) else CandleSeries.from_candles(data)
+    if len(series) == 0:
+        return CandleSeries.empty()
+
+    interval_ms = interval_to_milliseconds(interval)
+    buckets = bucket_open_time(series.open_time, interval)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    ends = np.concatenate([starts[1:], [len(series)]]) - 1
+
+    columns = {
+        'open_time': buckets[starts].astype(np.int64),
+        'open': series.open[starts],
+        'high': np.maximum.reduceat(series.high, starts),
+        'low': np.minimum.reduceat(series.low, starts),
+        'close': series.close[ends],
+        'close_time': buckets[starts].astype(np.int64) + interval_ms - 1,
+    }
+    for field in SUM_FIELDS:
+        columns[field] = np.add.reduceat(series.column(field), starts)
+    columns = {field: np.ascontiguousarray(columns[field], dtype=dtype) for field, dtype in KLINE_FIELDS}
+    resampled = CandleSeries(columns)
+
+    if not include_partial:
+        # Bucket terakhir belum tertutup jika candle dasar terakhirnya belum mencapai akhir bucket
+        if series.close_time[-1] < resampled.close_time[-1]:
+            resampled = resampled[:-1]
+        # Bucket pertama tidak lengkap jika data dasar dimulai di tengah bucket
+        if len(resampled) and series.open_time[0] > resampled.open_time[0]:
+            resampled = resampled[1:]
+    return resampled
+
+
+class CandleResampler:
+    """
+    Resampling inkremental: update(candle) dipanggil setiap candle dasar tertutup, dan candle
+    `interval` yang sudah lengkap disimpan di `candles` (paling banyak max_candles terakhir).
+    """
+    def __init__(self, interval: str, max_candles: int = 1000):
+        self.interval = interval
+        self.interval_ms = interval_to_milliseconds(interval)
+        self.candles = deque(maxlen=max_candles)
+        self.current: Optional[Dict] = None
+        self.last_open_time: Optional[int] = None
+
+    def update(self, candle: Dict) -> Optional[Dict]:
+        """
+        Memproses satu candle dasar tertutup (candle yang sudah diproses diabaikan)
+        Returns: candle `interval` yang baru tertutup, atau None
+        """
+        if self.last_open_time is not None and candle['open_time'] <= self.last_open_time:
+            return None
+        self.last_open_time = candle['open_time']
+
+        completed = None
+        bucket = int(bucket_open_time(candle['open_time'], self.interval))
+        if self.current is not None and self.current['open_time'] != bucket:
+            # Bucket sebelumnya tidak pernah mencapai candle terakhirnya (ada gap); tutup apa adanya
+            completed = self._close_current()
+
+        if self.current is None and not self.candles and candle['open_time'] != bucket:
+            # Data dimulai di tengah bucket: candle pertama tidak akan lengkap, tunggu bucket berikutnya
+            return completed
+
+        if self.current is None:
+            self.current = {field: candle[field] for field in ('open', 'high', 'low', 'close', *SUM_FIELDS)}
+            self.current['open_time'] = bucket
+            self.current['close_time'] = bucket + self.interval_ms - 1
+        else:
+            self.current['high'] = max(self.current['high'], candle['high'])
+            self.current['low'] = min(self.current['low'], candle['low'])
+            self.current['close'] = candle['close']
+            for field in SUM_FIELDS:
+                self.current[field] += candle[field]
+
+        if candle['close_time'] >= self.current['close_time']:
+            completed = self._close_current()
+        return completed
+
+    def _close_current(self) -> Dict:
+        completed = {field: self.current[field] for field, _ in KLINE_FIELDS}
+        self.candles.append(completed)
+        self.current = None
+        return completed
+
+    def extend(self, data: Union[CandleSeries, List[Dict]]) -> int:
+        """
+        Memproses banyak candle dasar sekaligus; candle yang sudah diproses dilewati.
+        Pada pemanggilan pertama, histori yang sudah tertutup di-resample secara vektor.
+        Returns: jumlah candle `interval` baru
+        """
+        series = data if isinstance(data, CandleSeries) else CandleSeries.from_candles(data)
+        if len(series) == 0:
+            return 0
+
+        added = 0
+        if self.last_open_time is None and self.current is None:
+            closed = resample_candles(series, self.interval)
+            if len(closed):
+                self.candles.extend(closed[-self.candles.maxlen:].to_candles())
+                added = len(closed)
+                # Candle dasar sampai akhir bucket tertutup terakhir sudah terwakili
+                processed = int(np.searchsorted(series.open_time, closed.close_time[-1], side='right'))
+                self.last_open_time = int(series.open_time[processed - 1])
+
+        processed = 0
+        if self.last_open_time is not None:
+            processed = int(np.searchsorted(series.open_time, self.last_open_time, side='right'))
+
+        for candle in series[processed:]:
+            if self.update(candle) is not None:
+                added += 1
+        return added
+
+    def series(self) -> CandleSeries:
+        """
+        Candle `interval` yang sudah tertutup sebagai CandleSeries
+        """
+        return CandleSeries.from_candles(list(self.candles)) if self.candles else CandleSeries.empty()
+
+    def snapshot(self) -> Dict:
+        """
+        State yang bisa disimpan ke JSON (termasuk bucket yang sedang berjalan)
+        """
+        return {
+            'interval': self.interval,
+            'max_candles': self.candles.maxlen,
+            'candles': list(self.candles),
+            'current': self.current,
+            'last_open_time': self.last_open_time
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'CandleResampler':
+        resampler = cls(state['interval'], state['max_candles'])
+        resampler.candles.extend(state['candles'])
+        resampler.current = state['current']
+        resampler.last_open_time = state['last_open_time']
+        return resampler
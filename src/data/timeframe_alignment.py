@@ -0,0 +1,49 @@
+import numpy as np
+from typing import List, Dict, Union
+from src.data.candle_series import CandleSeries, candle_column
+
+
+def last_closed_index(higher_close_times, close_times) -> np.ndarray:
+    """
+    Index candle higher timeframe terakhir yang sudah tertutup pada setiap close_time
+    (close_time higher <= close_time lower); -1 jika belum ada yang tertutup
+    """
+    higher_close_times = np.asarray(higher_close_times, dtype=np.int64)
+    return np.searchsorted(higher_close_times, np.asarray(close_times, dtype=np.int64), side='right') - 1
+
+
+def closed_higher_window(higher_timeframe_data: Union[CandleSeries, List[Dict]], close_time: int) -> Union[CandleSeries, List[Dict]]:
+    """
+    Candle higher timeframe yang sudah tertutup pada close_time (tanpa candle masa depan)
+    """
+    index = int(last_closed_index(candle_column(higher_timeframe_data, 'close_time'), close_time))
+    return higher_timeframe_data[:index + 1]
+
+
+class TimeframeAlignment:
+    """
+    Pemetaan setiap candle timeframe rendah ke candle higher timeframe terakhir yang sudah tertutup,
+    dihitung sekali dengan searchsorted atas close_time. Indikator higher timeframe yang dihitung
+    sekali untuk seluruh histori kemudian dibaca sebagai array sejajar timeframe rendah.
+    """
+    def __init__(self, data: Union[CandleSeries, List[Dict]], higher_timeframe_data: Union[CandleSeries, List[Dict]]):
+        self.index = last_closed_index(candle_column(higher_timeframe_data, 'close_time'), candle_column(data, 'close_time'))
+        # Jumlah candle higher timeframe yang sudah tertutup = panjang window higher pada bar tersebut
+        self.closed_count = self.index + 1
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def align(self, higher_values, min_closed: int = 1, fill: float = np.nan) -> np.ndarray:
+        """
+        Nilai higher timeframe (sejajar candle higher) sebagai array sejajar candle timeframe rendah.
+        Bar yang belum punya `min_closed` candle higher tertutup diisi `fill`.
+        """
+        higher_values = np.asarray(higher_values, dtype=float)
+        aligned = np.full(len(self.index), fill)
+        valid = self.closed_count >= max(min_closed, 1)
+        aligned[valid] = higher_values[self.index[valid]]
+        return aligned
+
+    def higher_index_at(self, i: int) -> int:
+        return int(self.index[i])
@@ -1,5 +1,7 @@
 import numpy as np
 from typing import List, Dict
+from src.data.candle_series import candle_column
+from src.indicators.technical import true_range
 
 def calculate_true_range(candle: Dict, prev_candle: Dict) -> float:
     """
@@ -24,13 +26,16 @@ def calculate_atr(data: List[Dict], period: int = 14) -> float:
     if len(data) < period + 1:
         return 0.0
     
-    true_ranges = []
-    for i in range(1, len(data)):
-        tr = calculate_true_range(data[i], data[i-1])
-        true_ranges.append(tr)
-    
+    # True Range dihitung per kolom (data bisa list of dict atau CandleSeries)
+    true_ranges = true_range(candle_column(data, 'high'), candle_column(data, 'low'), candle_column(data, 'close'))
+    return atr_from_true_range(true_ranges, period)
+
+def atr_from_true_range(true_ranges: np.ndarray, period: int = 14) -> float:
+    """
+    ATR dari seri True Range yang sudah dihitung (rata-rata `period` nilai terakhir)
+    """
     # Take the last 'period' values
-    recent_tr = true_ranges[-period:] if len(true_ranges) >= period else true_ranges
+    recent_tr = true_ranges[-period:].tolist()
     
     if not recent_tr:
         return 0.0
@@ -45,7 +50,7 @@ def calculate_atr_percent(data: List[Dict], period: int = 14) -> float:
     if len(data) < period + 1:
         return 0.0
     
-    current_price = data[-1]['close']
+    current_price = candle_column(data, 'close')[-1]
     atr = calculate_atr(data, period)
     
     if current_price == 0:
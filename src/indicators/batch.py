@@ -0,0 +1,216 @@
+import numpy as np
+from typing import List, Dict, Tuple, Union
+from src.data.candle_series import CandleSeries, candle_column
+from src.indicators.technical import _decay_scan, ewm_window_weights
+
+# Kernel indikator lintas symbol: input matriks 2-D (satu baris per symbol, kolom = waktu) dan semua
+# baris dihitung dalam satu pass NumPy. NaN menandai candle yang tidak ada (histori pendek atau celah);
+# hasil setiap baris sama dengan fungsi skalar (calculate_rsi, calculate_ema, ...) atas candle valid baris itu.
+
+
+def symbol_matrix(data_by_symbol: Dict[str, Union[CandleSeries, List[Dict]]],
+                  fields: Tuple[str, ...] = ('high', 'low', 'close'),
+                  lookback: int = None) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Menyusun candle banyak symbol menjadi matriks (symbols x waktu) yang sejajar pada open_time
+    Kolom adalah gabungan open_time semua symbol (`lookback` kolom terakhir jika diisi);
+    candle yang tidak dimiliki symbol bernilai NaN.
+    Returns: (symbols, open_times, {field: matriks})
+    """
+    symbols = list(data_by_symbol)
+    open_times = [np.asarray(candle_column(data_by_symbol[symbol], 'open_time'), dtype=np.int64) for symbol in symbols]
+    columns = np.unique(np.concatenate(open_times)) if open_times else np.zeros(0, dtype=np.int64)
+    if lookback is not None:
+        columns = columns[-lookback:]
+
+    matrices = {field: np.full((len(symbols), len(columns)), np.nan) for field in fields}
+    for row, symbol in enumerate(symbols):
+        times = open_times[row]
+        keep = np.isin(times, columns)
+        positions = np.searchsorted(columns, times[keep])
+        for field in fields:
+            values = np.asarray(candle_column(data_by_symbol[symbol], field), dtype=float)
+            matrices[field][row, positions] = values[keep]
+    return symbols, columns, matrices
+
+
+def right_align(*matrices: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Menggeser nilai valid setiap baris ke kanan (urutan tetap) sehingga NaN hanya ada di awal baris.
+    Sebuah kolom valid jika semua matriks bernilai finite di posisi itu.
+    Returns: (matriks yang sudah digeser, jumlah nilai valid per baris)
+    """
+    valid = np.logical_and.reduce([np.isfinite(matrix) for matrix in matrices])
+    lengths = valid.sum(axis=1)
+    if (valid[:, 1:] >= valid[:, :-1]).all():
+        # Kasus umum: NaN hanya di awal baris (histori pendek), cukup samakan mask antar matriks
+        return [np.where(valid, matrix, np.nan) for matrix in matrices], lengths
+    order = np.argsort(valid, axis=1, kind='stable')
+    aligned = []
+    for matrix in matrices:
+        shifted = np.take_along_axis(matrix, order, axis=1)
+        shifted[~np.take_along_axis(valid, order, axis=1)] = np.nan
+        aligned.append(shifted)
+    return aligned, lengths
+
+
+def _lengths(matrix: np.ndarray) -> np.ndarray:
+    return np.isfinite(matrix).sum(axis=1)
+
+
+def _tail_mean(matrix: np.ndarray, count: int) -> np.ndarray:
+    """
+    Rata-rata `count` kolom terakhir per baris (baris dengan NaN di sana menghasilkan NaN)
+    """
+    if matrix.shape[1] < count:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix[:, matrix.shape[1] - count:].mean(axis=1)
+
+
+def batch_ema_series(prices: np.ndarray, span: int) -> np.ndarray:
+    """
+    Seri EMA (ewm adjust=False) per baris untuk matriks yang sudah right_align;
+    setiap baris dimulai dari nilai valid pertamanya, kolom sebelumnya NaN
+    """
+    prices = np.asarray(prices, dtype=float)
+    valid = np.isfinite(prices)
+    if prices.shape[1] == 0:
+        return prices.copy()
+    alpha = 2 / (span + 1)
+    first = valid & ~np.concatenate([np.zeros((len(prices), 1), dtype=bool), valid[:, :-1]], axis=1)
+    # Nilai pertama masuk apa adanya (state awal 0), sesudahnya alpha * harga
+    inputs = np.where(first, prices, alpha * np.where(valid, prices, 0.0))
+    return np.where(valid, _decay_scan(inputs, 1 - alpha, 0.0), np.nan)
+
+
+def batch_ema(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA terakhir per baris, setara dengan calculate_ema(harga valid baris, period)
+    """
+    prices, = right_align(prices)[0]
+    lengths = _lengths(prices)
+    ema = np.zeros(len(prices))
+    if prices.shape[1] == 0:
+        return ema
+    # Data lebih sedikit dari periode: rata-rata harga valid
+    short = (lengths > 0) & (lengths < period)
+    if short.any():
+        ema[short] = np.nanmean(prices[short], axis=1)
+    full = lengths >= period
+    if full.any():
+        ema[full] = batch_ema_series(prices[full], period)[:, -1]
+    return ema
+
+
+def batch_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI terakhir per baris, setara dengan calculate_rsi(harga valid baris, period)
+    """
+    closes, = right_align(closes)[0]
+    lengths = _lengths(closes)
+    rsi = np.full(len(closes), 50.0)
+    ready = lengths >= period + 1
+    if not ready.any():
+        return rsi
+
+    # Hanya `period` perubahan harga terakhir yang dipakai
+    deltas = np.diff(closes[ready, -(period + 1):], axis=1)
+    avg_gain = _tail_mean(np.where(deltas > 0, deltas, 0.0), period)
+    avg_loss = _tail_mean(np.where(deltas < 0, -deltas, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[ready] = np.where(avg_loss == 0, 100.0, values)
+    return rsi
+
+
+def batch_macd(closes: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD terakhir per baris, setara dengan calculate_macd(harga valid baris, fast, slow, signal)
+    Returns: (macd_line, signal_line, histogram)
+    """
+    closes, = right_align(closes)[0]
+    lengths = _lengths(closes)
+    macd_line = np.zeros(len(closes))
+    signal_line = np.zeros(len(closes))
+    ready = lengths >= slow
+    if ready.any():
+        macd_series = batch_ema_series(closes[ready], fast) - batch_ema_series(closes[ready], slow)
+        macd_line[ready] = macd_series[:, -1]
+        # Signal line: EMA atas `signal` nilai MACD terakhir (dimulai ulang di awal jendela)
+        signal_line[ready] = macd_series[:, -1]
+        full = lengths[ready] >= slow + signal
+        signal_line[np.flatnonzero(ready)[full]] = macd_series[full, -signal:] @ ewm_window_weights(signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def batch_true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """
+    True Range per baris (kolom 1..T-1); NaN jika candle atau close sebelumnya tidak ada
+    """
+    prev_closes = closes[:, :-1]
+    with np.errstate(invalid='ignore'):
+        return np.maximum.reduce([
+            highs[:, 1:] - lows[:, 1:],
+            np.abs(highs[:, 1:] - prev_closes),
+            np.abs(lows[:, 1:] - prev_closes)
+        ])
+
+
+def batch_atr(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    ATR terakhir per baris, setara dengan calculate_atr(candle valid baris, period)
+    """
+    (highs, lows, closes), lengths = right_align(highs, lows, closes)
+    atr = np.zeros(len(closes))
+    ready = lengths >= period + 1
+    if ready.any():
+        tail = slice(-(period + 1), None)
+        atr[ready] = _tail_mean(batch_true_range(highs[ready, tail], lows[ready, tail], closes[ready, tail]), period)
+    return atr
+
+
+def _batch_wilder_smooth(values: np.ndarray, lengths: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder smoothing per baris untuk seri right-aligned sepanjang `lengths`: nilai awal = jumlah `period`
+    nilai pertama (di kolom ke-period baris itu), lalu s = s - s / period + x.
+    Kolom sebelum nilai awal tidak bermakna.
+    """
+    rows = np.arange(len(values))
+    first = values.shape[1] - lengths  # kolom nilai valid pertama setiap baris
+    start = first + period - 1         # kolom nilai awal setiap baris
+    initial = np.take_along_axis(values, first[:, None] + np.arange(period), axis=1).sum(axis=1)
+    inputs = np.where(np.arange(values.shape[1]) > start[:, None], values, 0.0)
+    inputs[rows, start] = initial
+    return _decay_scan(inputs, 1 - 1 / period, 0.0)
+
+
+def batch_adx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    ADX terakhir per baris, setara dengan calculate_adx(candle valid baris, period)
+    Baris yang belum punya cukup data bernilai netral 25.0.
+    """
+    (highs, lows, closes), lengths = right_align(highs, lows, closes)
+    adx = np.full(len(closes), 25.0)
+    ready = lengths >= 2 * period
+    if not ready.any():
+        return adx
+
+    highs, lows, closes = highs[ready], lows[ready], closes[ready]
+    move_lengths = lengths[ready] - 1  # jumlah TR/DM valid per baris
+    tr_values = batch_true_range(highs, lows, closes)
+    up_move = highs[:, 1:] - highs[:, :-1]
+    down_move = lows[:, :-1] - lows[:, 1:]
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # TR, +DM dan -DM di-smooth dalam satu scan; hanya `period` kolom terakhir (DX untuk ADX terakhir) yang dipakai
+    smoothed = _batch_wilder_smooth(np.concatenate([tr_values, plus_dm, minus_dm]), np.tile(move_lengths, 3), period)
+    smoothed_tr, smoothed_plus_dm, smoothed_minus_dm = np.split(smoothed[:, -period:], 3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = np.where(smoothed_tr != 0, (smoothed_plus_dm / smoothed_tr) * 100, 0.0)
+        minus_di = np.where(smoothed_tr != 0, (smoothed_minus_dm / smoothed_tr) * 100, 0.0)
+        total_di = plus_di + minus_di
+        dx_values = np.where(total_di != 0, (np.abs(plus_di - minus_di) / total_di) * 100, 0.0)
+    adx[ready] = dx_values.mean(axis=1)
+    return adx
@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+from config import INDICATOR_CACHE_SIZE
+from src.data.candle_series import CandleSeries
+from src.indicators.pipeline import IndicatorPipeline
+from src.indicators.support_resistance import PivotDetector
+
+
+class IndicatorCache:
+    """
+    Cache LRU berukuran terbatas untuk hasil indikator dan analyze_market.
+    Key disusun oleh pemanggil, biasanya (jenis, symbol, interval, identitas window, parameter);
+    entry yang paling lama tidak dipakai dibuang saat cache penuh.
+    """
+    def __init__(self, max_size: int = INDICATOR_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Mengembalikan nilai untuk key; jika belum ada, compute() dipanggil (di luar lock) dan disimpan
+        """
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.entries),
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# Isi candle terakhir yang ikut menjadi identitas window (candle yang belum tertutup masih berubah)
+LAST_CANDLE_FIELDS = ('close', 'high', 'low', 'volume')
+
+
+def window_identity(data: Union[CandleSeries, List[Dict]]) -> Optional[Tuple]:
+    """
+    Identitas window candle: (open_time pertama, close_time terakhir, jumlah candle, close/high/low/volume
+    candle terakhir). Window dengan candle terakhir yang sama tetapi panjang berbeda menghasilkan indikator
+    berbeda, dan kline yang masih terbentuk menghasilkan identitas baru setiap kali harganya bergerak.
+    Returns None jika data kosong.
+    """
+    if not data:
+        return None
+    if isinstance(data, CandleSeries):
+        last = tuple(float(getattr(data, field)[-1]) for field in LAST_CANDLE_FIELDS)
+        return (int(data.open_time[0]), int(data.close_time[-1]), len(data)) + last
+    last = tuple(float(data[-1][field]) for field in LAST_CANDLE_FIELDS)
+    return (int(data[0]['open_time']), int(data[-1]['close_time']), len(data)) + last
+
+
+_cache: Optional[IndicatorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """
+    IndicatorCache bersama untuk seluruh proses
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = IndicatorCache()
+    return _cache
+
+
+def get_pipeline(data: Union[CandleSeries, List[Dict]], symbol: Optional[str] = None, interval: Optional[str] = None,
+                 cache: Optional[IndicatorCache] = None, pivots: Optional[PivotDetector] = None) -> IndicatorPipeline:
+    """
+    IndicatorPipeline untuk window ini; dengan symbol dan interval, nilai indikator yang sudah dihitung
+    untuk window yang sama diambil dari cache sehingga tidak dihitung ulang. Cache hanya menyimpan
+    dict hasil indikator, bukan pipeline beserta window candle-nya.
+    """
+    identity = window_identity(data)
+    if symbol is None or interval is None or identity is None:
+        return IndicatorPipeline(data, pivots=pivots)
+    cache = cache if cache is not None else get_indicator_cache()
+    results = cache.get_or_compute(('pipeline', symbol, interval) + identity, dict)
+    return IndicatorPipeline(data, results=results, pivots=pivots)
@@ -0,0 +1,196 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Dict, Tuple, Union
+from src.data.candle_series import CandleSeries, candle_column
+from src.indicators.ngtcv import calculate_ngtcv_series, average_ngtcv
+from src.indicators.support_resistance import PivotDetector
+from src.indicators.technical import calculate_adx_series, ema_series, ewm_window_weights, true_range
+
+# Mode batch: setiap indikator dihitung sekali untuk seluruh histori candle.
+# Nilai pada index i sama dengan hasil fungsi skalar yang dipanggil dengan data[:i+1].
+
+
+def rsi_history(closes, period: int = 14) -> np.ndarray:
+    """
+    RSI untuk setiap candle, setara dengan calculate_rsi(closes[:i+1], period)
+    """
+    closes = np.asarray(closes, dtype=float)
+    result = np.full(len(closes), 50.0)
+    if len(closes) < period + 1:
+        return result
+
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    avg_gain = sliding_window_view(gains, period).mean(axis=-1)
+    avg_loss = sliding_window_view(losses, period).mean(axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    result[period:] = np.where(avg_loss == 0, 100.0, rsi)
+    return result
+
+
+def ema_history(prices, period: int) -> np.ndarray:
+    """
+    EMA untuk setiap candle, setara dengan calculate_ema(prices[:i+1], period)
+    Sebelum data mencapai periode, nilainya adalah rata-rata kumulatif.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) == 0:
+        return np.zeros(0)
+
+    result = ema_series(prices, period)
+    warmup = min(period - 1, len(prices))
+    if warmup > 0:
+        result[:warmup] = np.cumsum(prices[:warmup]) / np.arange(1, warmup + 1)
+    return result
+
+
+def macd_history(closes, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD untuk setiap candle, setara dengan calculate_macd(closes[:i+1], fast, slow, signal)
+    Returns: (macd_line, signal_line, histogram)
+    """
+    closes = np.asarray(closes, dtype=float)
+    n = len(closes)
+    macd_line = np.zeros(n)
+    signal_line = np.zeros(n)
+    if n < slow:
+        return macd_line, signal_line, np.zeros(n)
+
+    macd_full = ema_series(closes, fast) - ema_series(closes, slow)
+
+    macd_line[slow - 1:] = macd_full[slow - 1:]
+    signal_line[slow - 1:] = macd_full[slow - 1:]
+
+    # Signal line dihitung dari EMA atas `signal` nilai MACD terakhir saja
+    first_full = slow + signal - 1
+    if n > first_full:
+        windows = sliding_window_view(macd_full, signal)
+        signal_line[first_full:] = windows[first_full - signal + 1:] @ ewm_window_weights(signal)
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def true_range_history(highs, lows, closes) -> np.ndarray:
+    """
+    True Range untuk setiap candle (index 0 bernilai NaN karena tidak punya close sebelumnya)
+    """
+    tr = np.full(len(highs), np.nan)
+    if len(highs) > 1:
+        tr[1:] = true_range(highs, lows, closes)
+    return tr
+
+
+def atr_history(highs, lows, closes, period: int = 14) -> np.ndarray:
+    """
+    ATR untuk setiap candle, setara dengan calculate_atr(data[:i+1], period)
+    """
+    n = len(highs)
+    result = np.zeros(n)
+    if n < period + 1:
+        return result
+
+    tr = true_range_history(highs, lows, closes)
+    result[period:] = sliding_window_view(tr[1:], period).mean(axis=-1)
+    return result
+
+
+def adx_history(highs, lows, closes, period: int = 14) -> np.ndarray:
+    """
+    ADX untuk setiap candle, setara dengan calculate_adx(highs[:i+1], lows[:i+1], closes[:i+1], period)
+    Candle yang belum punya cukup data bernilai netral 25.0.
+    """
+    return calculate_adx_series(highs, lows, closes, period)[0]
+
+
+def ngtcv_history(opens, highs, lows, closes, volumes, volume_period: int = 20) -> np.ndarray:
+    """
+    ngtCV per candle dengan baseline volume bergulir `volume_period` candle sebelumnya,
+    setara dengan calculate_ngtCV(candle) dengan 'historical_volumes' = volume sebelumnya
+    """
+    return calculate_ngtcv_series(opens, highs, lows, closes, volumes, volume_period)[0]
+
+
+def average_last_three(values: np.ndarray) -> np.ndarray:
+    """
+    Rata-rata 3 nilai terakhir untuk setiap candle (bentuk yang dipakai analyze_market)
+    Dua candle pertama tidak punya 3 nilai dan bernilai NaN.
+    """
+    return average_ngtcv(values, 3)
+
+
+def support_resistance_history(highs, lows, closes, period: int = 10, tolerance: float = 0.003) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Support/resistance terdekat dan posisi harga untuk setiap candle,
+    setara dengan get_nearest_support_resistance / is_near_support_resistance pada data[:i+1]
+    Pivot di index j baru terkonfirmasi pada candle j + period.
+    Returns: (support, resistance, sr_position)
+    """
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    n = len(closes)
+
+    support = np.empty(n)
+    resistance = np.empty(n)
+    detector = PivotDetector(period)
+    for i in range(n):
+        detector.push(highs[i], lows[i])
+        support[i], resistance[i] = detector.nearest(closes[i])
+
+    tolerance_amount = closes * tolerance
+    sr_position = np.where(
+        np.abs(closes - support) <= tolerance_amount, "NEAR_SUPPORT",
+        np.where(np.abs(closes - resistance) <= tolerance_amount, "NEAR_RESISTANCE", "AWAY_FROM_LEVELS")
+    )
+    return support, resistance, sr_position
+
+
+def engulfing_history(opens, closes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pola bullish/bearish engulfing untuk setiap candle (dibanding candle sebelumnya)
+    """
+    opens = np.asarray(opens, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    bullish = np.zeros(len(closes), dtype=bool)
+    bearish = np.zeros(len(closes), dtype=bool)
+    if len(closes) >= 2:
+        o, c = opens[1:], closes[1:]
+        prev_o, prev_c = opens[:-1], closes[:-1]
+        bullish[1:] = (c > o) & (c > prev_o) & (o < prev_c)
+        bearish[1:] = (c < o) & (o > prev_c) & (c < prev_o)
+    return bullish, bearish
+
+
+def compute_indicator_history(data: Union[CandleSeries, List[Dict]], rsi_period: int = 14, ema_periods: Tuple[int, ...] = (12, 26, 50, 200),
+                              atr_period: int = 14, adx_period: int = 14, pivot_period: int = 10) -> Dict[str, np.ndarray]:
+    """
+    Menghitung semua indikator sekali untuk seluruh histori candle.
+    Setiap array sejajar dengan index candle sehingga nilai per bar bisa dibaca dengan index.
+    """
+    opens = np.asarray(candle_column(data, 'open'), dtype=float)
+    highs = np.asarray(candle_column(data, 'high'), dtype=float)
+    lows = np.asarray(candle_column(data, 'low'), dtype=float)
+    closes = np.asarray(candle_column(data, 'close'), dtype=float)
+    volumes = np.asarray(candle_column(data, 'volume'), dtype=float)
+
+    history = {
+        'close': closes,
+        'close_time': np.asarray(candle_column(data, 'close_time'), dtype=np.int64),
+        'rsi': rsi_history(closes, rsi_period),
+        'atr': atr_history(highs, lows, closes, atr_period),
+        'adx': adx_history(highs, lows, closes, adx_period),
+        'ngtcv': average_last_three(ngtcv_history(opens, highs, lows, closes, volumes)),
+    }
+    for period in ema_periods:
+        history[f'ema_{period}'] = ema_history(closes, period)
+
+    history['macd_line'], history['signal_line'], history['macd_histogram'] = macd_history(closes)
+    history['support'], history['resistance'], history['sr_position'] = support_resistance_history(
+        highs, lows, closes, pivot_period
+    )
+    history['is_bullish_engulfing'], history['is_bearish_engulfing'] = engulfing_history(opens, closes)
+    return history
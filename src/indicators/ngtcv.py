@@ -1,6 +1,10 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, Tuple, List
 from config import NGTCV_WEIGHTS
 
+DEFAULT_AVERAGE_VOLUME = 1000.0  # Fallback jika belum ada volume historis
+
 def calculate_average_volume(historical_volumes: List[float], period: int = 20) -> float:
     """
     Menghitung rata-rata volume historis
@@ -13,13 +17,13 @@ def calculate_average_volume(historical_volumes: List[float], period: int = 20)
         Rata-rata volume dari periode terakhir
     """
     if not historical_volumes:
-        return 1000.0  # Default fallback
+        return DEFAULT_AVERAGE_VOLUME  # Default fallback
     
     # Ambil volume dari periode terakhir
     recent_volumes = historical_volumes[-period:] if len(historical_volumes) >= period else historical_volumes
     
     if not recent_volumes:
-        return 1000.0  # Default fallback
+        return DEFAULT_AVERAGE_VOLUME  # Default fallback
     
     return sum(recent_volumes) / len(recent_volumes)
 
@@ -29,6 +33,7 @@ def calculate_ngtCV(candle: Dict) -> Tuple[float, float, float, float]:
     
     Args:
         candle: Dictionary yang berisi data OHLCV, termasuk 'historical_volumes' untuk perhitungan referensi volume dinamis
+                atau 'average_volume' jika rata-rata volume sudah dihitung (mis. oleh indikator streaming)
         
     Returns:
         ngtcv: Nilai indikator (-1.0 to 1.0)
@@ -69,7 +74,7 @@ def calculate_ngtCV(candle: Dict) -> Tuple[float, float, float, float]:
     # Relative Volume (RVOL) - Membandingkan volume saat ini dengan rata-rata volume 20 candle terakhir
     # Hanya menghasilkan sinyal valid jika Volume > 1.5x Rata-rata Volume 20 candle terakhir
     if volume > 0:
-        avg_volume_reference = calculate_average_volume(historical_volumes)
+        avg_volume_reference = candle['average_volume'] if 'average_volume' in candle else calculate_average_volume(historical_volumes)
         volume_factor = volume / avg_volume_reference if avg_volume_reference > 0 else 1.0
         
         # Tambahkan pengecekan untuk Relative Volume (Point D dari revisi.md)
@@ -95,3 +100,76 @@ def calculate_ngtCV(candle: Dict) -> Tuple[float, float, float, float]:
     ngtcv = max(-1.0, min(1.0, ngtcv))
     
     return ngtcv, body_size, wick_ratio, volume_factor
+
+def rolling_volume_baseline(volumes, period: int = 20) -> np.ndarray:
+    """
+    Rata-rata volume `period` candle sebelumnya untuk setiap candle, setara dengan
+    calculate_average_volume(volumes[:i], period); candle pertama memakai fallback
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    n = len(volumes)
+    baseline = np.full(n, DEFAULT_AVERAGE_VOLUME)
+    if n < 2:
+        return baseline
+
+    # Sebelum ada `period` candle sebelumnya: rata-rata semua volume yang tersedia
+    warmup = min(period, n - 1)
+    baseline[1:warmup + 1] = np.cumsum(volumes[:warmup]) / np.arange(1, warmup + 1)
+    if n > period:
+        baseline[period:] = sliding_window_view(volumes[:-1], period).mean(axis=-1)
+    return baseline
+
+def calculate_ngtcv_series(opens, highs, lows, closes, volumes, volume_period: int = 20,
+                           volume_baseline=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Versi array dari calculate_ngtCV untuk seluruh seri sekaligus.
+    Relative volume dibandingkan dengan rata-rata bergulir `volume_period` candle sebelumnya
+    (setara dengan calculate_ngtCV(candle) dengan 'historical_volumes' = volume sebelumnya).
+    volume_baseline: baseline per candle yang sudah dihitung atau satu angka tetap (opsional)
+
+    Returns:
+        ngtcv, body_ratio, wick_ratio, volume_factor (array per candle)
+    """
+    opens = np.asarray(opens, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if volume_baseline is None:
+        volume_baseline = rolling_volume_baseline(volumes, volume_period)
+
+    # Body, arah candle, dan shadows
+    body_size = np.abs(closes - opens)
+    candle_direction = np.where(closes >= opens, 1, -1)
+    upper_shadow = highs - np.maximum(opens, closes)
+    lower_shadow = np.minimum(opens, closes) - lows
+    total_wick = upper_shadow + lower_shadow
+    total_range = highs - lows
+
+    # Normalisasi (hindari pembagian dengan nol)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        body_ratio = np.where(total_range > 0, body_size / total_range, 0.0)
+        wick_ratio = np.where(total_range > 0, total_wick / total_range, 0.0)
+        volume_factor = np.where(volume_baseline > 0, volumes / volume_baseline, 1.0)
+
+    # Volume tidak signifikan (< 1.5x rata-rata) kontribusinya dikurangi
+    volume_factor = np.where(volume_factor < 1.5, volume_factor * 0.5, volume_factor)
+    volume_factor = np.where(volumes > 0, volume_factor, 1.0)
+
+    ngtcv = (
+        (body_ratio * candle_direction * NGTCV_WEIGHTS['body']) +
+        (wick_ratio * -1 * abs(NGTCV_WEIGHTS['wick'])) +
+        (volume_factor * NGTCV_WEIGHTS['volume'])
+    )
+    return np.clip(ngtcv, -1.0, 1.0), body_ratio, wick_ratio, volume_factor
+
+def average_ngtcv(ngtcv, count: int = 3) -> np.ndarray:
+    """
+    Rata-rata ngtCV `count` candle terakhir untuk setiap candle (bentuk yang dipakai analyze_market)
+    Candle yang belum punya `count` nilai bernilai NaN.
+    """
+    ngtcv = np.asarray(ngtcv, dtype=float)
+    result = np.full(len(ngtcv), np.nan)
+    if len(ngtcv) >= count:
+        result[count - 1:] = sliding_window_view(ngtcv, count).sum(axis=-1) / count
+    return result
@@ -0,0 +1,160 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Union
+from src.data.candle_series import CandleSeries, candle_column
+from src.indicators.atr import atr_from_true_range
+from src.indicators.ngtcv import calculate_ngtcv_series
+from src.indicators.support_resistance import detect_pivots, PivotLevels, PivotDetector, classify_sr_position
+from src.indicators.technical import calculate_rsi, calculate_adx_series, ema_series, macd_from_ema, true_range
+
+
+class IndicatorPipeline:
+    """
+    Pipeline indikator untuk satu set candle. Setiap node (kolom, True Range, seri EMA per span,
+    lalu RSI/MACD/ATR/ADX/...) dihitung paling banyak sekali dan hasilnya dipakai ulang oleh
+    semua node lain yang membutuhkannya, misalnya:
+    - seri EMA 12/26 dipakai oleh ema(12), ema(26) dan macd()
+    - True Range dipakai oleh atr() dan adx()
+    Nilai setiap node sama dengan fungsi skalar yang setara (calculate_ema, calculate_macd, ...).
+    Node array (kolom, seri) hanya hidup selama pipeline ini; nilai indikator akhir disimpan di `results`,
+    yang bisa dibagi lewat IndicatorCache tanpa ikut menahan window candle.
+    `pivots`: PivotDetector yang sudah diberi candle sampai candle terakhir window ini; support/resistance
+    dibaca darinya tanpa memindai ulang window.
+    """
+    def __init__(self, data: Union[CandleSeries, List[Dict]], results: Optional[Dict] = None,
+                 pivots: Optional[PivotDetector] = None):
+        self.data = data
+        self.cache = {}
+        self.results = results if results is not None else {}
+        self.pivots = pivots
+
+    def _node(self, key: Tuple, compute):
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def _result(self, key: Tuple, compute):
+        if key not in self.results:
+            self.results[key] = compute()
+        return self.results[key]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, field: str) -> np.ndarray:
+        return self._node(('column', field), lambda: np.asarray(candle_column(self.data, field), dtype=float))
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.column('close')
+
+    def true_range(self) -> np.ndarray:
+        return self._node(('true_range',), lambda: true_range(self.column('high'), self.column('low'), self.closes))
+
+    def ema_series(self, span: int) -> np.ndarray:
+        return self._node(('ema_series', span), lambda: ema_series(self.closes, span))
+
+    def ema(self, period: int) -> float:
+        """
+        Setara dengan calculate_ema(closes, period)
+        """
+        def compute():
+            if len(self) == 0:
+                return 0.0
+            if len(self) < period:
+                return float(np.mean(self.closes))
+            return float(self.ema_series(period)[-1])
+        return self._result(('ema', period), compute)
+
+    def rsi(self, period: int = 14) -> float:
+        return self._result(('rsi', period), lambda: calculate_rsi(self.closes, period))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
+        """
+        Setara dengan calculate_macd(closes, fast, slow, signal)
+        """
+        def compute():
+            if len(self) < slow:
+                return 0.0, 0.0, 0.0
+            return macd_from_ema(self.ema_series(fast), self.ema_series(slow), slow, signal)
+        return self._result(('macd', fast, slow, signal), compute)
+
+    def atr(self, period: int = 14) -> float:
+        """
+        Setara dengan calculate_atr(data, period)
+        """
+        def compute():
+            if len(self) < period + 1:
+                return 0.0
+            return atr_from_true_range(self.true_range(), period)
+        return self._result(('atr', period), compute)
+
+    def adx_series(self, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._node(('adx_series', period), lambda: calculate_adx_series(
+            self.column('high'), self.column('low'), self.closes, period, true_ranges=self.true_range()
+        ))
+
+    def adx(self, period: int = 14) -> float:
+        """
+        Setara dengan calculate_adx(highs, lows, closes, period)
+        """
+        def compute():
+            adx = self.adx_series(period)[0]
+            return float(adx[-1]) if len(adx) else 25.0
+        return self._result(('adx', period), compute)
+
+    def support_resistance(self, period: int = 10) -> Tuple[float, float]:
+        """
+        Setara dengan get_nearest_support_resistance(harga terakhir, data, period)
+        """
+        def compute():
+            current_price = float(self.closes[-1])
+            if len(self) < period * 2 + 1:
+                return current_price, current_price
+            if self._pivots_match(period):
+                return self.pivots.nearest(current_price)
+            highs = self.column('high')
+            lows = self.column('low')
+            is_pivot_low, is_pivot_high = detect_pivots(highs, lows, period)
+            return PivotLevels(lows[is_pivot_low].tolist(), highs[is_pivot_high].tolist()).nearest(current_price)
+        return self._result(('support_resistance', period), compute)
+
+    def _pivots_match(self, period: int) -> bool:
+        # Detektor hanya setara dengan pemindaian window jika melihat candle yang sama persis
+        detector = self.pivots
+        if detector is None or detector.period != period or detector.last_open_time is None:
+            return False
+        seen = detector.count if detector.window is None else min(detector.count, detector.window)
+        return seen == len(self) and detector.last_open_time == int(candle_column(self.data, 'open_time')[-1])
+
+    def sr_position(self, tolerance: float = 0.003, period: int = 10) -> str:
+        support, resistance = self.support_resistance(period)
+        return classify_sr_position(float(self.closes[-1]), support, resistance, tolerance)
+
+    def ngtcv_average(self, count: int = 3, volume_period: int = 20) -> float:
+        """
+        Rata-rata ngtCV `count` candle terakhir (bentuk yang dipakai analyze_market),
+        dengan relative volume terhadap rata-rata `volume_period` candle sebelumnya
+        """
+        def compute():
+            # Hanya candle terakhir + window volume-nya yang dibutuhkan
+            window = slice(-(count + volume_period), None)
+            columns = (self.column(field)[window] for field in ('open', 'high', 'low', 'close', 'volume'))
+            ngtcv = calculate_ngtcv_series(*columns, volume_period=volume_period)[0]
+            return float(np.sum(ngtcv[-count:]) / count)
+        return self._result(('ngtcv_average', count, volume_period), compute)
+
+    def engulfing(self) -> Tuple[bool, bool]:
+        """
+        Returns: (is_bullish_engulfing, is_bearish_engulfing) untuk candle terakhir
+        """
+        def compute():
+            if len(self) < 2:
+                return False, False
+            opens = self.column('open')
+            closes = self.closes
+            o, c = opens[-1], closes[-1]
+            prev_o, prev_c = opens[-2], closes[-2]
+            is_bullish = bool(c > o and c > prev_o and o < prev_c)
+            is_bearish = bool(c < o and o > prev_c and c < prev_o)
+            return is_bullish, is_bearish
+        return self._result(('engulfing',), compute)
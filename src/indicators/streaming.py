@@ -0,0 +1,444 @@
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+from src.indicators.ngtcv import DEFAULT_AVERAGE_VOLUME, calculate_ngtCV
+
+# Indikator stateful yang maju O(1) per candle tertutup (update dan value).
+# Nilai `value` setelah update(data[i]) sama dengan fungsi skalar pada data[:i+1].
+# snapshot() menghasilkan dict yang bisa disimpan ke JSON, restore() melanjutkannya tanpa warm-up.
+
+
+class RollingSum:
+    """
+    Jumlah `window` nilai terakhir yang diperbarui saat nilai masuk/keluar.
+    Jumlah dihitung ulang setiap `window` nilai (O(1) amortized) agar galat pembulatan tidak menumpuk,
+    dan bernilai tepat 0.0 jika semua nilai dalam window nol.
+    """
+    def __init__(self, window: int):
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nonzero = 0
+        self.pushes = 0
+
+    def append(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            evicted = self.values[0]
+            self.total -= evicted
+            self.nonzero -= evicted != 0
+        self.values.append(value)
+        self.total += value
+        self.nonzero += value != 0
+        self.pushes += 1
+        if self.pushes % self.values.maxlen == 0:
+            self.total = math.fsum(self.values)
+
+    def snapshot(self) -> Dict:
+        # Jumlah berjalan ikut disimpan agar hasil setelah restore identik sampai bit terakhir
+        return {'values': list(self.values), 'total': self.total, 'pushes': self.pushes}
+
+    def load(self, state: Dict):
+        self.values.clear()
+        self.values.extend(state['values'])
+        self.total = state['total']
+        self.pushes = state['pushes']
+        self.nonzero = sum(value != 0 for value in self.values)
+
+    @property
+    def sum(self) -> float:
+        return self.total if self.nonzero else 0.0
+
+    @property
+    def maxlen(self) -> int:
+        return self.values.maxlen
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index: int) -> float:
+        return self.values[index]
+
+
+class StreamingEMA:
+    """
+    EMA inkremental, setara dengan calculate_ema(closes, period)
+    """
+    def __init__(self, period: int, source: str = 'close'):
+        self.period = period
+        self.source = source
+        self.alpha = 2 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.ewm = 0.0
+
+    def update(self, candle: Dict) -> float:
+        price = float(candle[self.source])
+        self.ewm = price if self.count == 0 else (1 - self.alpha) * self.ewm + self.alpha * price
+        self.total += price
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.count < self.period:
+            # Jika data lebih sedikit dari periode, gunakan rata-rata
+            return self.total / self.count
+        return self.ewm
+
+    def snapshot(self) -> Dict:
+        return {'period': self.period, 'source': self.source, 'count': self.count, 'total': self.total, 'ewm': self.ewm}
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingEMA':
+        indicator = cls(state['period'], state.get('source', 'close'))
+        indicator.count = state['count']
+        indicator.total = state['total']
+        indicator.ewm = state['ewm']
+        return indicator
+
+
+class StreamingRSI:
+    """
+    RSI inkremental, setara dengan calculate_rsi(closes, period)
+    (rata-rata sederhana gain/loss pada `period` perubahan terakhir)
+    """
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.gains = RollingSum(period)
+        self.losses = RollingSum(period)
+
+    def update(self, candle: Dict) -> float:
+        close = float(candle['close'])
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gains.append(delta if delta > 0 else 0.0)
+            self.losses.append(-delta if delta < 0 else 0.0)
+        self.prev_close = close
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self.gains) < self.period:
+            return 50.0
+        avg_gain = self.gains.sum / self.period
+        avg_loss = self.losses.sum / self.period
+        if avg_loss == 0:
+            return 100.0
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def snapshot(self) -> Dict:
+        return {'period': self.period, 'prev_close': self.prev_close, 'gains': self.gains.snapshot(), 'losses': self.losses.snapshot()}
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingRSI':
+        indicator = cls(state['period'])
+        indicator.prev_close = state['prev_close']
+        indicator.gains.load(state['gains'])
+        indicator.losses.load(state['losses'])
+        return indicator
+
+
+class StreamingATR:
+    """
+    ATR inkremental, setara dengan calculate_atr(data, period)
+    """
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.true_ranges = RollingSum(period)
+
+    def update(self, candle: Dict) -> float:
+        high, low = float(candle['high']), float(candle['low'])
+        if self.prev_close is not None:
+            self.true_ranges.append(max(high - low, abs(high - self.prev_close), abs(low - self.prev_close)))
+        self.prev_close = float(candle['close'])
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self.true_ranges) < self.period:
+            return 0.0
+        return self.true_ranges.sum / self.period
+
+    def snapshot(self) -> Dict:
+        return {'period': self.period, 'prev_close': self.prev_close, 'true_ranges': self.true_ranges.snapshot()}
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingATR':
+        indicator = cls(state['period'])
+        indicator.prev_close = state['prev_close']
+        indicator.true_ranges.load(state['true_ranges'])
+        return indicator
+
+
+class StreamingADX:
+    """
+    ADX inkremental dengan Wilder smoothing, setara dengan calculate_adx(highs, lows, closes, period)
+    """
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev: Optional[Tuple[float, float, float]] = None
+        self.count = 0  # Jumlah nilai TR/DM yang sudah masuk
+        self.smoothed_tr = 0.0
+        self.smoothed_plus_dm = 0.0
+        self.smoothed_minus_dm = 0.0
+        self.plus_di = 0.0
+        self.minus_di = 0.0
+        self.dx_values = RollingSum(period)
+
+    def update(self, candle: Dict) -> float:
+        high, low, close = float(candle['high']), float(candle['low']), float(candle['close'])
+        if self.prev is not None:
+            prev_high, prev_low, prev_close = self.prev
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            up_move = high - prev_high
+            down_move = prev_low - low
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+            self._add(tr, plus_dm, minus_dm)
+        self.prev = (high, low, close)
+        return self.value
+
+    def _add(self, tr: float, plus_dm: float, minus_dm: float):
+        self.count += 1
+        if self.count <= self.period:
+            # Nilai awal Wilder smoothing adalah jumlah `period` data pertama
+            self.smoothed_tr += tr
+            self.smoothed_plus_dm += plus_dm
+            self.smoothed_minus_dm += minus_dm
+            if self.count < self.period:
+                return
+        else:
+            self.smoothed_tr = self.smoothed_tr - (self.smoothed_tr / self.period) + tr
+            self.smoothed_plus_dm = self.smoothed_plus_dm - (self.smoothed_plus_dm / self.period) + plus_dm
+            self.smoothed_minus_dm = self.smoothed_minus_dm - (self.smoothed_minus_dm / self.period) + minus_dm
+
+        if self.smoothed_tr != 0:
+            self.plus_di = (self.smoothed_plus_dm / self.smoothed_tr) * 100
+            self.minus_di = (self.smoothed_minus_dm / self.smoothed_tr) * 100
+        else:
+            self.plus_di = self.minus_di = 0.0
+        total_di = self.plus_di + self.minus_di
+        self.dx_values.append((abs(self.plus_di - self.minus_di) / total_di) * 100 if total_di != 0 else 0.0)
+
+    @property
+    def value(self) -> float:
+        if len(self.dx_values) < self.period:
+            return 25.0  # Nilai netral jika data belum cukup
+        return self.dx_values.sum / self.period
+
+    def snapshot(self) -> Dict:
+        return {
+            'period': self.period,
+            'prev': list(self.prev) if self.prev else None,
+            'count': self.count,
+            'smoothed_tr': self.smoothed_tr,
+            'smoothed_plus_dm': self.smoothed_plus_dm,
+            'smoothed_minus_dm': self.smoothed_minus_dm,
+            'plus_di': self.plus_di,
+            'minus_di': self.minus_di,
+            'dx_values': self.dx_values.snapshot()
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingADX':
+        indicator = cls(state['period'])
+        indicator.prev = tuple(state['prev']) if state['prev'] else None
+        indicator.count = state['count']
+        indicator.smoothed_tr = state['smoothed_tr']
+        indicator.smoothed_plus_dm = state['smoothed_plus_dm']
+        indicator.smoothed_minus_dm = state['smoothed_minus_dm']
+        indicator.plus_di = state['plus_di']
+        indicator.minus_di = state['minus_di']
+        indicator.dx_values.load(state['dx_values'])
+        return indicator
+
+
+class StreamingMACD:
+    """
+    MACD inkremental, setara dengan calculate_macd(closes, fast, slow, signal)
+    value: (macd_line, signal_line, histogram)
+    """
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = signal
+        self.alpha = 2 / (signal + 1)
+        self.macd_values = deque(maxlen=signal)
+        # Bagian signal line dari nilai MACD selain yang tertua: sum alpha * (1 - alpha)^(n-1-k) * macd[k], k >= 1
+        self.signal_tail = 0.0
+
+    def update(self, candle: Dict) -> Tuple[float, float, float]:
+        self.fast.update(candle)
+        self.slow.update(candle)
+        self._push(self.fast.ewm - self.slow.ewm)
+        return self.value
+
+    def _push(self, macd_value: float):
+        values = self.macd_values
+        if len(values) == values.maxlen:
+            # Nilai tertua keluar dan values[1] menjadi awal EMA yang baru
+            evicted = self.alpha * (1 - self.alpha) ** (values.maxlen - 1) * values[1] if values.maxlen > 1 else 0.0
+            self.signal_tail = (1 - self.alpha) * self.signal_tail + self.alpha * macd_value - evicted
+        elif values:
+            self.signal_tail = (1 - self.alpha) * self.signal_tail + self.alpha * macd_value
+        values.append(macd_value)
+        if values.maxlen == 1:
+            self.signal_tail = 0.0
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        count = self.slow.count
+        if count < self.slow.period:
+            return 0.0, 0.0, 0.0
+
+        macd_line = self.macd_values[-1]
+        if count >= self.slow.period + self.signal:
+            # Signal line = EMA atas `signal` nilai MACD terakhir, dimulai ulang dari nilai tertua
+            signal_line = (1 - self.alpha) ** (self.signal - 1) * self.macd_values[0] + self.signal_tail
+        else:
+            signal_line = macd_line
+        return macd_line, signal_line, macd_line - signal_line
+
+    def snapshot(self) -> Dict:
+        return {
+            'fast': self.fast.snapshot(),
+            'slow': self.slow.snapshot(),
+            'signal': self.signal,
+            'macd_values': list(self.macd_values),
+            'signal_tail': self.signal_tail
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingMACD':
+        indicator = cls(state['fast']['period'], state['slow']['period'], state['signal'])
+        indicator.fast = StreamingEMA.restore(state['fast'])
+        indicator.slow = StreamingEMA.restore(state['slow'])
+        indicator.macd_values.extend(state['macd_values'])
+        indicator.signal_tail = state['signal_tail']
+        return indicator
+
+
+class StreamingNgtCV:
+    """
+    ngtCV inkremental dengan baseline volume bergulir, setara dengan calculate_ngtcv_series
+    value: rata-rata ngtCV `average_count` candle terakhir (0.0 sebelum cukup data)
+    """
+    def __init__(self, volume_period: int = 20, average_count: int = 3):
+        self.volume_period = volume_period
+        self.volumes = RollingSum(volume_period)
+        self.recent_values = RollingSum(average_count)
+
+    @property
+    def average_volume(self) -> float:
+        # Rata-rata `volume_period` volume sebelumnya dari jumlah bergulir, setara dengan calculate_average_volume
+        if not self.volumes:
+            return DEFAULT_AVERAGE_VOLUME
+        return self.volumes.sum / len(self.volumes)
+
+    def update(self, candle: Dict) -> float:
+        ngtcv, _, _, _ = calculate_ngtCV(dict(candle, average_volume=self.average_volume))
+        self.recent_values.append(ngtcv)
+        self.volumes.append(float(candle['volume']))
+        return self.value
+
+    @property
+    def last(self) -> float:
+        return self.recent_values[-1] if self.recent_values else 0.0
+
+    @property
+    def value(self) -> float:
+        if len(self.recent_values) < self.recent_values.maxlen:
+            return 0.0
+        return self.recent_values.sum / len(self.recent_values)
+
+    def snapshot(self) -> Dict:
+        return {
+            'volume_period': self.volume_period,
+            'average_count': self.recent_values.maxlen,
+            'volumes': self.volumes.snapshot(),
+            'recent_values': self.recent_values.snapshot()
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingNgtCV':
+        indicator = cls(state['volume_period'], state['average_count'])
+        indicator.volumes.load(state['volumes'])
+        indicator.recent_values.load(state['recent_values'])
+        return indicator
+
+
+class StreamingIndicatorSet:
+    """
+    Kumpulan indikator streaming untuk satu (symbol, interval)
+    Candle dengan open_time yang sudah diproses diabaikan sehingga aman dipanggil ulang setiap siklus.
+    """
+    def __init__(self, rsi_period: int = 14, ema_periods: Tuple[int, ...] = (12, 26, 50, 200),
+                 atr_period: int = 14, adx_period: int = 14):
+        self.rsi = StreamingRSI(rsi_period)
+        self.emas = {period: StreamingEMA(period) for period in ema_periods}
+        self.macd = StreamingMACD()
+        self.atr = StreamingATR(atr_period)
+        self.adx = StreamingADX(adx_period)
+        self.ngtcv = StreamingNgtCV()
+        self.last_open_time: Optional[int] = None
+
+    def update(self, candle: Dict) -> bool:
+        """
+        Memproses satu candle tertutup. Returns False jika candle sudah pernah diproses.
+        """
+        open_time = candle.get('open_time')
+        if open_time is not None and self.last_open_time is not None and open_time <= self.last_open_time:
+            return False
+        for indicator in (self.rsi, self.macd, self.atr, self.adx, self.ngtcv, *self.emas.values()):
+            indicator.update(candle)
+        if open_time is not None:
+            self.last_open_time = open_time
+        return True
+
+    @property
+    def values(self) -> Dict:
+        macd_line, signal_line, histogram = self.macd.value
+        values = {
+            'rsi': self.rsi.value,
+            'macd_line': macd_line,
+            'signal_line': signal_line,
+            'macd_histogram': histogram,
+            'atr': self.atr.value,
+            'adx': self.adx.value,
+            'plus_di': self.adx.plus_di,
+            'minus_di': self.adx.minus_di,
+            'ngtcv': self.ngtcv.value
+        }
+        for period, ema in self.emas.items():
+            values[f'ema_{period}'] = ema.value
+        return values
+
+    def snapshot(self) -> Dict:
+        return {
+            'rsi': self.rsi.snapshot(),
+            'emas': [ema.snapshot() for ema in self.emas.values()],
+            'macd': self.macd.snapshot(),
+            'atr': self.atr.snapshot(),
+            'adx': self.adx.snapshot(),
+            'ngtcv': self.ngtcv.snapshot(),
+            'last_open_time': self.last_open_time
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingIndicatorSet':
+        indicators = cls.__new__(cls)
+        indicators.rsi = StreamingRSI.restore(state['rsi'])
+        indicators.emas = {ema['period']: StreamingEMA.restore(ema) for ema in state['emas']}
+        indicators.macd = StreamingMACD.restore(state['macd'])
+        indicators.atr = StreamingATR.restore(state['atr'])
+        indicators.adx = StreamingADX.restore(state['adx'])
+        indicators.ngtcv = StreamingNgtCV.restore(state['ngtcv'])
+        indicators.last_open_time = state['last_open_time']
+        return indicators
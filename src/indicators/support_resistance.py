@@ -1,5 +1,58 @@
-from typing import List, Dict, Tuple
+import bisect
+from collections import deque
+from typing import List, Dict, Tuple, Optional
 import numpy as np
+from src.data.candle_series import candle_column
+
+def _rolling_extreme(values, window: int, func) -> np.ndarray:
+    """
+    Minimum/maksimum bergulir O(n) (algoritma van Herk/Gil-Werman)
+    Hasil ke-i adalah func atas values[i:i+window]; panjang hasil n - window + 1
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < window:
+        return np.zeros(0)
+
+    # Bagi data menjadi blok sepanjang window, lalu gabungkan akumulasi suffix dan prefix antar blok
+    fill = np.inf if func is np.minimum else -np.inf
+    padded = np.concatenate([values, np.full((-n) % window, fill)])
+    blocks = padded.reshape(-1, window)
+    prefix = func.accumulate(blocks, axis=1).ravel()
+    suffix = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return func(suffix[:n - window + 1], prefix[window - 1:n])
+
+def rolling_min(values, window: int) -> np.ndarray:
+    return _rolling_extreme(values, window, np.minimum)
+
+def rolling_max(values, window: int) -> np.ndarray:
+    return _rolling_extreme(values, window, np.maximum)
+
+def detect_pivots(highs, lows, period: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Menandai pivot low/high dalam O(n): candle i adalah pivot low jika low-nya lebih rendah
+    dari semua low di [i - period, i + period] selain dirinya (pivot high sebaliknya).
+    Pivot low diprioritaskan jika satu candle memenuhi keduanya.
+    Returns: (is_pivot_low, is_pivot_high) sebagai array boolean per candle
+    """
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    n = len(highs)
+    is_pivot_low = np.zeros(n, dtype=bool)
+    is_pivot_high = np.zeros(n, dtype=bool)
+    if n < period * 2 + 1:
+        return is_pivot_low, is_pivot_high
+
+    # Jendela kiri [i - period, i - 1] dimulai di i - period, jendela kanan [i + 1, i + period] di i + 1
+    low_window = rolling_min(lows, period)
+    high_window = rolling_max(highs, period)
+    center = slice(period, n - period)
+    left = slice(0, n - 2 * period)
+    right = slice(period + 1, n - period + 1)
+
+    is_pivot_low[center] = lows[center] < np.minimum(low_window[left], low_window[right])
+    is_pivot_high[center] = (highs[center] > np.maximum(high_window[left], high_window[right])) & ~is_pivot_low[center]
+    return is_pivot_low, is_pivot_high
 
 def find_pivot_points(data: List[Dict], period: int = 10) -> Tuple[List[float], List[float]]:
     """
@@ -7,72 +60,187 @@ def find_pivot_points(data: List[Dict], period: int = 10) -> Tuple[List[float],
     """
     if len(data) < period * 2 + 1:
         return [], []
-    
-    highs = [candle['high'] for candle in data]
-    lows = [candle['low'] for candle in data]
-    
-    pivot_supports = []
-    pivot_resistances = []
-    
-    # Cari pivot points
-    for i in range(period, len(data) - period):
-        # Cek apakah ini pivot low (lowest low dalam periode)
-        is_pivot_low = True
-        for j in range(i - period, i + period + 1):
-            if j != i and lows[j] <= lows[i]:
-                is_pivot_low = False
-                break
-        
-        # Cek apakah ini pivot high (highest high dalam periode)
-        is_pivot_high = True
-        for j in range(i - period, i + period + 1):
-            if j != i and highs[j] >= highs[i]:
-                is_pivot_high = False
-                break
-        
-        if is_pivot_low:
-            pivot_supports.append(lows[i])
-        elif is_pivot_high:
-            pivot_resistances.append(highs[i])
-    
-    return pivot_supports, pivot_resistances
+
+    highs = np.asarray(candle_column(data, 'high'), dtype=float)
+    lows = np.asarray(candle_column(data, 'low'), dtype=float)
+
+    is_pivot_low, is_pivot_high = detect_pivots(highs, lows, period)
+    return lows[is_pivot_low].tolist(), highs[is_pivot_high].tolist()
+
+
+class PivotLevels:
+    """
+    Indeks level pivot yang terurut sehingga support/resistance terdekat dicari dengan binary search
+    """
+    def __init__(self, supports: Optional[List[float]] = None, resistances: Optional[List[float]] = None):
+        self.supports = sorted(supports or [])
+        self.resistances = sorted(resistances or [])
+
+    def add_support(self, level: float):
+        bisect.insort(self.supports, level)
+
+    def add_resistance(self, level: float):
+        bisect.insort(self.resistances, level)
+
+    def nearest(self, current_price: float) -> Tuple[float, float]:
+        """
+        Support tertinggi di bawah harga dan resistance terendah di atas harga;
+        jika tidak ada, kembalikan harga saat ini
+        """
+        nearest_support = current_price
+        nearest_resistance = current_price
+
+        pos = bisect.bisect_left(self.supports, current_price)
+        if pos > 0 and self.supports[pos - 1] > 0:
+            nearest_support = self.supports[pos - 1]
+
+        pos = bisect.bisect_right(self.resistances, current_price)
+        if pos < len(self.resistances):
+            nearest_resistance = self.resistances[pos]
+
+        return nearest_support, nearest_resistance
+
+
+class RollingExtreme:
+    """
+    Minimum/maksimum `window` nilai terakhir dengan deque monoton: push O(1) amortized tanpa menyalin window
+    """
+    def __init__(self, window: int, maximum: bool = False):
+        self.window = window
+        self.maximum = maximum
+        self.count = 0
+        self.candidates = deque()  # (index, nilai), nilai monoton dari yang paling ekstrem
+
+    def push(self, value: float):
+        dominated = (lambda other: other <= value) if self.maximum else (lambda other: other >= value)
+        while self.candidates and dominated(self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def value(self) -> float:
+        return self.candidates[0][1]
+
+
+class PivotDetector:
+    """
+    Detektor pivot inkremental: setiap update(candle) hanya memeriksa candle yang baru
+    terkonfirmasi (period candle sebelumnya), sehingga tidak perlu memindai ulang seluruh window.
+    Minimum/maksimum `period` candle di kiri dan kanan dibaca dari RollingExtreme, jadi update O(1) amortized.
+    `window`: jika diisi, hanya pivot yang terdeteksi di `window` candle terakhir yang dipakai
+    (setara dengan find_pivot_points pada data[-window:]).
+    """
+    def __init__(self, period: int = 10, window: Optional[int] = None):
+        self.period = period
+        self.window = window
+        self.count = 0
+        self.last_open_time: Optional[int] = None
+        # Candle yang dikonfirmasi berikutnya ada di index 0
+        self.highs = deque(maxlen=period + 1)
+        self.lows = deque(maxlen=period + 1)
+        self.low_window = RollingExtreme(period)
+        self.high_window = RollingExtreme(period, maximum=True)
+        # Riwayat min/max `period` candle: index 0 = jendela kiri candle tengah, index -1 = jendela kanan
+        self.low_history = deque(maxlen=period + 2)
+        self.high_history = deque(maxlen=period + 2)
+        self.pivots = deque()  # (index candle, level, is_support) untuk kedaluwarsa window
+        self.levels = PivotLevels()
+
+    def update(self, candle: Dict):
+        self.push(float(candle['high']), float(candle['low']))
+        if candle.get('open_time') is not None:
+            self.last_open_time = int(candle['open_time'])
+
+    def push(self, high: float, low: float):
+        self.highs.append(high)
+        self.lows.append(low)
+        self.low_window.push(low)
+        self.high_window.push(high)
+        self.count += 1
+        if self.count >= self.period:
+            self.low_history.append(self.low_window.value)
+            self.high_history.append(self.high_window.value)
+
+        if len(self.low_history) == self.low_history.maxlen:
+            # Candle tengah kini punya `period` candle di kiri dan kanan
+            center_low = self.lows[0]
+            center_high = self.highs[0]
+            index = self.count - 1 - self.period
+            if center_low < min(self.low_history[0], self.low_history[-1]):
+                self.levels.add_support(center_low)
+                self.pivots.append((index, center_low, True))
+            elif center_high > max(self.high_history[0], self.high_history[-1]):
+                self.levels.add_resistance(center_high)
+                self.pivots.append((index, center_high, False))
+        self._expire()
+
+    def _expire(self):
+        if self.window is None:
+            return
+        # Pivot pertama yang masih punya `period` candle kiri di dalam window
+        oldest = self.count - self.window + self.period
+        while self.pivots and self.pivots[0][0] < oldest:
+            _, level, is_support = self.pivots.popleft()
+            levels = self.levels.supports if is_support else self.levels.resistances
+            del levels[bisect.bisect_left(levels, level)]
+
+    def nearest(self, current_price: float) -> Tuple[float, float]:
+        return self.levels.nearest(current_price)
+
+    def position(self, current_price: float, tolerance: float = 0.003) -> str:
+        support, resistance = self.nearest(current_price)
+        return classify_sr_position(current_price, support, resistance, tolerance)
+
+    def snapshot(self) -> Dict:
+        return {
+            'period': self.period,
+            'window': self.window,
+            'count': self.count,
+            'last_open_time': self.last_open_time,
+            'highs': list(self.highs),
+            'lows': list(self.lows),
+            'high_candidates': [list(candidate) for candidate in self.high_window.candidates],
+            'low_candidates': [list(candidate) for candidate in self.low_window.candidates],
+            'high_history': list(self.high_history),
+            'low_history': list(self.low_history),
+            'pivots': [list(pivot) for pivot in self.pivots]
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'PivotDetector':
+        detector = cls(state['period'], state['window'])
+        detector.count = state['count']
+        detector.last_open_time = state['last_open_time']
+        detector.highs.extend(state['highs'])
+        detector.lows.extend(state['lows'])
+        for rolling, candidates in ((detector.high_window, state['high_candidates']),
+                                    (detector.low_window, state['low_candidates'])):
+            rolling.count = detector.count
+            rolling.candidates.extend(tuple(candidate) for candidate in candidates)
+        detector.high_history.extend(state['high_history'])
+        detector.low_history.extend(state['low_history'])
+        detector.pivots.extend(tuple(pivot) for pivot in state['pivots'])
+        detector.levels = PivotLevels([level for _, level, is_support in detector.pivots if is_support],
+                                      [level for _, level, is_support in detector.pivots if not is_support])
+        return detector
+
 
 def get_nearest_support_resistance(current_price: float, data: List[Dict], period: int = 10) -> Tuple[float, float]:
     """
     Mendapatkan level support dan resistance terdekat dari harga saat ini
     """
     supports, resistances = find_pivot_points(data, period)
-    
-    nearest_support = 0
-    nearest_resistance = float('inf')
-    
-    # Cari support terdekat di bawah harga saat ini
-    for support in supports:
-        if support < current_price and support > nearest_support:
-            nearest_support = support
-    
-    # Cari resistance terdekat di atas harga saat ini
-    for resistance in resistances:
-        if resistance > current_price and resistance < nearest_resistance:
-            nearest_resistance = resistance
-    
-    # Jika tidak ditemukan, kembalikan harga saat ini
-    if nearest_support == 0:
-        nearest_support = current_price
-    if nearest_resistance == float('inf'):
-        nearest_resistance = current_price
-    
-    return nearest_support, nearest_resistance
+    return PivotLevels(supports, resistances).nearest(current_price)
 
-def is_near_support_resistance(current_price: float, data: List[Dict], tolerance: float = 0.003) -> str:
+def classify_sr_position(current_price: float, support: float, resistance: float, tolerance: float = 0.003) -> str:
     """
-    Menentukan apakah harga saat ini dekat dengan level support/resistance
-    tolerance: persentase toleransi dari harga (default 0.3%)
+    Mengklasifikasikan posisi harga terhadap level support/resistance
     """
-    support, resistance = get_nearest_support_resistance(current_price, data)
-    
     tolerance_amount = current_price * tolerance
-    
+
     # Cek apakah harga saat ini dekat dengan support
     if abs(current_price - support) <= tolerance_amount:
         return "NEAR_SUPPORT"
@@ -80,4 +248,12 @@ def is_near_support_resistance(current_price: float, data: List[Dict], tolerance
     elif abs(current_price - resistance) <= tolerance_amount:
         return "NEAR_RESISTANCE"
     else:
-        return "AWAY_FROM_LEVELS"
\ No newline at end of file
+        return "AWAY_FROM_LEVELS"
+
+def is_near_support_resistance(current_price: float, data: List[Dict], tolerance: float = 0.003) -> str:
+    """
+    Menentukan apakah harga saat ini dekat dengan level support/resistance
+    tolerance: persentase toleransi dari harga (default 0.3%)
+    """
+    support, resistance = get_nearest_support_resistance(current_price, data)
+    return classify_sr_position(current_price, support, resistance, tolerance)
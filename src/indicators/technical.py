@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
 
 def calculate_rsi(prices: List[float], period: int = 14) -> float:
     """
@@ -41,144 +43,192 @@ def calculate_ema_pandas(series: pd.Series, period: int) -> float:
         ema_series = series.ewm(span=period, adjust=False).mean()
         return float(ema_series.iloc[-1])
 
+@lru_cache(maxsize=64)
+def _scan_kernel(decay: float, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matriks transisi scan dalam blok dan pangkat decay untuk carry (di-cache per decay)
+    """
+    offsets = np.arange(block)[None, :] - np.arange(block)[:, None]
+    transition = np.where(offsets >= 0, decay ** np.maximum(offsets, 0), 0.0)
+    return transition, decay ** np.arange(1, block + 1)
+
+def _decay_scan(values: np.ndarray, decay: float, initial, block: int = 64) -> np.ndarray:
+    """
+    Menghitung rekurensi linear y[k] = decay * y[k-1] + values[k] dengan y[-1] = initial
+    sepenuhnya dengan NumPy: scan di dalam blok lewat perkalian matriks, lalu carry antar blok
+    diselesaikan secara rekursif (rekurensi yang sama dengan decay^block)
+    values boleh 2-D (satu baris per seri, scan di sumbu terakhir) dengan initial per baris.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    lead = values.shape[:-1]
+    if n == 0:
+        return np.zeros(values.shape)
+
+    padding = [(0, 0)] * len(lead) + [(0, (-n) % block)]
+    padded = np.pad(values, padding).reshape(*lead, -1, block)
+    transition, carry_decay = _scan_kernel(decay, block)
+    local = padded @ transition
+
+    initial = np.broadcast_to(np.asarray(initial, dtype=float), lead)[..., None]
+    if local.shape[-2] == 1:
+        carries = initial
+    else:
+        block_ends = _decay_scan(local[..., -1], decay ** block, initial[..., 0], block)
+        carries = np.concatenate([initial, block_ends[..., :-1]], axis=-1)
+
+    result = local + carries[..., None] * carry_decay
+    return result.reshape(*lead, -1)[..., :n]
+
+def _wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder smoothing: nilai awal = jumlah `period` data pertama, lalu s = s - s / period + x
+    """
+    initial = float(np.sum(values[:period]))
+    smoothed = _decay_scan(values[period:], 1 - 1 / period, initial)
+    return np.concatenate([[initial], smoothed])
+
+def ema_series(prices, span: int) -> np.ndarray:
+    """
+    Seri EMA lengkap (setara pandas ewm(span, adjust=False)) tanpa membuat pd.Series
+    """
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) == 0:
+        return np.zeros(0)
+    alpha = 2 / (span + 1)
+    return np.concatenate([prices[:1], _decay_scan(alpha * prices[1:], 1 - alpha, prices[0])])
+
+def ewm_window_weights(span: int) -> np.ndarray:
+    """
+    Bobot EMA (adjust=False) yang dimulai ulang pada awal jendela sepanjang `span`
+    """
+    alpha = 2 / (span + 1)
+    exponents = np.arange(span - 1, -1, -1)
+    weights = alpha * (1 - alpha) ** exponents
+    weights[0] = (1 - alpha) ** (span - 1)
+    return weights
+
+def true_range(highs, lows, closes) -> np.ndarray:
+    """
+    True Range untuk candle ke-1..n-1: max(high - low, |high - prev_close|, |low - prev_close|)
+    """
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    prev_closes = closes[:-1]
+    return np.maximum.reduce([
+        highs[1:] - lows[1:],
+        np.abs(highs[1:] - prev_closes),
+        np.abs(lows[1:] - prev_closes)
+    ])
+
 def calculate_ema(prices: List[float], period: int) -> float:
     """
     Calculate Exponential Moving Average (EMA)
     """
-    if not prices:
+    if len(prices) == 0:
         return 0.0
     elif len(prices) < period:
         # Jika data lebih sedikit dari periode, kita bisa menggunakan rata-rata
-        return sum(prices) / len(prices)
-    
-    # Using pandas for more efficient calculation
-    series = pd.Series(prices)
-    return calculate_ema_pandas(series, period)
+        return float(np.mean(prices))
+    return float(ema_series(prices, period)[-1])
 
 def calculate_ema_multiple(prices: List[float], periods: List[int]) -> Dict[int, float]:
     """
     Calculate multiple EMAs at once for efficiency
     Returns a dictionary with period as key and EMA value as value
     """
-    if not prices:
-        return {period: 0.0 for period in periods}
-    
-    import pandas as pd
-    series = pd.Series(prices)
-    
-    result = {}
-    for period in periods:
-        if len(prices) < period:
-            # If data is less than period, use average
-            result[period] = sum(prices) / len(prices)
-        else:
-            ema_series = series.ewm(span=period, adjust=False).mean()
-            result[period] = float(ema_series.iloc[-1])
-    
-    return result
+    return {period: calculate_ema(prices, period) for period in periods}
 
-def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9):
+def macd_from_ema(ema_fast: np.ndarray, ema_slow: np.ndarray, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
     """
-    Calculate MACD (Moving Average Convergence Divergence) using pandas for efficiency
+    MACD terakhir dari seri EMA cepat/lambat yang sudah dihitung
     Returns: (macd_line, signal_line, histogram)
     """
-    if len(prices) < slow:
+    if len(ema_slow) < slow:
         return 0.0, 0.0, 0.0
-    
-    # Convert to pandas Series for vectorized operations
-    series = pd.Series(prices)
-    
-    # Calculate EMAs using pandas ewm function (much more efficient)
-    ema_fast = series.ewm(span=fast, adjust=False).mean().iloc[-1]
-    ema_slow = series.ewm(span=slow, adjust=False).mean().iloc[-1]
-    
+
     # Calculate MACD line
-    macd_line = ema_fast - ema_slow
-    
+    macd_line = float(ema_fast[-1] - ema_slow[-1])
+
     # For signal line, we need the historical MACD values
-    if len(prices) >= slow + signal:
-        # Calculate the complete history of MACD values
-        ema_fast_series = series.ewm(span=fast, adjust=False).mean()
-        ema_slow_series = series.ewm(span=slow, adjust=False).mean()
-        macd_series = ema_fast_series - ema_slow_series
-        
-        # Get the last 'signal' number of MACD values to calculate the signal line
-        recent_macd_values = macd_series.iloc[-signal:]
-        signal_line = recent_macd_values.ewm(span=signal, adjust=False).mean().iloc[-1]
+    if len(ema_slow) >= slow + signal:
+        # EMA atas `signal` nilai MACD terakhir saja (dimulai ulang di awal jendela)
+        recent_macd_values = ema_fast[-signal:] - ema_slow[-signal:]
+        signal_line = float(recent_macd_values @ ewm_window_weights(signal))
     else:
         # If we don't have enough data, initialize signal line to same as MACD line
         signal_line = macd_line
 
     # Calculate histogram (difference between MACD line and signal line)
     histogram = macd_line - signal_line
-    
+
     return macd_line, signal_line, histogram
 
+def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    Calculate MACD (Moving Average Convergence Divergence)
+    Returns: (macd_line, signal_line, histogram)
+    """
+    if len(prices) < slow:
+        return 0.0, 0.0, 0.0
+    return macd_from_ema(ema_series(prices, fast), ema_series(prices, slow), slow, signal)
+
 
-def calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+def calculate_adx_series(highs, lows, closes, period: int = 14,
+                         true_ranges: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Calculate Average Directional Index (ADX)
+    Calculate ADX, +DI and -DI for every candle (vectorized)
+    Values at index i match calculate_adx on the first i+1 candles; ADX is 25.0 (neutral)
+    and +DI/-DI are NaN while there is not enough data.
+    true_ranges: hasil true_range() yang sudah dihitung (opsional, agar tidak dihitung ulang)
+    Returns: (adx, plus_di, minus_di)
     """
-    if len(highs) < period + 1:
-        return 25.0  # Return neutral value if not enough data
-    
-    # Calculate True Range (TR)
-    tr_values = []
-    for i in range(1, len(highs)):
-        tr = max(
-            highs[i] - lows[i],  # High - Low
-            abs(highs[i] - closes[i-1]),  # High - Previous Close
-            abs(lows[i] - closes[i-1])  # Low - Previous Close
-        )
-        tr_values.append(tr)
-    
-    # Calculate Directional Movement (+DM and -DM)
-    plus_dm = []
-    minus_dm = []
-    for i in range(1, len(highs)):
-        up_move = highs[i] - highs[i-1]
-        down_move = lows[i-1] - lows[i]
-        
-        if up_move > down_move and up_move > 0:
-            plus_dm.append(up_move)
-        else:
-            plus_dm.append(0)
-        
-        if down_move > up_move and down_move > 0:
-            minus_dm.append(down_move)
-        else:
-            minus_dm.append(0)
-    
-    # Smooth the values using Wilder's method
-    smoothed_tr = [sum(tr_values[:period])]
-    smoothed_plus_dm = [sum(plus_dm[:period])]
-    smoothed_minus_dm = [sum(minus_dm[:period])]
-    
-    for i in range(period, len(tr_values)):
-        smoothed_tr.append(smoothed_tr[-1] - (smoothed_tr[-1] / period) + tr_values[i])
-        smoothed_plus_dm.append(
-            smoothed_plus_dm[-1] - (smoothed_plus_dm[-1] / period) + plus_dm[i]
-        )
-        smoothed_minus_dm.append(
-            smoothed_minus_dm[-1] - (smoothed_minus_dm[-1] / period) + minus_dm[i]
-        )
-    
-    # Calculate Directional Indicators (+DI and -DI)
-    plus_di = [(smoothed_plus_dm[i] / smoothed_tr[i]) * 100 if smoothed_tr[i] != 0 else 0
-               for i in range(len(smoothed_tr))]
-    minus_di = [(smoothed_minus_dm[i] / smoothed_tr[i]) * 100 if smoothed_tr[i] != 0 else 0
-                for i in range(len(smoothed_tr))]
-    
-    # Calculate Directional Movement Index (DX)
-    dx_values = []
-    for i in range(len(plus_di)):
-        total_di = plus_di[i] + minus_di[i]
-        dx = (abs(plus_di[i] - minus_di[i]) / total_di) * 100 if total_di != 0 else 0
-        dx_values.append(dx)
-    
-    # Calculate ADX (average of DX)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    n = len(highs)
+    adx = np.full(n, 25.0)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    if n < period + 1:
+        return adx, plus_di, minus_di
+
+    # Calculate True Range (TR) and Directional Movement (+DM and -DM)
+    tr_values = true_range(highs, lows, closes) if true_ranges is None else true_ranges
+    up_move = highs[1:] - highs[:-1]
+    down_move = lows[:-1] - lows[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Smooth the values using Wilder's method; smoothed[k] belongs to candle period + k
+    smoothed_tr = _wilder_smooth(tr_values, period)
+    smoothed_plus_dm = _wilder_smooth(plus_dm, period)
+    smoothed_minus_dm = _wilder_smooth(minus_dm, period)
+
+    # Calculate Directional Indicators (+DI and -DI) and DX
+    with np.errstate(divide='ignore', invalid='ignore'):
+        smoothed_plus_di = np.where(smoothed_tr != 0, (smoothed_plus_dm / smoothed_tr) * 100, 0.0)
+        smoothed_minus_di = np.where(smoothed_tr != 0, (smoothed_minus_dm / smoothed_tr) * 100, 0.0)
+        total_di = smoothed_plus_di + smoothed_minus_di
+        dx_values = np.where(total_di != 0, (np.abs(smoothed_plus_di - smoothed_minus_di) / total_di) * 100, 0.0)
+    plus_di[period:] = smoothed_plus_di
+    minus_di[period:] = smoothed_minus_di
+
+    # Calculate ADX (average of the last `period` DX values)
     if len(dx_values) >= period:
-        adx = sum(dx_values[-period:]) / period
-        return float(adx)
-    else:
+        adx[2 * period - 1:] = sliding_window_view(dx_values, period).mean(axis=-1)
+    return adx, plus_di, minus_di
+
+def calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14,
+                  return_series: bool = False):
+    """
+    Calculate Average Directional Index (ADX)
+    return_series=True returns the full (adx, plus_di, minus_di) arrays instead of the latest ADX
+    """
+    adx, plus_di, minus_di = calculate_adx_series(highs, lows, closes, period)
+    if return_series:
+        return adx, plus_di, minus_di
+    if len(adx) == 0:
         return 25.0  # Return neutral value if not enough data
+    return float(adx[-1])
@@ -1,4 +1,5 @@
 import requests
+from src.utils.http_client import get_http_client
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -19,8 +20,8 @@ def send_telegram(message: str, bot_token: str, chat_id: str) -> bool:
     }
     
     try:
-        response = requests.post(url, data=payload, timeout=10)
-        response.raise_for_status()
+        # Tanpa retry setelah request terkirim: read timeout tidak boleh menggandakan pesan
+        get_http_client().post(url, data=payload, retry=False)
         logger.info(f"Telegram message sent")
         return True
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,318 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Callable, Optional
+from config import (CANDLE_STORE_DIR, HIGHER_INTERVAL, SCANNER_LOOKBACK, BACKFILL_PAGE_SIZE, SCHEDULER_GRACE_SECONDS,
+                    SCHEDULER_RETRY_SECONDS, SCHEDULER_MAX_RETRIES, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID,
+                    LIVE_HIGHER_INTERVALS, LIVE_QUEUE_SIZE, LIVE_ANALYSIS_WORKERS, LIVE_FETCH_WORKERS,
+                    LIVE_NOTIFY_WORKERS, LIVE_FETCH_LIMIT, LIVE_STATE_FILE, LIVE_SOURCE, BINANCE_WS_URL)
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.data.kline_stream import KlineStream
+from src.notifications.telegram import send_telegram, format_signal_message
+from src.strategy.signal_generator import StreamingMarketAnalyzer, sync_streaming_analyzer, generate_signal
+from src.utils.logger import setup_logger
+from src.utils.scheduler import candle_open_time, next_candle_boundary
+
+logger = setup_logger()
+
+
+def stream_key(symbol: str, interval: str) -> str:
+    return f"{symbol}_{interval}"
+
+
+def notify_signal(result: Dict):
+    """
+    Notifier default: kirim sinyal BUY/SELL ke Telegram (HOLD tidak dikirim)
+    """
+    if result['signal'] == "HOLD":
+        return
+    indicators = result['indicators']
+    message = format_signal_message(result['symbol'], result['interval'], result['signal'], result['confidence'],
+                                    result['price'], indicators, indicators.get('sr_position', 'AWAY_FROM_LEVELS'))
+    send_telegram(message, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+
+
+def load_live_state(state_file: str) -> Dict[str, Dict]:
+    try:
+        with open(state_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Error loading live state: {e}, starting with fresh state")
+        return {}
+
+
+def save_live_state(state: Dict[str, Dict], state_file: str):
+    """
+    Menulis state ke file sementara lalu rename agar file tidak pernah setengah tertulis
+    """
+    os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+    temporary = f"{state_file}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temporary, state_file)
+
+
+class LatestSlot:
+    """
+    Slot latest-wins satu stream di depan executor analisis: put() tidak pernah menunggu, dan nilai yang
+    belum diambil ditimpa nilai terbaru (analisis candle terbaru sudah mencakup candle sebelumnya)
+    """
+    def __init__(self):
+        self.value = None
+        self.pending = False
+        self.ready = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.replaced = 0  # Jumlah nilai yang ditimpa sebelum sempat dianalisis
+
+    def put(self, value):
+        if self.pending:
+            self.replaced += 1
+        self.value, self.pending = value, True
+        self.idle.clear()
+        self.ready.set()
+
+    async def get(self):
+        await self.ready.wait()
+        self.ready.clear()
+        value, self.value, self.pending = self.value, None, False
+        return value
+
+    def task_done(self):
+        if not self.pending:
+            self.idle.set()
+
+    async def join(self):
+        await self.idle.wait()
+
+
+class LiveEngine:
+    """
+    Engine live asyncio untuk banyak (symbol, interval) dalam satu proses.
+    Candle tertutup datang dari kline stream WebSocket (source="websocket"), atau dari task per stream yang
+    bangun di batas candle-nya lalu mengambil candle lewat REST (source="rest", thread pool I/O):
+        fetch -> slot per stream -> analyze (thread pool) -> notify (thread pool) -> persist (file state JSON)
+    Candle baru diserahkan ke LatestSlot stream-nya tanpa menunggu; setiap stream punya task analisis dan
+    StreamingMarketAnalyzer sendiri yang hanya diberi candle baru (O(1) per candle), sehingga backlog satu
+    stream tidak menunda stream lain. Snapshot analyzer disimpan di file state agar restart tanpa warm-up.
+    Tahap notify dan persist dihubungkan antrian terbatas (backpressure).
+    """
+    def __init__(self, streams: List[Tuple[str, str]], root: str = CANDLE_STORE_DIR, lookback: int = SCANNER_LOOKBACK,
+                 higher_intervals: Dict[str, str] = LIVE_HIGHER_INTERVALS, queue_size: int = LIVE_QUEUE_SIZE,
+                 analysis_workers: int = LIVE_ANALYSIS_WORKERS, fetch_workers: int = LIVE_FETCH_WORKERS,
+                 notify_workers: int = LIVE_NOTIFY_WORKERS, grace_seconds: float = SCHEDULER_GRACE_SECONDS,
+                 retry_seconds: float = SCHEDULER_RETRY_SECONDS, max_retries: int = SCHEDULER_MAX_RETRIES,
+                 notifier: Callable[[Dict], None] = notify_signal, state_file: str = LIVE_STATE_FILE,
+                 source: str = LIVE_SOURCE, ws_url: str = BINANCE_WS_URL, base_url: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        if source not in ("websocket", "rest"):
+            raise ValueError(f"Unsupported live source: {source}")
+        self.streams = list(dict.fromkeys(streams))
+        self.root = root
+        self.lookback = lookback
+        self.higher_intervals = higher_intervals
+        self.queue_size = queue_size
+        self.analysis_workers = max(1, analysis_workers)
+        self.fetch_workers = max(1, fetch_workers)
+        self.notify_workers = max(1, notify_workers)
+        self.grace_seconds = grace_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retries = max_retries
+        self.notifier = notifier
+        self.state_file = state_file
+        self.source = source
+        self.ws_url = ws_url
+        self.base_url = base_url
+        self.clock = clock
+        self.state: Dict[str, Dict] = {}
+        self.analyzed: Dict[str, int] = {}  # close_time terakhir yang sudah dianalisis per stream
+        self.analyzers: Dict[str, StreamingMarketAnalyzer] = {}
+        self.stores: Dict[str, CandleStore] = {}
+        self.slots: Dict[str, LatestSlot] = {}
+        self.kline_stream: Optional[KlineStream] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stopped: Optional[asyncio.Event] = None
+
+    def higher_interval_for(self, interval: str) -> str:
+        return self.higher_intervals.get(interval, HIGHER_INTERVAL)
+
+    def last_processed(self, symbol: str, interval: str) -> int:
+        return self.analyzed.get(stream_key(symbol, interval), -1)
+
+    def analyze_stream(self, symbol: str, interval: str) -> Dict:
+        """
+        Memajukan analyzer stream dengan candle baru di candle store lalu menilai candle terakhir
+        (dijalankan di thread pool; task analisis stream menjamin satu analisis per stream pada satu waktu)
+        """
+        key = stream_key(symbol, interval)
+        store = self.stores.setdefault(key, CandleStore(symbol, interval, self.root))
+        series = store.series()
+        if len(series) == 0:
+            raise ValueError(f"Candle store {symbol} {interval} kosong")
+        analyzer = self.analyzers.get(key) or StreamingMarketAnalyzer(self.higher_interval_for(interval), self.lookback)
+        analyzer = self.analyzers[key] = sync_streaming_analyzer(analyzer, series)
+        analysis = analyzer.analyze()
+        return {
+            'symbol': symbol,
+            'interval': interval,
+            'trend': analysis[0],
+            'confidence': analysis[1],
+            'signal': generate_signal(analysis)[0],
+            'price': float(series.close[-1]),
+            'close_time': int(series.close_time[-1]),
+            'indicators': analysis[2],
+            'analyzer': analyzer.snapshot(),
+        }
+
+    def _sync(self, store: CandleStore) -> Optional[int]:
+        # Candle baru saja (weight 1) kecuali store belum punya histori sepanjang lookback
+        limit = LIVE_FETCH_LIMIT if len(store) >= self.lookback else BACKFILL_PAGE_SIZE
+        sync_candle_store(store, limit=limit, base_url=self.base_url)
+        return store.last_close_time()
+
+    async def fetch_closed(self, store: CandleStore, close_time: int, io_executor) -> Optional[int]:
+        """
+        Sinkronisasi candle store sampai candle dengan close_time tersebut tertutup dan tersimpan
+        Returns: close_time terakhir di store (None jika candle tidak tersedia setelah semua percobaan)
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_seconds)
+            try:
+                last_close_time = await self.loop.run_in_executor(io_executor, self._sync, store)
+            except Exception as e:
+                logger.error(f"Live: fetch {store.symbol} {store.interval} gagal: {e}")
+                continue
+            if last_close_time is not None and last_close_time >= close_time:
+                return last_close_time
+        logger.warning(f"Live: candle {store.symbol} {store.interval} close_time {close_time} belum tersedia "
+                       f"setelah {self.max_retries + 1} percobaan")
+        return None
+
+    async def fetch_stream(self, symbol: str, interval: str, io_executor):
+        """
+        Task per stream: candle tertutup terakhir diproses saat start, lalu setiap batas interval + grace
+        """
+        store = CandleStore(symbol, interval, self.root)
+        while True:
+            close_time = candle_open_time(int((self.clock() - self.grace_seconds) * 1000), interval) - 1
+            last_close_time = await self.fetch_closed(store, close_time, io_executor)
+            if last_close_time is not None and last_close_time > self.last_processed(symbol, interval):
+                self.slots[stream_key(symbol, interval)].put(last_close_time)
+            boundary = next_candle_boundary(int((self.clock() - self.grace_seconds) * 1000), interval)
+            await asyncio.sleep(max(0.0, boundary / 1000 + self.grace_seconds - self.clock()))
+
+    async def analyze_worker(self, symbol: str, interval: str, notify_queue: asyncio.Queue, cpu_executor):
+        """
+        Task analisis satu stream: mengambil candle terbaru dari slot-nya lalu menganalisis di thread pool
+        """
+        slot = self.slots[stream_key(symbol, interval)]
+        while True:
+            await slot.get()
+            try:
+                result = await self.loop.run_in_executor(cpu_executor, self.analyze_stream, symbol, interval)
+                if result['close_time'] > self.last_processed(symbol, interval):
+                    self.analyzed[stream_key(symbol, interval)] = result['close_time']
+                    await notify_queue.put(result)
+            except Exception as e:
+                logger.error(f"Live: analisis {symbol} {interval} gagal: {e}")
+            finally:
+                slot.task_done()
+
+    async def notify_worker(self, notify_queue: asyncio.Queue, persist_queue: asyncio.Queue, io_executor):
+        while True:
+            result = await notify_queue.get()
+            try:
+                await self.loop.run_in_executor(io_executor, self.notifier, result)
+            except Exception as e:
+                logger.error(f"Live: notifikasi {result['symbol']} {result['interval']} gagal: {e}")
+            finally:
+                await persist_queue.put(result)
+                notify_queue.task_done()
+
+    async def persist_worker(self, persist_queue: asyncio.Queue, io_executor):
+        while True:
+            results = [await persist_queue.get()]
+            # Hasil yang menumpuk ditulis dalam satu kali simpan
+            while not persist_queue.empty():
+                results.append(persist_queue.get_nowait())
+            for result in results:
+                self.state[stream_key(result['symbol'], result['interval'])] = {
+                    'close_time': result['close_time'],
+                    'signal': result['signal'],
+                    'confidence': result['confidence'],
+                    'price': result['price'],
+                    'analyzer': result['analyzer'],
+                }
+            try:
+                await self.loop.run_in_executor(io_executor, save_live_state, dict(self.state), self.state_file)
+            except Exception as e:
+                logger.error(f"Live: gagal menyimpan state: {e}")
+            for _ in results:
+                persist_queue.task_done()
+
+    async def run(self):
+        """
+        Menjalankan semua stream sampai stop() dipanggil; hasil yang sudah dianalisis dituntaskan dulu
+        """
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        self.state = load_live_state(self.state_file)
+        # Candle yang sudah diproses sebelum restart tidak dianalisis/dikirim ulang
+        self.analyzed = {key: entry['close_time'] for key, entry in self.state.items()}
+        self.analyzers = {}
+        for key, entry in self.state.items():
+            try:
+                self.analyzers[key] = StreamingMarketAnalyzer.restore(entry['analyzer'])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Live: state analyzer {key} tidak bisa dipulihkan ({e}), warm-up dari candle store")
+        self.slots = {stream_key(symbol, interval): LatestSlot() for symbol, interval in self.streams}
+        notify_queue = asyncio.Queue(self.queue_size)
+        persist_queue = asyncio.Queue(self.queue_size)
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as io_executor, \
+                ThreadPoolExecutor(max_workers=self.notify_workers) as notify_executor, \
+                ThreadPoolExecutor(max_workers=self.analysis_workers) as cpu_executor:
+            workers = [asyncio.create_task(self.analyze_worker(symbol, interval, notify_queue, cpu_executor))
+                       for symbol, interval in self.streams]
+            workers += [asyncio.create_task(self.notify_worker(notify_queue, persist_queue, notify_executor))
+                        for _ in range(self.notify_workers)]
+            workers.append(asyncio.create_task(self.persist_worker(persist_queue, io_executor)))
+            if self.source == "websocket":
+                def on_candle(symbol: str, interval: str, candle: Dict):
+                    # Dipanggil di event loop: hanya menyerahkan candle ke slot, tidak pernah menunggu
+                    if candle['close_time'] > self.last_processed(symbol, interval):
+                        self.slots[stream_key(symbol, interval)].put(candle['close_time'])
+
+                self.kline_stream = KlineStream(self.streams, on_candle, root=self.root, ws_url=self.ws_url,
+                                                base_url=self.base_url)
+                fetchers = [asyncio.create_task(self.kline_stream.run())]
+            else:
+                fetchers = [asyncio.create_task(self.fetch_stream(symbol, interval, io_executor))
+                            for symbol, interval in self.streams]
+            logger.info(f"Live engine: {len(self.streams)} stream berjalan ({self.source})")
+            try:
+                await self.stopped.wait()
+            finally:
+                for task in fetchers:
+                    task.cancel()
+                await asyncio.gather(*fetchers, return_exceptions=True)
+                for slot in self.slots.values():
+                    await slot.join()
+                for queue in (notify_queue, persist_queue):
+                    await queue.join()
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("Live engine berhenti")
+
+    def stop(self):
+        """
+        Menghentikan engine; aman dipanggil dari thread lain (mis. notifier)
+        """
+        if self.loop is not None and self.stopped is not None:
+            self.loop.call_soon_threadsafe(self.stopped.set)
@@ -0,0 +1,127 @@
+import math
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Optional
+from config import (INTERVAL, HIGHER_INTERVAL, CANDLE_STORE_DIR, MATRIX_FETCH_MAX_WORKERS, SCANNER_LOOKBACK,
+                    SCANNER_MAX_WORKERS, SCANNER_CHUNKS_PER_WORKER)
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.data.resample import resample_candles
+from src.strategy.signal_generator import analyze_market, generate_signal
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def analyze_symbol(symbol: str, interval: str = INTERVAL, higher_interval: str = HIGHER_INTERVAL,
+                   lookback: int = SCANNER_LOOKBACK, root: str = CANDLE_STORE_DIR) -> Dict:
+    """
+    analyze_market untuk satu symbol langsung dari candle store lokal
+    Candle dibaca sebagai view memory map (tanpa salinan) dan higher timeframe di-resample lokal.
+    """
+    data = CandleStore(symbol, interval, root).tail(lookback, as_series=True)
+    if len(data) == 0:
+        raise ValueError(f"Candle store {symbol} {interval} kosong")
+    higher_timeframe_data = resample_candles(data, higher_interval)
+    analysis = analyze_market(data, higher_timeframe_data, symbol=symbol, interval=interval)
+    return {
+        'symbol': symbol,
+        'trend': analysis[0],
+        'confidence': analysis[1],
+        'signal': generate_signal(analysis)[0],
+        'price': float(data.close[-1]),
+        'close_time': int(data.close_time[-1]),
+        'indicators': analysis[2],
+    }
+
+
+def analyze_symbol_chunk(symbols: List[str], interval: str, higher_interval: str, lookback: int, root: str) -> List[Dict]:
+    """
+    Menganalisis sekelompok symbol dalam satu task worker. Hanya nama symbol yang dikirim ke worker;
+    worker membuka candle store masing-masing lewat memory map sehingga array candle tidak di-pickle.
+    Symbol yang gagal dikembalikan dengan key 'error'.
+    """
+    results = []
+    for symbol in symbols:
+        try:
+            results.append(analyze_symbol(symbol, interval, higher_interval, lookback, root))
+        except Exception as e:
+            results.append({'symbol': symbol, 'error': str(e)})
+    return results
+
+
+def chunk_symbols(symbols: List[str], chunk_size: int) -> List[List[str]]:
+    return [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+
+class MarketScanner:
+    """
+    Scanner banyak symbol: sinkronisasi candle store (I/O, thread pool) lalu analyze_market
+    di process pool yang dipakai ulang antar scan. Symbol dikirim dalam chunk agar overhead
+    per task kecil; hasil diurutkan dari confidence tertinggi.
+    """
+    def __init__(self, symbols: List[str], interval: str = INTERVAL, higher_interval: str = HIGHER_INTERVAL,
+                 lookback: int = SCANNER_LOOKBACK, max_workers: int = SCANNER_MAX_WORKERS,
+                 sync_workers: int = MATRIX_FETCH_MAX_WORKERS, root: str = CANDLE_STORE_DIR,
+                 base_url: Optional[str] = None):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.higher_interval = higher_interval
+        self.lookback = lookback
+        self.max_workers = max_workers
+        self.sync_workers = sync_workers
+        self.root = root
+        self.base_url = base_url
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.errors: Dict[str, str] = {}
+
+    def _sync_symbol(self, symbol: str) -> int:
+        return sync_candle_store(CandleStore(symbol, self.interval, self.root), base_url=self.base_url)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Mengunduh candle baru untuk semua symbol secara bersamaan
+        Returns: jumlah candle baru per symbol
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(self.sync_workers, len(self.symbols)))) as executor:
+            return dict(zip(self.symbols, executor.map(self._sync_symbol, self.symbols)))
+
+    def analyze(self) -> List[Dict]:
+        """
+        Menganalisis semua symbol dari candle store
+        Returns: hasil per symbol terurut dari confidence tertinggi; symbol yang gagal disimpan di self.errors
+        """
+        workers = min(self.max_workers, len(self.symbols))
+        args = (self.interval, self.higher_interval, self.lookback, self.root)
+        if workers <= 1:
+            results = analyze_symbol_chunk(self.symbols, *args)
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+            chunk_size = max(1, math.ceil(len(self.symbols) / (workers * SCANNER_CHUNKS_PER_WORKER)))
+            futures = [self.executor.submit(analyze_symbol_chunk, chunk, *args)
+                       for chunk in chunk_symbols(self.symbols, chunk_size)]
+            results = [result for future in futures for result in future.result()]
+
+        self.errors = {result['symbol']: result['error'] for result in results if 'error' in result}
+        for symbol, error in self.errors.items():
+            logger.warning(f"Scanner: analisis {symbol} gagal: {error}")
+        ranked = [result for result in results if 'error' not in result]
+        ranked.sort(key=lambda result: result['confidence'], reverse=True)
+        return ranked
+
+    def scan(self) -> List[Dict]:
+        """
+        Sinkronisasi candle lalu analisis semua symbol
+        """
+        self.sync()
+        return self.analyze()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> 'MarketScanner':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
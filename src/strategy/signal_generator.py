@@ -1,92 +1,24 @@
-from typing import List, Dict, Tuple, Optional
-from src.indicators.ngtcv import calculate_ngtCV
-from src.indicators.technical import calculate_rsi, calculate_ema, calculate_ema_multiple, calculate_macd, calculate_adx
-from src.indicators.atr import calculate_atr
-from src.indicators.support_resistance import is_near_support_resistance
+from collections import deque
+from typing import Callable, List, Dict, Tuple, Optional
+import numpy as np
+from src.indicators.pipeline import IndicatorPipeline
+from src.indicators.cache import IndicatorCache, get_indicator_cache, get_pipeline, window_identity
+from src.data.intrabar import SubBarResolver
+from src.data.candle_series import CandleSeries, candle_column
+from src.data.timeframe_alignment import TimeframeAlignment, closed_higher_window
+from src.indicators.full_history import compute_indicator_history, ema_history
+from src.indicators.streaming import StreamingEMA, StreamingIndicatorSet
+from src.indicators.support_resistance import PivotDetector
+from src.data.resample import CandleResampler
 from config import THRESHOLD_MULTIPLIER, RSI_OVERBOUGHT, RSI_OVERSOLD, EMA_SHORT_PERIOD, EMA_LONG_PERIOD, EMA_TREND_PERIOD, RISK_MANAGEMENT
 
-def analyze_market(data: List[Dict], higher_timeframe_data: List[Dict] = None) -> Tuple[str, float, Dict]:
+def _score_market(trend_filter: str, rsi: float, is_bullish_engulfing: bool, is_bearish_engulfing: bool,
+                  current_price: float, ema_50: Optional[float], ema_cross_trend: str, macd_trend: str,
+                  avg_ngtcv: float, sr_position: str) -> Tuple[str, float]:
     """
-    Menganalisis pasar menggunakan multi-indicator approach dengan filter tren jangka panjang
-    Returns: trend, confidence, indicators_dict
+    Menggabungkan nilai indikator menjadi skor, lalu trend dan confidence
+    Returns: trend, confidence
     """
-    if len(data) < max(30, EMA_TREND_PERIOD):  # Ensure we have enough data for EMA 20
-        return "NEUTRAL", 0.0, {}
-
-    # Extract prices
-    closes = [c['close'] for c in data]
-    highs = [c['high'] for c in data]
-    lows = [c['low'] for c in data]
-
-    # 1. Calculate ADX to filter choppy markets
-    adx = calculate_adx(highs, lows, closes)
-    if adx < 20:  # Market is choppy/sideways, don't trade
-        return "NEUTRAL", 0.0, {
-            'rsi': calculate_rsi(closes),
-            'adx': adx,
-            'comment': 'Market too choppy, ADX < 20'
-        }
-
-    # 2. Calculate True Multi-timeframe Trend Filter (EMA 50 on higher timeframe)
-    # If higher_timeframe_data is provided, use it for trend filter
-    if higher_timeframe_data and len(higher_timeframe_data) >= 50:
-        higher_closes = [c['close'] for c in higher_timeframe_data]
-        ema_trend_long = calculate_ema(higher_closes, 50)  # EMA 50 on higher timeframe
-        current_price = closes[-1]
-        trend_filter = "BULLISH" if current_price > ema_trend_long else "BEARISH"
-    else:
-        # Fallback to current timeframe if no higher timeframe data available
-        ema_trend_long = calculate_ema(closes, EMA_TREND_PERIOD)
-        current_price = closes[-1]
-        trend_filter = "BULLISH" if current_price > ema_trend_long else "BEARISH"
-
-    # 3. Calculate Position relative to Support/Resistance levels
-    sr_position = is_near_support_resistance(current_price, data)
-
-    # 4. Calculate RSI
-    rsi = calculate_rsi(closes)
-
-    # 5. Calculate EMAs (short and long term)
-    ema_short = calculate_ema(closes, EMA_SHORT_PERIOD)
-    ema_long = calculate_ema(closes, EMA_LONG_PERIOD)
-    ema_cross_trend = "BULLISH" if ema_short > ema_long else "BEARISH"
-
-    # 6. Calculate MACD for additional momentum confirmation
-    macd_line, signal_line, macd_histogram = calculate_macd(closes)
-    macd_trend = "BULLISH" if macd_line > signal_line else "BEARISH"
-
-    # 7. Calculate ngtCV (Average of last 3 candles)
-    recent_candles = data[-3:]
-    ngtcv_sum = 0
-    for candle in recent_candles:
-        val, _, _, _ = calculate_ngtCV(candle)
-        ngtcv_sum += val
-    avg_ngtcv = ngtcv_sum / 3
-
-    # 8. Calculate ATR for dynamic risk management
-    atr_value = calculate_atr(data)
-
-    # 9. Check for bullish/bearish engulfing pattern
-    is_bullish_engulfing = False
-    is_bearish_engulfing = False
-    if len(data) >= 2:
-        current_candle = data[-1]
-        prev_candle = data[-2]
-
-        # Bullish engulfing: current close > current open AND current body engulfs previous body
-        current_body = abs(current_candle['close'] - current_candle['open'])
-        prev_body = abs(prev_candle['close'] - prev_candle['open'])
-
-        if current_candle['close'] > current_candle['open']:  # Current candle is bullish
-            if (current_candle['close'] > prev_candle['open'] and 
-                current_candle['open'] < prev_candle['close']):
-                is_bullish_engulfing = True
-
-        if current_candle['close'] < current_candle['open']:  # Current candle is bearish
-            if (current_candle['open'] > prev_candle['close'] and 
-                current_candle['close'] < prev_candle['open']):
-                is_bearish_engulfing = True
-
     # Combine Signals with Trend Filter Applied
     score = 0
 
@@ -110,8 +42,7 @@ def analyze_market(data: List[Dict], higher_timeframe_data: List[Dict] = None) -
 
     # Additional Multi-timeframe analysis (suggested in revisi.md)
     # Check for momentum confirmation using additional indicators
-    if len(closes) >= 50:  # Ensure we have enough data
-        ema_50 = calculate_ema(closes, 50)
+    if ema_50 is not None:  # Ensure we have enough data
         if current_price > ema_50 and trend_filter == "BULLISH":
             score += 0.5  # Additional confirmation for bullish trend
         elif current_price < ema_50 and trend_filter == "BEARISH":
@@ -165,6 +96,106 @@ def analyze_market(data: List[Dict], higher_timeframe_data: List[Dict] = None) -
     elif score <= -1.5 and confidence >= RISK_MANAGEMENT['min_confidence']:
         trend = "BEARISH"
 
+    return trend, confidence
+
+def _analysis_params() -> Tuple:
+    """
+    Parameter konfigurasi yang memengaruhi hasil analyze_market (bagian dari key cache)
+    """
+    return (EMA_SHORT_PERIOD, EMA_LONG_PERIOD, EMA_TREND_PERIOD, RSI_OVERBOUGHT, RSI_OVERSOLD,
+            RISK_MANAGEMENT['min_confidence'])
+
+def analyze_market(data: List[Dict], higher_timeframe_data: List[Dict] = None, symbol: Optional[str] = None,
+                   interval: Optional[str] = None, cache: Optional[IndicatorCache] = None,
+                   pivots: Optional[PivotDetector] = None) -> Tuple[str, float, Dict]:
+    """
+    Menganalisis pasar menggunakan multi-indicator approach dengan filter tren jangka panjang
+    Jika symbol dan interval diberikan, hasilnya di-cache per (symbol, interval, window candle,
+    window higher timeframe, parameter) sehingga analisis ulang atas window yang sama hanya lookup.
+    `pivots`: PivotDetector yang mengikuti window ini (support/resistance tanpa memindai ulang window)
+    Returns: trend, confidence, indicators_dict
+    """
+    identity = window_identity(data)
+    if symbol is None or interval is None or identity is None:
+        return _analyze_market(data, higher_timeframe_data, IndicatorPipeline(data, pivots=pivots))
+
+    cache = cache if cache is not None else get_indicator_cache()
+    key = ('analyze_market', symbol, interval) + identity + (window_identity(higher_timeframe_data), _analysis_params())
+    trend, confidence, indicators = cache.get_or_compute(
+        key, lambda: _analyze_market(data, higher_timeframe_data, get_pipeline(data, symbol, interval, cache, pivots))
+    )
+    # Salinan dict agar pemanggil yang mengubah indicators tidak merusak entry cache
+    return trend, confidence, dict(indicators)
+
+def _analyze_market(data: List[Dict], higher_timeframe_data: Optional[List[Dict]], pipeline: IndicatorPipeline) -> Tuple[str, float, Dict]:
+    if len(data) < max(30, EMA_TREND_PERIOD):  # Ensure we have enough data for EMA 20
+        return "NEUTRAL", 0.0, {}
+
+    def higher_ema_50() -> Optional[float]:
+        # Hanya candle higher timeframe yang sudah tertutup pada candle terakhir yang dipakai (tanpa lookahead)
+        window = higher_timeframe_data
+        if window:
+            window = closed_higher_window(window, int(candle_column(data, 'close_time')[-1]))
+        if window and len(window) >= 50:
+            return IndicatorPipeline(window).ema(50)  # EMA 50 on higher timeframe
+        return None
+
+    # Semua indikator dibaca dari satu pipeline: kolom, True Range dan seri EMA per span
+    # dihitung sekali lalu dipakai bersama oleh EMA, MACD, ATR dan ADX
+    return _analyze_indicators(pipeline, float(pipeline.closes[-1]), len(pipeline), higher_ema_50)
+
+def _analyze_indicators(source, current_price: float, count: int,
+                        higher_ema_50: Callable[[], Optional[float]]) -> Tuple[str, float, Dict]:
+    """
+    Inti analyze_market atas sumber indikator apa pun yang punya antarmuka IndicatorPipeline
+    (adx, rsi, ema, macd, atr, ngtcv_average, engulfing, sr_position), mis. StreamingMarketAnalyzer
+    """
+    # 1. Calculate ADX to filter choppy markets
+    adx = source.adx()
+    if adx < 20:  # Market is choppy/sideways, don't trade
+        return "NEUTRAL", 0.0, {
+            'rsi': source.rsi(),
+            'adx': adx,
+            'comment': 'Market too choppy, ADX < 20'
+        }
+
+    # 2. Calculate True Multi-timeframe Trend Filter (EMA 50 on higher timeframe)
+    ema_trend_long = higher_ema_50()
+    if ema_trend_long is None:
+        # Fallback to current timeframe if no higher timeframe data available
+        ema_trend_long = source.ema(EMA_TREND_PERIOD)
+    trend_filter = "BULLISH" if current_price > ema_trend_long else "BEARISH"
+
+    # 3. Calculate Position relative to Support/Resistance levels
+    sr_position = source.sr_position()
+
+    # 4. Calculate RSI
+    rsi = source.rsi()
+
+    # 5. Calculate EMAs (short and long term)
+    ema_short = source.ema(EMA_SHORT_PERIOD)
+    ema_long = source.ema(EMA_LONG_PERIOD)
+    ema_cross_trend = "BULLISH" if ema_short > ema_long else "BEARISH"
+
+    # 6. Calculate MACD for additional momentum confirmation
+    macd_line, signal_line, macd_histogram = source.macd()
+    macd_trend = "BULLISH" if macd_line > signal_line else "BEARISH"
+
+    # 7. Calculate ngtCV (Average of last 3 candles)
+    avg_ngtcv = source.ngtcv_average(3)
+
+    # 8. Calculate ATR for dynamic risk management
+    atr_value = source.atr()
+
+    # 9. Check for bullish/bearish engulfing pattern
+    is_bullish_engulfing, is_bearish_engulfing = source.engulfing()
+
+    ema_50 = source.ema(50) if count >= 50 else None
+    trend, confidence = _score_market(
+        trend_filter, rsi, is_bullish_engulfing, is_bearish_engulfing, current_price,
+        ema_50, ema_cross_trend, macd_trend, avg_ngtcv, sr_position
+    )
+
     indicators = {
         'rsi': rsi,
         'ema_short': ema_short,
@@ -185,6 +216,271 @@ def analyze_market(data: List[Dict], higher_timeframe_data: List[Dict] = None) -
 
     return trend, confidence, indicators
 
+class StreamingMarketAnalyzer:
+    """
+    analyze_market inkremental untuk satu (symbol, interval): update(candle) memajukan indikator streaming,
+    detektor pivot dan EMA 50 higher timeframe (di-resample dari candle yang sama) dalam O(1) per candle
+    tertutup, lalu analyze() hanya menilai skor tanpa membaca ulang window candle.
+    snapshot() bisa disimpan ke state JSON; restore() melanjutkan tanpa warm-up.
+    `window`: panjang window analyze_market yang ditiru. Level support/resistance, RSI, ATR, ngtCV dan
+    engulfing sama dengan analyze_market(`window` candle terakhir); EMA, MACD, ADX dan EMA 50 higher
+    timeframe berlanjut sepanjang stream (sama dengan analyze_market atas seluruh candle yang diproses),
+    jadi hanya analisis pertama setelah warm-up yang identik penuh dengan analyze_market(window).
+    """
+    def __init__(self, higher_interval: str, window: int):
+        ema_periods = tuple(dict.fromkeys((EMA_SHORT_PERIOD, EMA_LONG_PERIOD, 50, EMA_TREND_PERIOD)))
+        self.indicators = StreamingIndicatorSet(ema_periods=ema_periods)
+        self.pivots = PivotDetector(window=window)
+        self.higher = CandleResampler(higher_interval, max_candles=1)
+        self.higher_ema = StreamingEMA(50)
+        self.count = 0
+        self.candles = deque(maxlen=2)  # (open, close) dua candle terakhir untuk pola engulfing
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return self.indicators.last_open_time
+
+    def update(self, candle: Dict) -> bool:
+        """
+        Memproses satu candle tertutup. Returns False jika candle sudah pernah diproses.
+        """
+        if not self.indicators.update(candle):
+            return False
+        self.pivots.update(candle)
+        completed = self.higher.update(candle)
+        if completed is not None:
+            self.higher_ema.update(completed)
+        self.count += 1
+        self.candles.append((float(candle['open']), float(candle['close'])))
+        return True
+
+    def analyze(self) -> Tuple[str, float, Dict]:
+        """
+        Hasil analyze_market untuk candle terakhir yang sudah diproses
+        """
+        if self.count < max(30, EMA_TREND_PERIOD):
+            return "NEUTRAL", 0.0, {}
+        higher_ema_50 = lambda: self.higher_ema.value if self.higher_ema.count >= 50 else None
+        return _analyze_indicators(self, self.candles[-1][1], self.count, higher_ema_50)
+
+    # Antarmuka sumber indikator yang dibaca _analyze_indicators
+    def adx(self) -> float:
+        return self.indicators.adx.value
+
+    def rsi(self) -> float:
+        return self.indicators.rsi.value
+
+    def ema(self, period: int) -> float:
+        return self.indicators.emas[period].value
+
+    def macd(self) -> Tuple[float, float, float]:
+        return self.indicators.macd.value
+
+    def atr(self) -> float:
+        return self.indicators.atr.value
+
+    def ngtcv_average(self, count: int = 3) -> float:
+        # Rata-rata bergulir hanya menyimpan `average_count` nilai, jadi count lain tidak bisa dijawab
+        ngtcv = self.indicators.ngtcv
+        if count != ngtcv.recent_values.maxlen:
+            raise ValueError(f"StreamingNgtCV menghitung rata-rata {ngtcv.recent_values.maxlen} candle, bukan {count}")
+        return ngtcv.value
+
+    def engulfing(self) -> Tuple[bool, bool]:
+        if len(self.candles) < 2:
+            return False, False
+        (prev_o, prev_c), (o, c) = self.candles
+        return c > o and c > prev_o and o < prev_c, c < o and o > prev_c and c < prev_o
+
+    def sr_position(self, tolerance: float = 0.003) -> str:
+        return self.pivots.position(self.candles[-1][1], tolerance)
+
+    def snapshot(self) -> Dict:
+        return {
+            'indicators': self.indicators.snapshot(),
+            'pivots': self.pivots.snapshot(),
+            'higher': self.higher.snapshot(),
+            'higher_ema': self.higher_ema.snapshot(),
+            'count': self.count,
+            'candles': [list(candle) for candle in self.candles]
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> 'StreamingMarketAnalyzer':
+        analyzer = cls.__new__(cls)
+        analyzer.indicators = StreamingIndicatorSet.restore(state['indicators'])
+        analyzer.pivots = PivotDetector.restore(state['pivots'])
+        analyzer.higher = CandleResampler.restore(state['higher'])
+        analyzer.higher_ema = StreamingEMA.restore(state['higher_ema'])
+        analyzer.count = state['count']
+        analyzer.candles = deque((tuple(candle) for candle in state['candles']), maxlen=2)
+        return analyzer
+
+def sync_streaming_analyzer(analyzer: StreamingMarketAnalyzer, series: CandleSeries) -> StreamingMarketAnalyzer:
+    """
+    Memberikan candle `series` (mis. candle store) yang belum dilihat ke analyzer, sehingga setiap siklus
+    hanya candle baru yang diproses. Analyzer yang masih kosong, atau yang candle terakhirnya tidak ada
+    di series, diganti analyzer baru yang di-warm-up dari `window` candle terakhir; setelah itu EMA, MACD
+    dan ADX berlanjut dari warm-up tersebut (lihat StreamingMarketAnalyzer).
+    Returns: analyzer yang sudah mengikuti candle terakhir series
+    """
+    last_open_time = analyzer.last_open_time
+    start = int(np.searchsorted(series.open_time, last_open_time, side='right')) if last_open_time is not None else 0
+    if last_open_time is None or start == 0 or int(series.open_time[start - 1]) != last_open_time:
+        analyzer = StreamingMarketAnalyzer(analyzer.higher.interval, analyzer.pivots.window)
+        start = max(0, len(series) - analyzer.pivots.window)
+    for candle in series[start:]:
+        analyzer.update(candle)
+    return analyzer
+
+def analyze_market_history(data: List[Dict], higher_timeframe_data: List[Dict] = None,
+                           ema_periods: Tuple[int, ...] = ()) -> Dict[str, np.ndarray]:
+    """
+    Menghitung semua indikator analyze_market sekali untuk seluruh histori (mode batch backtest)
+    EMA 50 higher timeframe dihitung sekali lalu dipetakan ke setiap candle berdasarkan close_time:
+    setiap bar hanya melihat candle higher timeframe yang sudah tertutup.
+    `ema_periods` menambah seri EMA lain (misalnya untuk parameter sweep) sebagai history['ema_{p}'].
+    """
+    periods = (EMA_SHORT_PERIOD, EMA_LONG_PERIOD, 50, EMA_TREND_PERIOD) + tuple(ema_periods)
+    history = compute_indicator_history(data, ema_periods=tuple(dict.fromkeys(periods)))
+
+    higher_ema_50 = np.full(len(data), np.nan)
+    if higher_timeframe_data:
+        alignment = TimeframeAlignment(data, higher_timeframe_data)
+        higher_ema = ema_history(candle_column(higher_timeframe_data, 'close'), 50)
+        higher_ema_50 = alignment.align(higher_ema, min_closed=50)
+    history['higher_ema_50'] = higher_ema_50
+    return history
+
+def analyze_market_at(history: Dict[str, np.ndarray], i: int) -> Tuple[str, float, Dict]:
+    """
+    Hasil analyze_market untuk candle ke-i yang dibaca dari analyze_market_history
+    Setara dengan analyze_market(data[:i+1], higher_timeframe_data).
+    """
+    if i + 1 < max(30, EMA_TREND_PERIOD):
+        return "NEUTRAL", 0.0, {}
+
+    rsi = float(history['rsi'][i])
+    adx = float(history['adx'][i])
+    if adx < 20:
+        return "NEUTRAL", 0.0, {
+            'rsi': rsi,
+            'adx': adx,
+            'comment': 'Market too choppy, ADX < 20'
+        }
+
+    current_price = float(history['close'][i])
+    ema_trend_long = float(history['higher_ema_50'][i])
+    if np.isnan(ema_trend_long):
+        ema_trend_long = float(history[f'ema_{EMA_TREND_PERIOD}'][i])
+    trend_filter = "BULLISH" if current_price > ema_trend_long else "BEARISH"
+
+    ema_short = float(history[f'ema_{EMA_SHORT_PERIOD}'][i])
+    ema_long = float(history[f'ema_{EMA_LONG_PERIOD}'][i])
+    ema_cross_trend = "BULLISH" if ema_short > ema_long else "BEARISH"
+
+    macd_line = float(history['macd_line'][i])
+    signal_line = float(history['signal_line'][i])
+    macd_trend = "BULLISH" if macd_line > signal_line else "BEARISH"
+
+    sr_position = str(history['sr_position'][i])
+    avg_ngtcv = float(history['ngtcv'][i])
+    is_bullish_engulfing = bool(history['is_bullish_engulfing'][i])
+    is_bearish_engulfing = bool(history['is_bearish_engulfing'][i])
+
+    trend, confidence = _score_market(
+        trend_filter, rsi, is_bullish_engulfing, is_bearish_engulfing, current_price,
+        float(history['ema_50'][i]), ema_cross_trend, macd_trend, avg_ngtcv, sr_position
+    )
+
+    indicators = {
+        'rsi': rsi,
+        'ema_short': ema_short,
+        'ema_long': ema_long,
+        'ema_trend': ema_cross_trend,
+        'ema_trend_long': ema_trend_long,
+        'trend_filter': trend_filter,
+        'sr_position': sr_position,
+        'ngtcv': avg_ngtcv,
+        'atr': float(history['atr'][i]),
+        'macd_line': macd_line,
+        'signal_line': signal_line,
+        'macd_histogram': float(history['macd_histogram'][i]),
+        'adx': adx,
+        'is_bullish_engulfing': is_bullish_engulfing,
+        'is_bearish_engulfing': is_bearish_engulfing
+    }
+
+    return trend, confidence, indicators
+
+def score_market_history(history: Dict[str, np.ndarray], rsi_overbought: float = None, rsi_oversold: float = None,
+                         min_confidence: float = None, ema_short_period: int = None, ema_long_period: int = None,
+                         ema_trend_period: int = None, first_index: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Versi batch dari scoring analyze_market: semua bar dinilai sekaligus dari array analyze_market_history
+    Bobot dan urutan penjumlahan sama dengan _score_market sehingga hasilnya identik per bar.
+    Parameter yang None memakai nilai config; periode EMA lain harus ada di history (lihat ema_periods).
+    Jika history adalah potongan histori penuh, first_index adalah index candle pertamanya (untuk warmup).
+    Returns: dict array sejajar index candle dengan key score, confidence, trend (BULLISH/BEARISH/NEUTRAL)
+             dan signal (BUY/SELL/HOLD)
+    """
+    rsi_overbought = RSI_OVERBOUGHT if rsi_overbought is None else rsi_overbought
+    rsi_oversold = RSI_OVERSOLD if rsi_oversold is None else rsi_oversold
+    min_confidence = RISK_MANAGEMENT['min_confidence'] if min_confidence is None else min_confidence
+    ema_short_period = ema_short_period or EMA_SHORT_PERIOD
+    ema_long_period = ema_long_period or EMA_LONG_PERIOD
+    ema_trend_period = ema_trend_period or EMA_TREND_PERIOD
+
+    close = history['close']
+    n = len(close)
+    rsi = history['rsi']
+
+    # Trend filter: EMA 50 higher timeframe, fallback ke EMA trend timeframe sendiri
+    ema_trend_long = np.where(np.isnan(history['higher_ema_50']), history[f'ema_{ema_trend_period}'], history['higher_ema_50'])
+    bullish = close > ema_trend_long
+    bearish = ~bullish
+    ema_cross_bullish = history[f'ema_{ema_short_period}'] > history[f'ema_{ema_long_period}']
+    macd_bullish = history['macd_line'] > history['signal_line']
+    oversold = rsi < rsi_oversold
+    overbought = rsi > rsi_overbought
+    ngtcv = history['ngtcv']
+    sr_position = history['sr_position']
+    ema_50 = history['ema_50']
+
+    # RSI + engulfing, hanya searah trend filter
+    score = np.select(
+        [bullish & oversold & history['is_bullish_engulfing'], bullish & oversold, bullish & overbought,
+         bearish & overbought & history['is_bearish_engulfing'], bearish & overbought, bearish & oversold],
+        [3.0, 2.0, -0.5, -3.0, -2.0, 0.5],
+        default=0.0
+    )
+    # Konfirmasi harga terhadap EMA 50
+    score += np.select([bullish & (close > ema_50), bearish & (close < ema_50)], [0.5, -0.5], default=0.0)
+    # EMA cross dan MACD (hanya jika searah trend filter)
+    score += np.select([bullish & ema_cross_bullish, bearish & ~ema_cross_bullish], [1.0, -1.0], default=0.0)
+    score += np.select([bullish & macd_bullish, bearish & ~macd_bullish], [0.8, -0.8], default=0.0)
+    # ngtCV
+    score += np.select([bullish & (ngtcv > 0.1), bullish & (ngtcv < -0.1), bearish & (ngtcv < -0.1), bearish & (ngtcv > 0.1)],
+                       [0.5, -0.5, -0.5, 0.5], default=0.0)
+    # Support/Resistance
+    score += np.select([(sr_position == "NEAR_SUPPORT") & bullish, (sr_position == "NEAR_RESISTANCE") & bearish,
+                        sr_position == "AWAY_FROM_LEVELS"], [1.0, -1.0, -0.5], default=0.0)
+
+    max_possible_score = 7.8
+    confidence = np.abs(score) / max_possible_score
+    trend = np.select([(score >= 1.5) & (confidence >= min_confidence), (score <= -1.5) & (confidence >= min_confidence)],
+                      ["BULLISH", "BEARISH"], default="NEUTRAL")
+
+    # Bar tanpa cukup data atau pasar choppy (ADX < 20) selalu NEUTRAL dengan confidence 0
+    inactive = (np.arange(first_index, first_index + n) + 1 < max(30, ema_trend_period)) | (history['adx'] < 20)
+    score[inactive] = 0.0
+    confidence[inactive] = 0.0
+    trend[inactive] = "NEUTRAL"
+
+    # Sama dengan generate_signal: BULLISH -> BUY, BEARISH -> SELL, selain itu HOLD
+    signal = np.select([trend == "BULLISH", trend == "BEARISH"], ["BUY", "SELL"], default="HOLD")
+    return {'score': score, 'confidence': confidence, 'trend': trend, 'signal': signal}
+
 def generate_signal(market_analysis: Tuple[str, float, Dict]) -> Tuple[str, float]:
     """
     Generate BUY/SELL signal
@@ -211,9 +507,12 @@ def calculate_atr_based_targets(entry_price: float, atr_value: float) -> Tuple[f
 
     return stop_loss, take_profit
 
-def evaluate_prediction(previous_candle: Dict, current_candle: Dict, prediction: Optional[Tuple[str, float]], atr_value: float = None) -> Tuple[bool, float]:
+def evaluate_prediction(previous_candle: Dict, current_candle: Dict, prediction: Optional[Tuple[str, float]], atr_value: float = None,
+                        sub_bars: Optional[SubBarResolver] = None) -> Tuple[bool, float]:
     """
     Evaluasi prediksi dengan threshold persentase dan manajemen risiko berbasis ATR
+    Jika sub_bars diberikan (bersama ATR), SL/TP dievaluasi dari high/low sub-bar candle saat ini
+    sesuai urutan waktunya, bukan hanya dari harga close.
     """
     if not prediction or prediction[0] == "HOLD":
         return None, 0.0
@@ -222,6 +521,16 @@ def evaluate_prediction(previous_candle: Dict, current_candle: Dict, prediction:
     previous_close = previous_candle['close']
     current_close = current_candle['close']
 
+    # Mode resolusi tinggi: level yang tersentuh lebih dulu di dalam candle dibaca dari sub-bar
+    if sub_bars is not None and atr_value is not None:
+        side = 1 if pred_signal == "BUY" else -1
+        stop_loss = previous_close - side * RISK_MANAGEMENT['atr_multiplier_sl'] * atr_value
+        take_profit = previous_close + side * RISK_MANAGEMENT['atr_multiplier_tp'] * atr_value
+        touched = sub_bars.first_touch(side, current_candle['open_time'], current_candle['close_time'], stop_loss, take_profit)
+        if touched is not None:
+            level = stop_loss if touched == "SL" else take_profit
+            return touched == "TP", abs((level - previous_close) / previous_close * 100)
+
     # Jika ATR tersedia, gunakan manajemen risiko berbasis ATR
     if atr_value is not None:
         stop_loss, take_profit = calculate_atr_based_targets(previous_close, atr_value)
@@ -279,12 +588,13 @@ def dynamic_breakeven(entry_price: float, current_price: float, initial_stop_los
     else:
         return initial_stop_loss, "BREAKEVEN_NOT_ACTIVATED"
 
-def enhanced_market_analysis(data: List[Dict], higher_timeframe_data: List[Dict] = None) -> Tuple[str, float, Dict]:
+def enhanced_market_analysis(data: List[Dict], higher_timeframe_data: List[Dict] = None, symbol: Optional[str] = None,
+                             interval: Optional[str] = None) -> Tuple[str, float, Dict]:
     """
     Fungsi utama yang menggabungkan semua perubahan dari revisi.md
     """
-    # Panggil fungsi analyze_market yang telah diperbarui
-    trend, confidence, indicators = analyze_market(data, higher_timeframe_data)
+    # Panggil fungsi analyze_market yang telah diperbarui (memakai cache jika symbol/interval diberikan)
+    trend, confidence, indicators = analyze_market(data, higher_timeframe_data, symbol, interval)
 
     # Jika pasar terlalu choppy (ADX < 20), kembalikan NEUTRAL
     if 'adx' in indicators and indicators['adx'] < 20:
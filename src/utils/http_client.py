@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+from config import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_TIMEOUTS, HTTP_DEFAULT_TIMEOUT
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Status yang layak dicoba ulang (gangguan sementara di sisi server)
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Method yang aman diulang setelah request mungkin sudah diterima server
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+class HttpClient:
+    """
+    HTTP client bersama dengan session keep-alive (connection pool), retry dengan
+    exponential backoff + jitter, dan timeout per host
+    """
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE, backoff_max: float = HTTP_BACKOFF_MAX,
+                 timeouts: Optional[Dict[str, float]] = None, default_timeout: float = HTTP_DEFAULT_TIMEOUT):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeouts = dict(HTTP_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def timeout_for(self, url: str) -> float:
+        return self.timeouts.get(urlparse(url).hostname, self.default_timeout)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff dengan full jitter: acak di antara 0 dan base * 2^attempt (dibatasi backoff_max)
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, url: str, retry_statuses: Iterable[int] = RETRY_STATUSES,
+                retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Mengirim request dengan retry untuk error koneksi/timeout dan status di `retry_statuses`
+        Status 4xx lain langsung dikembalikan sebagai HTTPError tanpa retry.
+        retry=None: retry penuh hanya untuk method idempotent (GET, ...). Tanpa retry penuh, hanya
+        ConnectTimeout (request belum pernah sampai ke server) yang dicoba ulang, agar mis. POST
+        sendMessage Telegram tidak terkirim dua kali setelah read timeout.
+        Raises requests.exceptions.RequestException jika semua percobaan gagal.
+        """
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries):
+            is_last = attempt == self.max_retries - 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if retry and response.status_code in retry_statuses and not is_last:
+                    logger.warning(f"HTTP {response.status_code} dari {urlparse(url).hostname} (Attempt {attempt+1}/{self.max_retries}), retry...")
+                else:
+                    response.raise_for_status()
+                    return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if is_last or not (retry or isinstance(e, requests.exceptions.ConnectTimeout)):
+                    raise
+                logger.warning(f"Koneksi ke {urlparse(url).hostname} gagal (Attempt {attempt+1}/{self.max_retries}): {e}")
+            time.sleep(self.backoff_delay(attempt))
+        raise requests.exceptions.RetryError(f"Gagal setelah {self.max_retries} percobaan: {url}")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    HttpClient bersama untuk seluruh proses (Binance, Telegram, dan fetcher lainnya)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -2,10 +2,12 @@ import logging
 import os
 from datetime import datetime
 
-def setup_logger(name: str = "trading_bot", log_file: str = "trading_bot.log", level=logging.INFO):
+def setup_logger(name: str = "trading_bot", log_file: str = None, level=logging.INFO):
     """
     Setup logger configuration
+    Lokasi file log: argumen log_file, env TRADING_BOT_LOG_FILE, atau trading_bot.log
     """
+    log_file = log_file or os.getenv("TRADING_BOT_LOG_FILE", "trading_bot.log")
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
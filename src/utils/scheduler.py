@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional
+from config import SCHEDULER_GRACE_SECONDS, SCHEDULER_RETRY_SECONDS, SCHEDULER_MAX_RETRIES
+from src.data.binance_api import interval_to_milliseconds
+from src.data.resample import bucket_open_time
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def _month_open_time(timestamp_ms: int, months: int, step: int = 0) -> int:
+    """
+    open_time candle bulanan (kelipatan `months` sejak Januari 1970, UTC) yang memuat timestamp_ms,
+    digeser `step` candle
+    """
+    moment = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    index = ((moment.year - 1970) * 12 + moment.month - 1) // months * months + step * months
+    return int(datetime(1970 + index // 12, index % 12 + 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def candle_open_time(timestamp_ms: int, interval: str) -> int:
+    """
+    open_time candle `interval` Binance yang sedang berjalan pada timestamp_ms (termasuk "1M")
+    """
+    if interval.endswith('M') and interval[:-1].isdigit():
+        return _month_open_time(timestamp_ms, int(interval[:-1]))
+    return int(bucket_open_time(timestamp_ms, interval))
+
+
+def next_candle_boundary(timestamp_ms: int, interval: str) -> int:
+    """
+    Batas interval berikutnya setelah timestamp_ms: saat candle yang sedang berjalan tertutup
+    (= open_time candle berikutnya; close_time candle itu = batas - 1)
+    """
+    if interval.endswith('M') and interval[:-1].isdigit():
+        return _month_open_time(timestamp_ms, int(interval[:-1]), step=1)
+    return candle_open_time(timestamp_ms, interval) + interval_to_milliseconds(interval)
+
+
+class CandleJob:
+    """
+    Job terjadwal: callback(close_time) dipanggil setelah setiap candle `interval` tertutup.
+    Callback mengembalikan True jika candle dengan close_time tersebut sudah diproses, atau False
+    jika candle belum tersedia (dicoba lagi setelah jeda retry).
+    """
+    def __init__(self, key: Hashable, interval: str, callback: Callable[[int], bool]):
+        self.key = key
+        self.interval = interval
+        self.callback = callback
+        self.close_time: Optional[int] = None  # close_time candle yang sedang diusahakan
+        self.attempts = 0
+
+
+class CandleScheduler:
+    """
+    Timer bersama untuk banyak job (symbol, interval) yang bangun tepat di batas interval + jeda grace.
+    Semua job jatuh tempo pada batas yang sama dijalankan dalam satu kali bangun (paralel jika
+    max_workers > 1), dan jadwal berikutnya dihitung dari jam, bukan dari lama eksekusi, sehingga
+    tidak bergeser. Job yang candle-nya belum tertutup di server dicoba lagi setiap retry_seconds
+    sampai max_retries, lalu menunggu batas berikutnya.
+    """
+    def __init__(self, grace_seconds: float = SCHEDULER_GRACE_SECONDS, retry_seconds: float = SCHEDULER_RETRY_SECONDS,
+                 max_retries: int = SCHEDULER_MAX_RETRIES, max_workers: int = 1,
+                 clock: Callable[[], float] = time.time):
+        self.grace_seconds = grace_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retries = max_retries
+        self.max_workers = max_workers
+        self.clock = clock
+        self.jobs: Dict[Hashable, CandleJob] = {}
+        self.timers = []  # heap (waktu jatuh tempo, urutan, key)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+
+    def _push(self, due: float, key: Hashable):
+        heapq.heappush(self.timers, (due, next(self.counter), key))
+
+    def _next_boundary_due(self, interval: str, now: float) -> float:
+        # Candle yang baru tertutup < grace detik lalu masih menunggu jeda grace-nya
+        boundary = next_candle_boundary(int((now - self.grace_seconds) * 1000), interval)
+        return boundary / 1000 + self.grace_seconds
+
+    def add_job(self, key: Hashable, interval: str, callback: Callable[[int], bool], run_now: bool = False):
+        """
+        Mendaftarkan job; run_now=True langsung memproses candle terakhir yang sudah tertutup
+        """
+        candle_open_time(0, interval)  # ValueError untuk interval yang tidak dikenal
+        now = self.clock()
+        with self.lock:
+            self.jobs[key] = CandleJob(key, interval, callback)
+            self._push(now if run_now else self._next_boundary_due(interval, now), key)
+        self.wakeup.set()
+
+    def remove_job(self, key: Hashable):
+        with self.lock:
+            self.jobs.pop(key, None)  # Timer yang tersisa diabaikan saat jatuh tempo
+
+    def next_due(self) -> Optional[float]:
+        with self.lock:
+            while self.timers and self.timers[0][2] not in self.jobs:
+                heapq.heappop(self.timers)
+            return self.timers[0][0] if self.timers else None
+
+    def _run_job(self, job: CandleJob, now: float) -> bool:
+        # Candle yang dituju: candle terakhir yang tertutup paling lambat `grace` detik lalu
+        close_time = candle_open_time(int((now - self.grace_seconds) * 1000), job.interval) - 1
+        if job.close_time != close_time:
+            job.close_time, job.attempts = close_time, 0
+        job.attempts += 1
+        try:
+            return bool(job.callback(close_time))
+        except Exception as e:
+            logger.error(f"Scheduler: job {job.key} gagal: {e}", exc_info=True)
+            return False
+
+    def run_pending(self) -> int:
+        """
+        Menjalankan semua job yang sudah jatuh tempo lalu menjadwalkan ulang
+        Returns: jumlah job yang dijalankan
+        """
+        now = self.clock()
+        pending: Dict[Hashable, CandleJob] = {}
+        with self.lock:
+            while self.timers and self.timers[0][0] <= now:
+                _, _, key = heapq.heappop(self.timers)
+                if key in self.jobs:
+                    pending[key] = self.jobs[key]
+        due_jobs: List[CandleJob] = list(pending.values())
+        if not due_jobs:
+            return 0
+
+        if self.max_workers > 1 and len(due_jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due_jobs))) as executor:
+                done = list(executor.map(lambda job: self._run_job(job, now), due_jobs))
+        else:
+            done = [self._run_job(job, now) for job in due_jobs]
+
+        finished = self.clock()
+        with self.lock:
+            for job, processed in zip(due_jobs, done):
+                if self.jobs.get(job.key) is not job:
+                    continue  # Job dihapus atau didaftarkan ulang selama berjalan
+                due = self._next_boundary_due(job.interval, finished)
+                if not processed:
+                    if job.attempts <= self.max_retries:
+                        due = min(due, finished + self.retry_seconds)
+                    else:
+                        logger.warning(f"Scheduler: candle {job.key} close_time {job.close_time} belum tersedia "
+                                       f"setelah {job.attempts} percobaan, menunggu candle berikutnya")
+                self._push(due, job.key)
+        return len(due_jobs)
+
+    def run(self):
+        """
+        Loop utama (blocking) sampai stop() dipanggil
+        """
+        self.running = True
+        self.wakeup.clear()
+        while self.running:
+            due = self.next_due()
+            wait = None if due is None else due - self.clock()
+            if wait is None or wait > 0:
+                self.wakeup.wait(timeout=wait)
+                self.wakeup.clear()
+                continue
+            self.run_pending()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
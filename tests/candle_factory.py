@@ -0,0 +1,35 @@
+import numpy as np
+from typing import List, Dict
+
+def make_candles(n: int, seed: int = 7, start_price: float = 30000.0, interval_ms: int = 15 * 60 * 1000,
+                 start_time: int = 1_700_000_000_000) -> List[Dict]:
+    """
+    Membuat candle sintetis (random walk dengan fase tren) dalam format fetch_ohlcv_data
+    """
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.002, n // 50 + 1), 50)[:n]
+    returns = drift + rng.normal(0, 0.004, n)
+    closes = start_price * np.exp(np.cumsum(returns))
+    opens = np.concatenate([[start_price], closes[:-1]])
+    highs = np.maximum(opens, closes) * (1 + rng.uniform(0, 0.003, n))
+    lows = np.minimum(opens, closes) * (1 - rng.uniform(0, 0.003, n))
+    volumes = rng.uniform(500, 3000, n)
+    trades = rng.integers(100, 5000, n)
+
+    candles = []
+    for i in range(n):
+        open_time = start_time + i * interval_ms
+        candles.append({
+            'open_time': open_time,
+            'open': float(opens[i]),
+            'high': float(highs[i]),
+            'low': float(lows[i]),
+            'close': float(closes[i]),
+            'volume': float(volumes[i]),
+            'close_time': open_time + interval_ms - 1,
+            'quote_asset_volume': float(volumes[i] * closes[i]),
+            'number_of_trades': int(trades[i]),
+            'taker_buy_base_asset_volume': float(volumes[i] / 2),
+            'taker_buy_quote_asset_volume': float(volumes[i] * closes[i] / 2)
+        })
+    return candles
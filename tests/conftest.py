@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Log selama test ditulis ke direktori sementara, bukan ke working tree
+os.environ.setdefault("TRADING_BOT_LOG_FILE", os.path.join(tempfile.mkdtemp(prefix="trading_bot_test_"), "trading_bot.log"))
@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+INTERVAL_MS = {'1m': 60_000, '15m': 900_000, '1h': 3_600_000, '4h': 14_400_000}
+
+
+def make_kline(open_time: int, interval_ms: int) -> list:
+    """
+    Kline deterministik dalam format mentah Binance (angka desimal sebagai string)
+    """
+    step = open_time // interval_ms
+    close = 100 + (step % 97) * 0.5
+    return [
+        open_time, f"{close - 0.2:.8f}", f"{close + 1:.8f}", f"{close - 1:.8f}", f"{close:.8f}",
+        f"{10 + step % 7:.8f}", open_time + interval_ms - 1, f"{(10 + step % 7) * close:.8f}",
+        int(step % 100), "5.00000000", f"{5 * close:.8f}", "0"
+    ]
+
+
+class FakeKlineServer:
+    """
+    Server kline lokal yang meniru GET /api/v3/klines Binance untuk test offline
+    `first_open_time`/`last_open_time` membatasi histori yang tersedia per interval.
+    `queued_responses` berisi (status, headers) yang dikembalikan sebelum response normal.
+    `delay` mensimulasikan latency jaringan per request.
+    """
+    def __init__(self, first_open_time: int, last_open_time: int, used_weight: int = 1, delay: float = 0.0):
+        self.first_open_time = first_open_time
+        self.delay = delay
+        self.last_open_time = last_open_time
+        self.used_weight = used_weight
+        self.requests = []
+        self.queued_responses = []
+        self.tickers = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def klines(self, interval: str, start_time=None, end_time=None, limit: int = 500) -> list:
+        interval_ms = INTERVAL_MS[interval]
+        first = self.first_open_time - self.first_open_time % interval_ms
+        last = self.last_open_time - self.last_open_time % interval_ms
+        limit = min(limit, 1000)
+        if end_time is not None:
+            last = min(last, end_time - end_time % interval_ms)
+        if start_time is not None:
+            first = max(first, start_time + (-start_time) % interval_ms)
+            times = range(first, min(last, first + (limit - 1) * interval_ms) + 1, interval_ms)
+        else:
+            times = range(max(first, last - (limit - 1) * interval_ms), last + 1, interval_ms)
+        return [make_kline(t, interval_ms) for t in times]
+
+    def _handle(self, handler):
+        parsed = urlparse(handler.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        with self.lock:
+            self.requests.append(dict(params, path=parsed.path, client_port=handler.client_address[1]))
+            queued = self.queued_responses.pop(0) if self.queued_responses else None
+        if self.delay:
+            time.sleep(self.delay)
+
+        if queued:
+            status, headers = queued
+            body = json.dumps({'code': -1, 'msg': 'queued error'}).encode()
+        elif handler.command == 'POST':
+            status, headers = 200, {}
+            body = json.dumps({'ok': True}).encode()
+        elif parsed.path == '/api/v3/ticker/24hr':
+            status, headers = 200, {}
+            body = json.dumps(self.tickers).encode()
+        else:
+            status, headers = 200, {}
+            body = json.dumps(self.klines(
+                params['interval'],
+                int(params['startTime']) if 'startTime' in params else None,
+                int(params['endTime']) if 'endTime' in params else None,
+                int(params.get('limit', 500))
+            )).encode()
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.send_header('X-MBX-USED-WEIGHT-1M', str(self.used_weight))
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(body)
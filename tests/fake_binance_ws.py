@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+from websockets.asyncio.server import serve
+
+
+def stream_event(stream: str, kline: list, interval: str, closed: bool) -> str:
+    """
+    Event kline combined stream Binance dari kline mentah format REST
+    """
+    symbol = stream.split('@')[0].upper()
+    return json.dumps({'stream': stream, 'data': {
+        'e': 'kline', 'E': int(time.time() * 1000), 's': symbol,
+        'k': {
+            't': kline[0], 'T': kline[6], 's': symbol, 'i': interval, 'o': kline[1], 'c': kline[4],
+            'h': kline[2], 'l': kline[3], 'v': kline[5], 'n': kline[8], 'x': closed, 'q': kline[7],
+            'V': kline[9], 'Q': kline[10], 'B': kline[11]
+        }
+    }})
+
+
+class FakeKlineStreamServer:
+    """
+    Server WebSocket lokal yang meniru combined kline stream Binance (/stream?streams=...) untuk test offline.
+    `klines` berisi kline rekaman (format REST) per interval; setiap kline di-replay ke semua stream yang
+    diminta sebagai update candle berjalan lalu event candle tertutup, berjeda `pace` detik.
+    Posisi replay dibagi antar koneksi sehingga reconnect melanjutkan dari event berikutnya.
+    `close_after`: koneksi pertama diputus setelah sejumlah event tertutup (menguji reconnect).
+    `skip`: (stream, open_time) yang event tertutupnya tidak pernah dikirim (menguji pengisian celah).
+    `on_closed(open_time)`: dipanggil sebelum event tertutup dikirim (mis. memajukan FakeKlineServer).
+    `sent_at[(stream, open_time)]`: waktu event tertutup dikirim.
+    """
+    def __init__(self, klines: dict, pace: float = 0.0, close_after: int = None, skip=(), on_closed=None):
+        self.klines = klines
+        self.pace = pace
+        self.close_after = close_after
+        self.skip = set(skip)
+        self.on_closed = on_closed
+        self.position = 0
+        self.connections = 0
+        self.sent_at = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    def __enter__(self):
+        async def start():
+            return await serve(self._handle, '127.0.0.1', 0)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(start(), self.loop).result(5)
+        return self
+
+    def __exit__(self, *exc):
+        async def stop():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+    def events(self, streams: list) -> list:
+        # Urutan replay: per open_time, semua stream yang diminta
+        events = []
+        for stream in streams:
+            interval = stream.split('@kline_')[1]
+            for kline in self.klines.get(interval, []):
+                events.append((kline[0], stream, interval, kline))
+        events.sort(key=lambda event: event[0])
+        return events
+
+    async def _handle(self, websocket):
+        streams = parse_qs(urlparse(websocket.request.path).query)['streams'][0].split('/')
+        self.connections += 1
+        closed_sent = 0
+        events = self.events(streams)
+        while self.position < len(events):
+            open_time, stream, interval, kline = events[self.position]
+            if self.close_after is not None and self.connections == 1 and closed_sent >= self.close_after:
+                await websocket.close()
+                return
+            await websocket.send(stream_event(stream, kline, interval, closed=False))
+            if self.on_closed is not None:
+                self.on_closed(open_time)
+            if (stream, open_time) not in self.skip:
+                self.sent_at[(stream, open_time)] = time.monotonic()
+                await websocket.send(stream_event(stream, kline, interval, closed=True))
+                closed_sent += 1
+            self.position += 1
+            if self.pace:
+                await asyncio.sleep(self.pace)
+        await websocket.wait_closed()
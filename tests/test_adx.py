@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.indicators.technical import calculate_adx, calculate_adx_series, _decay_scan
+from src.indicators.streaming import StreamingADX
+
+class TestVectorizedADX(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(700, seed=5)
+        self.highs = [c['high'] for c in self.data]
+        self.lows = [c['low'] for c in self.data]
+        self.closes = [c['close'] for c in self.data]
+
+    def test_decay_scan_matches_loop(self):
+        values = np.random.default_rng(2).uniform(0, 10, 1000)
+        expected = []
+        current = 42.0
+        for value in values:
+            current = 0.9 * current + value
+            expected.append(current)
+        np.testing.assert_allclose(_decay_scan(values, 0.9, 42.0), expected, rtol=1e-12)
+
+    def test_series_matches_loop_implementation(self):
+        """Dibandingkan dengan StreamingADX yang memakai loop Wilder smoothing klasik"""
+        adx, plus_di, minus_di = calculate_adx_series(self.highs, self.lows, self.closes)
+        reference = StreamingADX()
+        for i, candle in enumerate(self.data):
+            reference.update(candle)
+            self.assertAlmostEqual(adx[i], reference.value, places=8)
+            if i >= 14:
+                self.assertAlmostEqual(plus_di[i], reference.plus_di, places=8)
+                self.assertAlmostEqual(minus_di[i], reference.minus_di, places=8)
+        self.assertTrue(np.isnan(plus_di[:14]).all())
+
+    def test_latest_value_and_series_mode(self):
+        latest = calculate_adx(self.highs, self.lows, self.closes)
+        adx, plus_di, minus_di = calculate_adx(self.highs, self.lows, self.closes, return_series=True)
+        self.assertIsInstance(latest, float)
+        self.assertEqual(latest, adx[-1])
+        self.assertEqual(len(plus_di), len(self.data))
+        self.assertEqual(calculate_adx(self.highs[:20], self.lows[:20], self.closes[:20]), 25.0)
+
+if __name__ == '__main__':
+    unittest.main()
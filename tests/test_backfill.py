@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from fake_binance import FakeKlineServer
+from src.data.backfill import BackfillError, plan_backfill_pages, backfill_ohlcv, _fetch_page
+from src.data.binance_api import fetch_klines
+from src.data.candle_store import CandleStore
+
+FIFTEEN_MINUTES = 15 * 60 * 1000
+PAGE_MS = 1000 * FIFTEEN_MINUTES
+START = 1_600_000_000_000 - 1_600_000_000_000 % PAGE_MS
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CandleStore("BTCUSDT", "15m", root=self.tmp.name)
+        self.end = START + 2500 * FIFTEEN_MINUTES - 1
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_plan_pages_cover_range_without_overlap(self):
+        pages = plan_backfill_pages(START + 5, self.end, "15m", page_size=1000)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0][0], START)
+        self.assertEqual(pages[-1][1], self.end)
+        for (_, prev_end), (next_start, _) in zip(pages, pages[1:]):
+            self.assertEqual(prev_end + 1, next_start)
+        # Halaman sejajar grid tetap: rentang yang digeser menghasilkan start halaman yang sama
+        shifted = plan_backfill_pages(START + 7 * FIFTEEN_MINUTES, self.end + 3 * FIFTEEN_MINUTES, "15m", page_size=1000)
+        self.assertEqual([page[0] for page in shifted], [page[0] for page in pages])
+        self.assertTrue(all(page[0] % PAGE_MS == 0 for page in shifted))
+
+    def test_backfill_fetches_pages_concurrently_and_stitches_in_order(self):
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            added = backfill_ohlcv(self.store, START, self.end, max_workers=3, base_url=server.url)
+
+        self.assertEqual(added, 2500)
+        self.assertEqual(len(server.requests), 3)
+        open_time = np.asarray(self.store.load()['open_time'])
+        self.assertEqual(open_time[0], START)
+        self.assertTrue(np.all(np.diff(open_time) == FIFTEEN_MINUTES))
+
+    def test_interrupted_backfill_resumes_from_persisted_pages(self):
+        pages = plan_backfill_pages(START, self.end, "15m")
+        pages_dir = os.path.join(self.store.path, 'backfill')
+        os.makedirs(pages_dir)
+
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            # Halaman pertama selesai sebelum proses "terputus"
+            _fetch_page(self.store, pages[0], 1000, pages_dir, server.url)
+            backfill_ohlcv(self.store, START, self.end, base_url=server.url)
+
+        fetched_starts = sorted(int(r['startTime']) for r in server.requests)
+        self.assertEqual(fetched_starts, [page[0] for page in pages])
+        self.assertEqual(len(self.store), 2500)
+        self.assertFalse(os.path.exists(pages_dir))
+
+    def test_backfill_merges_before_existing_history(self):
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            backfill_ohlcv(self.store, START + 2000 * FIFTEEN_MINUTES, self.end, base_url=server.url)
+            added = backfill_ohlcv(self.store, START, START + 2100 * FIFTEEN_MINUTES - 1, base_url=server.url)
+
+        self.assertEqual(added, 2000)
+        self.assertEqual(len(self.store), 2500)
+
+    def test_malformed_page_is_reported_and_other_pages_kept(self):
+        pages = plan_backfill_pages(START, self.end, "15m")
+
+        def fetch(symbol, interval, limit, start_time=None, **kwargs):
+            if start_time == pages[1][0]:
+                raise ValueError("could not convert string to float: 'x'")
+            return fetch_klines(symbol, interval, limit, start_time=start_time, **kwargs)
+
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            with mock.patch('src.data.backfill.fetch_klines', side_effect=fetch):
+                with self.assertRaises(BackfillError) as raised:
+                    backfill_ohlcv(self.store, START, self.end, base_url=server.url)
+            self.assertEqual(raised.exception.pages, [pages[1]])
+            self.assertEqual(len(self.store), 0)
+            pages_dir = os.path.join(self.store.path, 'backfill')
+            self.assertEqual(len(os.listdir(pages_dir)), 2)
+            # Jalankan ulang: hanya halaman yang gagal diambil lagi
+            self.assertEqual(backfill_ohlcv(self.store, START, self.end, base_url=server.url), 2500)
+
+    def test_resume_with_shifted_end_time_reuses_saved_pages(self):
+        pages = plan_backfill_pages(START, self.end, "15m")
+
+        def fetch(symbol, interval, limit, start_time=None, **kwargs):
+            if start_time == pages[2][0]:
+                raise ValueError("response rusak")
+            return fetch_klines(symbol, interval, limit, start_time=start_time, **kwargs)
+
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            with mock.patch('src.data.backfill.fetch_klines', side_effect=fetch):
+                with self.assertRaises(BackfillError):
+                    backfill_ohlcv(self.store, START, self.end, base_url=server.url)
+            first_run = len(server.requests)
+            # Jalankan ulang dengan end_time yang bergeser (mis. dihitung dari time.time())
+            shifted_end = self.end + 40 * FIFTEEN_MINUTES
+            added = backfill_ohlcv(self.store, START + 3 * FIFTEEN_MINUTES, shifted_end, base_url=server.url)
+
+        resumed = sorted(int(r['startTime']) for r in server.requests[first_run:])
+        self.assertEqual(resumed, [pages[2][0]])
+        self.assertEqual(added, 2540)
+        self.assertFalse(os.path.exists(os.path.join(self.store.path, 'backfill')))
+
+    def test_pages_already_in_store_are_skipped(self):
+        with FakeKlineServer(START, START + 10_000 * FIFTEEN_MINUTES) as server:
+            backfill_ohlcv(self.store, START, self.end, base_url=server.url)
+            first_run = len(server.requests)
+            added = backfill_ohlcv(self.store, START, self.end + 500 * FIFTEEN_MINUTES, base_url=server.url)
+
+        self.assertEqual(sorted(int(r['startTime']) for r in server.requests[first_run:]), [START + 2 * PAGE_MS])
+        self.assertEqual(added, 500)
+
+if __name__ == '__main__':
+    unittest.main()
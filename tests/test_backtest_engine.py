@@ -0,0 +1,142 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.backtest.engine import run_signal_backtest, find_first_exit, signal_directions
+
+def candle(i: int, high: float, low: float, close: float) -> dict:
+    return {'open_time': i * 1000, 'open': close, 'high': high, 'low': low, 'close': close,
+            'volume': 1.0, 'close_time': i * 1000 + 999}
+
+class TestBacktestEngine(unittest.TestCase):
+
+    def setUp(self):
+        # Entry di close 100, ATR 1 -> BUY: SL 98, TP 103; SELL: SL 102, TP 97
+        self.flat = [candle(i, 100.5, 99.5, 100.0) for i in range(10)]
+
+    def run_single(self, data, signal="BUY", **kwargs):
+        signals = ["HOLD"] * len(data)
+        signals[0] = signal
+        kwargs.setdefault('fee_rate', 0.0)
+        kwargs.setdefault('slippage', 0.0)
+        return run_signal_backtest(data, signals, np.ones(len(data)), sl_multiplier=2, tp_multiplier=3,
+                                   initial_equity=1000.0, **kwargs)
+
+    def test_take_profit_and_stop_loss(self):
+        data = list(self.flat)
+        data[4] = candle(4, 103.5, 99.5, 103.0)
+        trade = self.run_single(data)['trades'][0]
+        self.assertEqual((trade['exit_index'], trade['exit_reason'], trade['exit_price']), (4, "TP", 103.0))
+        self.assertAlmostEqual(trade['pnl'], 30.0)
+
+        data = list(self.flat)
+        data[3] = candle(3, 100.5, 97.0, 98.0)
+        trade = self.run_single(data)['trades'][0]
+        self.assertEqual((trade['exit_index'], trade['exit_reason'], trade['result']), (3, "SL", "LOSS"))
+        self.assertAlmostEqual(trade['pnl'], -20.0)
+
+        # SELL: TP di bawah, SL di atas
+        data = list(self.flat)
+        data[2] = candle(2, 100.5, 96.5, 97.0)
+        trade = self.run_single(data, "SELL")['trades'][0]
+        self.assertEqual((trade['exit_reason'], trade['sl'], trade['tp']), ("TP", 102.0, 97.0))
+        self.assertAlmostEqual(trade['pnl'], 30.0)
+
+    def test_ambiguous_bar_counts_as_stop_loss(self):
+        data = list(self.flat)
+        data[5] = candle(5, 104.0, 97.0, 100.0)
+        result = self.run_single(data)
+        trade = result['trades'][0]
+        self.assertEqual(trade['exit_reason'], "SL")
+        self.assertTrue(trade['ambiguous'])
+        self.assertEqual(result['stats']['ambiguous_exits'], 1)
+
+    def test_open_position_closed_at_end(self):
+        trade = self.run_single(self.flat)['trades'][0]
+        self.assertEqual((trade['exit_index'], trade['exit_reason']), (9, "END"))
+        self.assertAlmostEqual(trade['pnl'], 0.0)
+
+        # Exit END juga terkena slippage, seperti exit stop loss
+        trade = self.run_single(self.flat, "SELL", slippage=0.01)['trades'][0]
+        self.assertAlmostEqual(trade['exit_price'], 100.0 * 1.01)
+
+    def test_signal_on_last_bar_is_ignored(self):
+        signals = ["HOLD"] * 9 + ["BUY"]
+        result = run_signal_backtest(self.flat, signals, np.ones(10), sl_multiplier=2, tp_multiplier=3)
+        self.assertEqual(result['trades'], [])
+
+    def test_fees_and_slippage(self):
+        data = list(self.flat)
+        data[3] = candle(3, 100.5, 97.0, 98.0)
+        trade = self.run_single(data, fee_rate=0.001, slippage=0.01)['trades'][0]
+        entry = 100.0 * 1.01
+        exit_ = 98.0 * 0.99
+        quantity = 1000.0 / entry
+        fees = 0.001 * quantity * (entry + exit_)
+        self.assertAlmostEqual(trade['entry_price'], entry)
+        self.assertAlmostEqual(trade['exit_price'], exit_)
+        self.assertAlmostEqual(trade['fees'], fees)
+        self.assertAlmostEqual(trade['pnl'], quantity * (exit_ - entry) - fees)
+
+    def test_max_positions(self):
+        data = list(self.flat)
+        data[6] = candle(6, 103.5, 99.5, 103.0)
+        signals = ["BUY"] * 4 + ["HOLD"] * 6
+        atr = np.ones(len(data))
+        single = run_signal_backtest(data, signals, atr, sl_multiplier=2, tp_multiplier=3, max_positions=1)
+        multi = run_signal_backtest(data, signals, atr, sl_multiplier=2, tp_multiplier=3, max_positions=3)
+        self.assertEqual([t['entry_index'] for t in single['trades']], [0])
+        self.assertEqual([t['entry_index'] for t in multi['trades']], [0, 1, 2])
+
+    def test_equity_curve(self):
+        data = make_candles(800, seed=4)
+        rng = np.random.default_rng(1)
+        signals = rng.choice(["BUY", "SELL", "HOLD"], size=len(data), p=[0.02, 0.02, 0.96])
+        atr = np.full(len(data), 60.0)
+        result = run_signal_backtest(data, signals, atr, max_positions=3, initial_equity=1000.0)
+        self.assertGreater(len(result['trades']), 5)
+        equity = result['equity']
+        self.assertEqual(len(equity), len(data))
+        self.assertAlmostEqual(equity[-1], 1000.0 + sum(t['pnl'] for t in result['trades']), places=6)
+        self.assertAlmostEqual(result['stats']['net_pnl'], equity[-1] - 1000.0, places=6)
+
+    def test_matches_per_bar_loop(self):
+        """Hasil engine sama dengan simulasi naif bar per bar"""
+        data = make_candles(1500, seed=9)
+        highs = np.array([c['high'] for c in data])
+        lows = np.array([c['low'] for c in data])
+        closes = np.array([c['close'] for c in data])
+        rng = np.random.default_rng(3)
+        signals = rng.choice(["BUY", "SELL", "HOLD"], size=len(data), p=[0.03, 0.03, 0.94])
+        atr = np.full(len(data), 50.0)
+        trades = run_signal_backtest(data, signals, atr, fee_rate=0.0, slippage=0.0)['trades']
+
+        expected = []
+        active = None
+        for i in range(len(data)):
+            if active:
+                side = 1 if active['type'] == "BUY" else -1
+                sl_hit = lows[i] <= active['sl'] if side > 0 else highs[i] >= active['sl']
+                tp_hit = highs[i] >= active['tp'] if side > 0 else lows[i] <= active['tp']
+                if sl_hit or tp_hit:
+                    expected.append((active['entry_index'], i, "SL" if sl_hit else "TP"))
+                    active = None
+                continue
+            direction = signal_directions([signals[i]])[0]
+            if direction and i < len(data) - 1:
+                active = {'type': signals[i], 'entry_index': i,
+                          'sl': closes[i] - direction * 2 * 50.0, 'tp': closes[i] + direction * 3 * 50.0}
+        if active:
+            expected.append((active['entry_index'], len(data) - 1, "END"))
+
+        self.assertGreater(len(expected), 10)
+        self.assertEqual([(t['entry_index'], t['exit_index'], t['exit_reason']) for t in trades], expected)
+
+    def test_find_first_exit_grows_chunk(self):
+        highs = np.full(2000, 1.0)
+        lows = np.full(2000, 1.0)
+        highs[1700] = 5.0
+        self.assertEqual(find_first_exit(highs, lows, 0, 1, 0.5, 4.0, chunk=8), (1700, False, True))
+        self.assertEqual(find_first_exit(highs, lows, 1701, 1, 0.5, 4.0, chunk=8), (-1, False, False))
+
+if __name__ == '__main__':
+    unittest.main()
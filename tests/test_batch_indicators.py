@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.indicators.atr import calculate_atr
+from src.indicators.batch import (symbol_matrix, right_align, batch_ema, batch_rsi, batch_macd, batch_atr, batch_adx,
+                                  batch_ema_series)
+from src.indicators.technical import calculate_rsi, calculate_ema, calculate_macd, calculate_adx, ema_series
+
+FIFTEEN_MINUTES = 15 * 60 * 1000
+
+class TestBatchIndicators(unittest.TestCase):
+
+    def setUp(self):
+        # Histori berbeda panjang: kosong, sangat pendek, di bawah periode ADX/MACD, penuh, dan dengan celah
+        lengths = [0, 1, 10, 20, 27, 30, 40, 300, 300, 120]
+        self.data = {}
+        for i, length in enumerate(lengths):
+            candles = make_candles(300, seed=i + 1)
+            self.data[f"S{i}USDT"] = CandleSeries.from_candles(candles[300 - length:])
+        gapped = make_candles(300, seed=42)
+        self.data["GAPUSDT"] = CandleSeries.from_candles(gapped[:100] + gapped[110:])
+        self.symbols, self.open_times, matrices = symbol_matrix(self.data)
+        self.highs, self.lows, self.closes = matrices['high'], matrices['low'], matrices['close']
+
+    def rows(self):
+        for row, symbol in enumerate(self.symbols):
+            yield row, self.data[symbol]
+
+    def test_symbol_matrix_alignment(self):
+        self.assertEqual(self.closes.shape, (len(self.data), 300))
+        row = self.symbols.index("S6USDT")
+        self.assertTrue(np.isnan(self.closes[row, :-40]).all())
+        np.testing.assert_array_equal(self.closes[row, -40:], self.data["S6USDT"].close)
+        gap = self.symbols.index("GAPUSDT")
+        self.assertTrue(np.isnan(self.closes[gap, 100:110]).all())
+        _, _, tail = symbol_matrix(self.data, lookback=50)
+        self.assertEqual(tail['close'].shape, (len(self.data), 50))
+
+        (aligned,), lengths = right_align(self.closes)
+        self.assertEqual(lengths[gap], 290)
+        np.testing.assert_array_equal(aligned[gap, -290:], self.data["GAPUSDT"].close)
+
+    def test_ema_series_matches_scalar(self):
+        (aligned,), lengths = right_align(self.closes)
+        series = batch_ema_series(aligned, 26)
+        for row, data in self.rows():
+            if len(data):
+                np.testing.assert_allclose(series[row, -len(data):], ema_series(data.close, 26), rtol=1e-10)
+
+    def test_last_values_match_scalar(self):
+        ema = {period: batch_ema(self.closes, period) for period in (12, 26, 200)}
+        rsi = batch_rsi(self.closes)
+        macd_line, signal_line, histogram = batch_macd(self.closes)
+        atr = batch_atr(self.highs, self.lows, self.closes)
+        adx = batch_adx(self.highs, self.lows, self.closes)
+        for row, data in self.rows():
+            closes = data.close
+            for period, values in ema.items():
+                self.assertAlmostEqual(values[row], calculate_ema(closes, period), delta=1e-8 * max(1.0, values[row]))
+            self.assertAlmostEqual(rsi[row], calculate_rsi(closes), places=8)
+            expected = calculate_macd(closes)
+            self.assertAlmostEqual(macd_line[row], expected[0], places=6)
+            self.assertAlmostEqual(signal_line[row], expected[1], places=6)
+            self.assertAlmostEqual(histogram[row], expected[2], places=6)
+            self.assertAlmostEqual(atr[row], calculate_atr(data), places=8)
+            self.assertAlmostEqual(adx[row], calculate_adx(data.high, data.low, closes), places=8)
+
+    def test_empty_matrix(self):
+        empty = np.zeros((3, 0))
+        np.testing.assert_array_equal(batch_rsi(empty), [50.0] * 3)
+        np.testing.assert_array_equal(batch_ema(empty, 12), [0.0] * 3)
+        np.testing.assert_array_equal(batch_adx(empty, empty, empty), [25.0] * 3)
+        np.testing.assert_array_equal(batch_atr(empty, empty, empty), [0.0] * 3)
+        self.assertEqual(batch_macd(empty)[0].tolist(), [0.0] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.strategy.signal_generator import analyze_market, analyze_market_history, score_market_history, generate_signal
+
+class TestBatchScoring(unittest.TestCase):
+
+    def test_matches_scalar_analyze_market(self):
+        signals = set()
+        for seed in (2, 5, 10):
+            data = CandleSeries.from_candles(make_candles(600, seed=seed))
+            higher = CandleSeries.from_candles(make_candles(160, seed=seed + 50, interval_ms=60 * 60 * 1000))
+            for higher_timeframe_data in (None, higher):
+                scored = score_market_history(analyze_market_history(data, higher_timeframe_data))
+                self.assertEqual(len(scored['signal']), len(data))
+                self.assertTrue((scored['score'][:199] == 0).all())
+                for i in range(150, len(data)):
+                    analysis = analyze_market(data[:i + 1], higher_timeframe_data)
+                    self.assertEqual(scored['trend'][i], analysis[0])
+                    self.assertAlmostEqual(scored['confidence'][i], analysis[1], places=12)
+                    self.assertEqual(scored['signal'][i], generate_signal(analysis)[0])
+                signals.update(scored['signal'].tolist())
+
+        # Data uji harus memuat BUY dan SELL agar parity di atas bermakna
+        self.assertEqual(signals, {'BUY', 'SELL', 'HOLD'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from fake_binance import FakeKlineServer
+from src.data.binance_api import fetch_ohlcv_data
+from src.data.candle_series import CandleSeries
+from src.strategy.signal_generator import analyze_market
+
+class TestCandleSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(260)
+        self.series = CandleSeries.from_candles(self.data)
+
+    def test_roundtrip_and_item_access(self):
+        self.assertEqual(len(self.series), 260)
+        self.assertEqual(self.series.to_candles(), self.data)
+        self.assertEqual(self.series[-1], self.data[-1])
+        self.assertIsInstance(self.series[0]['number_of_trades'], int)
+
+    def test_slicing_is_zero_copy(self):
+        window = self.series[10:50]
+        self.assertIsInstance(window, CandleSeries)
+        self.assertEqual(len(window), 40)
+        self.assertTrue(np.shares_memory(window.close, self.series.close))
+        self.assertEqual(window[0], self.data[10])
+
+    def test_analyze_market_accepts_series(self):
+        expected = analyze_market(self.data, self.data[:60])
+        actual = analyze_market(self.series, self.series[:60])
+        self.assertEqual(actual[0], expected[0])
+        self.assertAlmostEqual(actual[1], expected[1])
+        for key, value in expected[2].items():
+            if isinstance(value, float):
+                self.assertAlmostEqual(actual[2][key], value)
+            else:
+                self.assertEqual(actual[2][key], value)
+
+    def test_fetch_returns_series_directly(self):
+        start = 1_600_000_000_000
+        with FakeKlineServer(start, start + 10 ** 8) as server:
+            series = fetch_ohlcv_data("BTCUSDT", "1m", 25, base_url=server.url, as_series=True)
+            candles = fetch_ohlcv_data("BTCUSDT", "1m", 25, base_url=server.url)
+        self.assertIsInstance(series, CandleSeries)
+        self.assertEqual(series.to_candles(), candles)
+        self.assertEqual(series.close.dtype, np.float64)
+
+if __name__ == '__main__':
+    unittest.main()
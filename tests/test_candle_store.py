@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from candle_factory import make_candles
+from src.data.candle_store import CandleStore, sync_candle_store, candles_to_records
+
+class TestCandleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CandleStore("BTCUSDT", "15m", root=self.tmp.name)
+        self.data = make_candles(50)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_load_roundtrip(self):
+        self.assertEqual(len(self.store), 0)
+        self.assertIsNone(self.store.last_close_time())
+
+        self.assertEqual(self.store.append(self.data[:30]), 30)
+        # Candle lama / duplikat diabaikan
+        self.assertEqual(self.store.append(self.data[20:50]), 20)
+
+        columns = self.store.load()
+        self.assertIsInstance(columns['close'], np.memmap)
+        self.assertEqual(len(columns['close']), 50)
+        self.assertEqual(self.store.to_candles(), self.data)
+        self.assertEqual(self.store.tail(5), self.data[-5:])
+        self.assertEqual(self.store.last_close_time(), self.data[-1]['close_time'])
+
+    def test_sync_requests_only_newer_candles(self):
+        self.store.append(self.data[:40])
+        with mock.patch('src.data.candle_store.fetch_ohlcv_data', return_value=self.data[40:]) as fetch:
+            added = sync_candle_store(self.store, limit=1000)
+
+        self.assertEqual(added, 10)
+        self.assertEqual(fetch.call_args.kwargs['start_time'], self.data[39]['close_time'] + 1)
+        self.assertEqual(len(self.store), 50)
+
+    def test_sync_skips_candle_that_is_still_open(self):
+        forming = dict(self.data[-1], close_time=2 ** 62)
+        with mock.patch('src.data.candle_store.fetch_ohlcv_data', return_value=self.data[:-1] + [forming]):
+            sync_candle_store(self.store)
+        self.assertEqual(len(self.store), 49)
+
+    def test_interrupted_merge_is_completed_on_open(self):
+        self.store.append(self.data[20:])
+        real_replace = os.replace
+        calls = []
+
+        def crash_after_first_column(src, dst):
+            calls.append(dst)
+            if len(calls) == 3:  # manifest dan kolom pertama sudah diganti, lalu proses "mati"
+                raise KeyboardInterrupt
+            return real_replace(src, dst)
+
+        with mock.patch('src.data.candle_store.os.replace', side_effect=crash_after_first_column):
+            with self.assertRaises(KeyboardInterrupt):
+                self.store.merge(candles_to_records(self.data[:20]))
+
+        reopened = CandleStore("BTCUSDT", "15m", root=self.tmp.name)
+        self.assertEqual(len(reopened), 50)
+        self.assertEqual(reopened.to_candles(), self.data)
+        self.assertEqual([name for name in os.listdir(reopened.path) if not name.endswith('.bin')], [])
+
+    def test_uncommitted_merge_is_discarded_on_open(self):
+        self.store.append(self.data)
+        # Sisa kolom sementara tanpa manifest: merge belum di-commit
+        with open(self.store._column_path('close') + '.tmp', 'wb') as f:
+            f.write(b'\0' * 16)
+        reopened = CandleStore("BTCUSDT", "15m", root=self.tmp.name)
+        self.assertFalse(os.path.exists(reopened._column_path('close') + '.tmp'))
+        self.assertEqual(reopened.to_candles(), self.data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from candle_factory import make_candles
+from src.indicators.technical import calculate_rsi, calculate_ema, calculate_macd, calculate_adx
+from src.indicators.atr import calculate_atr
+from src.indicators.ngtcv import calculate_ngtCV
+from src.indicators.support_resistance import get_nearest_support_resistance, is_near_support_resistance
+from src.indicators.full_history import (
+    rsi_history, ema_history, macd_history, atr_history, adx_history,
+    ngtcv_history, average_last_three, support_resistance_history
+)
+from src.strategy.signal_generator import analyze_market, analyze_market_history, analyze_market_at
+
+class TestFullHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(320)
+        self.closes = [c['close'] for c in self.data]
+        self.highs = [c['high'] for c in self.data]
+        self.lows = [c['low'] for c in self.data]
+
+    def test_rsi_ema_macd_match_scalar(self):
+        """Setiap nilai per bar sama dengan fungsi skalar pada data[:i+1]"""
+        rsi = rsi_history(self.closes)
+        ema = ema_history(self.closes, 26)
+        macd_line, signal_line, histogram = macd_history(self.closes)
+        for i in range(len(self.closes)):
+            window = self.closes[:i + 1]
+            self.assertAlmostEqual(rsi[i], calculate_rsi(window), places=8)
+            self.assertAlmostEqual(ema[i], calculate_ema(window, 26), places=8)
+            expected = calculate_macd(window)
+            self.assertAlmostEqual(macd_line[i], expected[0], places=8)
+            self.assertAlmostEqual(signal_line[i], expected[1], places=8)
+            self.assertAlmostEqual(histogram[i], expected[2], places=8)
+
+    def test_atr_adx_match_scalar(self):
+        atr = atr_history(self.highs, self.lows, self.closes)
+        adx = adx_history(self.highs, self.lows, self.closes)
+        for i in range(len(self.closes)):
+            self.assertAlmostEqual(atr[i], calculate_atr(self.data[:i + 1]), places=8)
+            expected = calculate_adx(self.highs[:i + 1], self.lows[:i + 1], self.closes[:i + 1])
+            self.assertAlmostEqual(adx[i], expected, places=8)
+
+    def test_ngtcv_and_support_resistance_match_scalar(self):
+        columns = [[c[key] for c in self.data] for key in ('open', 'high', 'low', 'close', 'volume')]
+        ngtcv = ngtcv_history(*columns)
+        averaged = average_last_three(ngtcv)
+        support, resistance, sr_position = support_resistance_history(self.highs, self.lows, self.closes)
+        for i in range(len(self.data)):
+            candle = dict(self.data[i], historical_volumes=columns[4][:i])
+            self.assertAlmostEqual(ngtcv[i], calculate_ngtCV(candle)[0], places=12)
+            price = self.closes[i]
+            expected_support, expected_resistance = get_nearest_support_resistance(price, self.data[:i + 1])
+            self.assertEqual(support[i], expected_support)
+            self.assertEqual(resistance[i], expected_resistance)
+            self.assertEqual(sr_position[i], is_near_support_resistance(price, self.data[:i + 1]))
+        self.assertAlmostEqual(averaged[-1], sum(ngtcv[-3:]) / 3, places=12)
+
+    def test_analyze_market_at_matches_analyze_market(self):
+        higher = make_candles(120, seed=11, interval_ms=60 * 60 * 1000)
+        history = analyze_market_history(self.data, higher)
+        for i in range(195, len(self.data)):
+            expected = analyze_market(self.data[:i + 1], higher)
+            trend, confidence, indicators = analyze_market_at(history, i)
+            self.assertEqual(trend, expected[0])
+            self.assertAlmostEqual(confidence, expected[1], places=9)
+            self.assertEqual(indicators.keys(), expected[2].keys())
+            for key, value in expected[2].items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(indicators[key], value, places=6)
+                else:
+                    self.assertEqual(indicators[key], value)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import requests
+from fake_binance import FakeKlineServer
+from src.utils.http_client import HttpClient
+
+START = 1_600_000_000_000
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.client = HttpClient(pool_size=4, max_retries=3, backoff_base=0.001, backoff_max=0.01,
+                                 timeouts={'127.0.0.1': 2}, default_timeout=5)
+
+    def klines_url(self, server):
+        return f"{server.url}/api/v3/klines"
+
+    def test_backoff_is_exponential_with_jitter_and_capped(self):
+        client = HttpClient(backoff_base=0.5, backoff_max=3.0)
+        for attempt in range(6):
+            delay = client.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(3.0, 0.5 * 2 ** attempt))
+
+    def test_timeout_per_host(self):
+        self.assertEqual(self.client.timeout_for("http://127.0.0.1:8000/x"), 2)
+        self.assertEqual(self.client.timeout_for("https://api.telegram.org/bot/x"), 5)
+
+    def test_connections_are_reused(self):
+        with FakeKlineServer(START, START + 10 ** 8) as server:
+            for _ in range(5):
+                self.client.get(self.klines_url(server), params={'symbol': 'BTCUSDT', 'interval': '1m', 'limit': 5})
+        self.assertEqual(len({r['client_port'] for r in server.requests}), 1)
+
+    def test_retries_server_errors_then_succeeds(self):
+        with FakeKlineServer(START, START + 10 ** 8) as server:
+            server.queued_responses = [(503, {}), (502, {})]
+            response = self.client.get(self.klines_url(server), params={'symbol': 'BTCUSDT', 'interval': '1m', 'limit': 5})
+        self.assertEqual(len(response.json()), 5)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        with FakeKlineServer(START, START + 10 ** 8) as server:
+            server.queued_responses = [(400, {})]
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get(self.klines_url(server), params={'symbol': 'BTCUSDT', 'interval': '1m'})
+        self.assertEqual(len(server.requests), 1)
+
+    def test_read_timeout_retries_get_but_not_post(self):
+        with FakeKlineServer(START, START + 10 ** 8, delay=0.3) as server:
+            with self.assertRaises(requests.exceptions.Timeout):
+                self.client.get(self.klines_url(server), params={'symbol': 'BTCUSDT', 'interval': '1m'}, timeout=0.1)
+            self.assertEqual(len(server.requests), 3)
+            # POST (mis. sendMessage Telegram) tidak diulang: server mungkin sudah memproses request
+            with self.assertRaises(requests.exceptions.Timeout):
+                self.client.post(f"{server.url}/sendMessage", data={'text': 'hi'}, timeout=0.1)
+            self.assertEqual(len(server.requests), 4)
+
+if __name__ == '__main__':
+    unittest.main()
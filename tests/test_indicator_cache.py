@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.indicators.cache import IndicatorCache, get_pipeline, window_identity
+from src.strategy import signal_generator
+from src.strategy.signal_generator import analyze_market
+
+class TestIndicatorCache(unittest.TestCase):
+
+    def test_lru_eviction_and_counters(self):
+        cache = IndicatorCache(max_size=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        self.assertEqual(cache.get_or_compute('a', lambda: 'recomputed'), 1)
+        cache.get_or_compute('c', lambda: 3)  # 'b' paling lama tidak dipakai
+        self.assertEqual(cache.get_or_compute('b', lambda: 'recomputed'), 'recomputed')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 4, 'size': 2, 'hit_rate': 0.2})
+
+    def test_window_identity(self):
+        data = make_candles(50, seed=1)
+        series = CandleSeries.from_candles(data)
+        self.assertEqual(window_identity(data), window_identity(series))
+        self.assertNotEqual(window_identity(data), window_identity(data[1:]))
+        self.assertIsNone(window_identity([]))
+
+    def test_pipeline_results_reused_for_same_window(self):
+        cache = IndicatorCache()
+        data = make_candles(100, seed=2)
+        pipeline = get_pipeline(data, 'BTCUSDT', '15m', cache)
+        rsi = pipeline.rsi()
+        again = get_pipeline(CandleSeries.from_candles(data), 'BTCUSDT', '15m', cache)
+        self.assertIsNot(again, pipeline)
+        self.assertIs(again.results, pipeline.results)
+        self.assertEqual(again.rsi(), rsi)
+        self.assertNotIn(('column', 'close'), again.cache)  # Nilai diambil dari hasil, kolom tidak dibaca
+        self.assertIsNot(get_pipeline(data, 'ETHUSDT', '15m', cache).results, pipeline.results)
+
+    def test_forming_candle_change_is_not_served_stale(self):
+        cache = IndicatorCache()
+        data = make_candles(300, seed=5)
+        first = analyze_market(data, None, symbol='BTCUSDT', interval='15m', cache=cache)
+        forming = [dict(candle) for candle in data]
+        forming[-1]['close'] *= 1.05
+        forming[-1]['high'] = max(forming[-1]['high'], forming[-1]['close'])
+        self.assertNotEqual(window_identity(forming), window_identity(data))
+        updated = analyze_market(forming, None, symbol='BTCUSDT', interval='15m', cache=cache)
+        self.assertEqual(updated, analyze_market(forming, None))
+        self.assertNotEqual(updated[2]['rsi'], first[2]['rsi'])
+
+    def test_repeated_analysis_is_a_lookup(self):
+        cache = IndicatorCache()
+        data = make_candles(300, seed=3)
+        higher = make_candles(80, seed=4)
+        expected = analyze_market(data, higher)
+
+        with mock.patch.object(signal_generator, '_analyze_market', wraps=signal_generator._analyze_market) as spy:
+            first = analyze_market(data, higher, symbol='BTCUSDT', interval='15m', cache=cache)
+            first[2]['rsi'] = -1  # Mengubah hasil tidak boleh merusak entry cache
+            second = analyze_market(data, higher, symbol='BTCUSDT', interval='15m', cache=cache)
+            analyze_market(data, None, symbol='BTCUSDT', interval='15m', cache=cache)
+            analyze_market(data[:-1], higher, symbol='BTCUSDT', interval='15m', cache=cache)
+
+        self.assertEqual(second, expected)
+        self.assertEqual(spy.call_count, 3)
+        # Hit: analyze_market kedua, dan pipeline window yang sama saat higher timeframe berbeda
+        self.assertEqual(cache.stats()['hits'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
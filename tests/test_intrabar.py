@@ -0,0 +1,122 @@
+import tempfile
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.backtest.engine import run_signal_backtest
+from src.data.intrabar import SubBarResolver
+from src.data.candle_series import CandleSeries
+from src.data.candle_store import CandleStore
+from src.data.resample import resample_candles
+from src.strategy.signal_generator import evaluate_prediction
+
+MINUTE = 60 * 1000
+START = 1_700_000_100_000 - 1_700_000_100_000 % (15 * MINUTE)
+
+def minute_candles(prices):
+    """Candle 1m dengan high/low (high, low) per menit"""
+    candles = []
+    for i, (high, low) in enumerate(prices):
+        open_time = START + i * MINUTE
+        candles.append({
+            'open_time': open_time, 'open': 100.0, 'high': high, 'low': low, 'close': 100.0, 'volume': 1.0,
+            'close_time': open_time + MINUTE - 1, 'quote_asset_volume': 100.0, 'number_of_trades': 1,
+            'taker_buy_base_asset_volume': 0.5, 'taker_buy_quote_asset_volume': 50.0
+        })
+    return candles
+
+class TestIntrabar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CandleStore("BTCUSDT", "1m", root=self.tmp.name)
+
+        # Candle 15m ke-0 datar (bar entry), candle ke-1 menyentuh TP (menit 3) lalu SL (menit 10),
+        # candle ke-2 menyentuh SL (menit 2) lalu TP (menit 12); BUY: SL 98, TP 103
+        flat = [(100.5, 99.5)] * 15
+        tp_first = [(100.5, 99.5)] * 15
+        tp_first[3] = (103.5, 99.5)
+        tp_first[10] = (100.5, 97.5)
+        sl_first = [(100.5, 99.5)] * 15
+        sl_first[2] = (100.5, 97.5)
+        sl_first[12] = (103.5, 99.5)
+        self.minutes = minute_candles(flat + tp_first + sl_first)
+        self.store.append(self.minutes)
+        self.data = resample_candles(CandleSeries.from_candles(self.minutes), "15m")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_touch(self):
+        resolver = SubBarResolver(self.store)
+        self.assertIsNone(resolver.columns)
+        bar = self.data[1]
+        self.assertEqual(resolver.first_touch(1, bar['open_time'], bar['close_time'], 98.0, 103.0), "TP")
+        bar = self.data[2]
+        self.assertEqual(resolver.first_touch(1, bar['open_time'], bar['close_time'], 98.0, 103.0), "SL")
+        # SELL: SL di atas, TP di bawah
+        self.assertEqual(resolver.first_touch(-1, bar['open_time'], bar['close_time'], 103.0, 98.0), "TP")
+        # Satu sub-bar menyentuh keduanya / tidak ada sub-bar
+        self.assertIsNone(resolver.first_touch(1, bar['open_time'], bar['close_time'], 99.6, 100.4))
+        self.assertIsNone(resolver.first_touch(1, START + 60 * MINUTE, START + 75 * MINUTE - 1, 98.0, 103.0))
+        self.assertEqual(resolver.stats(), {'resolved': 3, 'unresolved': 2, 'sub_bars_loaded': 60})
+
+    def test_backtest_resolves_only_ambiguous_bars(self):
+        atr = np.ones(len(self.data))
+        for entry, expected in ((0, "TP"), (1, "SL")):
+            signals = ["HOLD"] * len(self.data)
+            signals[entry] = "BUY"
+            # Entry di close 100 -> SL 98, TP 103 (ATR 1)
+            coarse = run_signal_backtest(self.data, signals, atr, sl_multiplier=2, tp_multiplier=3,
+                                         fee_rate=0.0, slippage=0.0)['trades'][0]
+            self.assertEqual((coarse['exit_reason'], coarse['ambiguous']), ("SL", True))
+
+            resolver = SubBarResolver(self.store)
+            result = run_signal_backtest(self.data, signals, atr, sl_multiplier=2, tp_multiplier=3,
+                                         fee_rate=0.0, slippage=0.0, sub_bars=resolver)
+            trade = result['trades'][0]
+            self.assertEqual(trade['exit_index'], entry + 1)
+            self.assertEqual(trade['exit_reason'], expected)
+            self.assertTrue(trade['intrabar_resolved'])
+            self.assertEqual(result['stats']['intrabar_resolved'], 1)
+            # Hanya 15 sub-bar milik bar exit yang dibaca
+            self.assertEqual(resolver.sub_bars_loaded, 15)
+
+        # Tanpa bar ambigu, sub-bar tidak pernah dibuka
+        resolver = SubBarResolver(self.store)
+        run_signal_backtest(self.data, ["HOLD"] * len(self.data), atr, sub_bars=resolver)
+        self.assertIsNone(resolver.columns)
+
+    def test_evaluate_prediction_with_sub_bars(self):
+        resolver = SubBarResolver(self.store)
+        previous = self.data[0]
+        self.assertEqual(evaluate_prediction(previous, self.data[1], ("BUY", 0.8), 1.0, sub_bars=resolver), (True, 3.0))
+        self.assertEqual(evaluate_prediction(self.data[1], self.data[2], ("BUY", 0.8), 1.0, sub_bars=resolver), (False, 2.0))
+
+    def test_matches_minute_simulation(self):
+        """Dengan sub-bar, exit sama dengan simulasi langsung di candle 1m"""
+        minutes = CandleSeries.from_candles(make_candles(15 * 400, seed=3, interval_ms=MINUTE, start_time=START))
+        store = CandleStore("ETHUSDT", "1m", root=self.tmp.name)
+        store.merge(minutes.to_records())
+        data = resample_candles(minutes, "15m")
+        rng = np.random.default_rng(0)
+        signals = rng.choice(["BUY", "SELL", "HOLD"], size=len(data), p=[0.05, 0.05, 0.9])
+        atr = np.full(len(data), 15.0)
+        resolver = SubBarResolver(store)
+        trades = run_signal_backtest(data, signals, atr, sl_multiplier=1, tp_multiplier=1, fee_rate=0.0,
+                                     slippage=0.0, max_positions=len(data), sub_bars=resolver)['trades']
+        self.assertGreater(sum(trade['ambiguous'] for trade in trades), 0)
+
+        highs, lows = minutes.high, minutes.low
+        for trade in trades:
+            if trade['exit_reason'] == "END" or (trade['ambiguous'] and not trade['intrabar_resolved']):
+                continue
+            side = 1 if trade['type'] == "BUY" else -1
+            start = (trade['entry_index'] + 1) * 15
+            sl_hit = lows[start:] <= trade['sl'] if side > 0 else highs[start:] >= trade['sl']
+            tp_hit = highs[start:] >= trade['tp'] if side > 0 else lows[start:] <= trade['tp']
+            first = np.flatnonzero(sl_hit | tp_hit)[0]
+            self.assertEqual(trade['exit_reason'], "SL" if sl_hit[first] else "TP")
+            self.assertEqual((start + first) // 15, trade['exit_index'])
+
+if __name__ == '__main__':
+    unittest.main()
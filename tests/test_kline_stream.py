@@ -0,0 +1,135 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from fake_binance import FakeKlineServer, make_kline
+from fake_binance_ws import FakeKlineStreamServer, stream_event
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.data.kline_stream import KlineStream, combined_stream_url, parse_stream_kline
+
+FIFTEEN_MINUTES = 15 * 60 * 1000
+START = 1_600_000_000_000 - 1_600_000_000_000 % FIFTEEN_MINUTES
+HISTORY = 300
+REPLAYED = 12
+
+def replay_server(rest_server: FakeKlineServer, **kwargs) -> FakeKlineStreamServer:
+    """
+    Stream me-replay candle sesudah histori REST; setiap candle yang tertutup juga tersedia di REST
+    """
+    klines = {'15m': [make_kline(START + i * FIFTEEN_MINUTES, FIFTEEN_MINUTES) for i in range(HISTORY, HISTORY + REPLAYED)]}
+
+    def on_closed(open_time):
+        rest_server.last_open_time = max(rest_server.last_open_time, open_time)
+    return FakeKlineStreamServer(klines, on_closed=on_closed, **kwargs)
+
+class TestKlineStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rest = FakeKlineServer(START, START + (HISTORY - 1) * FIFTEEN_MINUTES)
+        self.rest.__enter__()
+
+    def tearDown(self):
+        self.rest.__exit__()
+        self.tmp.cleanup()
+
+    def test_url_and_parse(self):
+        self.assertEqual(combined_stream_url("ws://x", [("BTCUSDT", "15m"), ("ETHUSDT", "1h")]),
+                         "ws://x/stream?streams=btcusdt@kline_15m/ethusdt@kline_1h")
+        kline = make_kline(START, FIFTEEN_MINUTES)
+        symbol, interval, candle, closed = parse_stream_kline(json.loads(stream_event("btcusdt@kline_15m", kline, "15m", True)))
+        self.assertEqual((symbol, interval, closed), ("BTCUSDT", "15m", True))
+        self.assertEqual(candle['close_time'], START + FIFTEEN_MINUTES - 1)
+        self.assertEqual(candle['close'], float(kline[4]))
+
+    def test_reconnect_and_gap_fill(self):
+        received = []
+        last_close_time = START + (HISTORY + REPLAYED) * FIFTEEN_MINUTES - 1
+        skipped = START + (HISTORY + 4) * FIFTEEN_MINUTES
+
+        async def scenario(url):
+            done = asyncio.Event()
+
+            def on_candle(symbol, interval, candle):
+                received.append((symbol, candle['close_time'], time.monotonic()))
+                if sum(close_time == last_close_time for _, close_time, _ in received) == 2:
+                    done.set()
+
+            stream = KlineStream([("AAAUSDT", "15m"), ("BBBUSDT", "15m")], on_candle, root=self.tmp.name,
+                                 ws_url=url, base_url=self.rest.url, reconnect_delay=0.05)
+            task = asyncio.create_task(stream.run())
+            await asyncio.wait_for(done.wait(), 20)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return stream
+
+        with replay_server(self.rest, pace=0.02, close_after=6, skip=[("aaausdt@kline_15m", skipped)]) as server:
+            stream = asyncio.run(scenario(server.url))
+
+        self.assertEqual(stream.connections, 2)
+        self.assertEqual(stream.gap_fills, 1)
+        for symbol in ("AAAUSDT", "BBBUSDT"):
+            data = CandleStore(symbol, "15m", self.tmp.name).series()
+            self.assertEqual(len(data), HISTORY + REPLAYED)
+            self.assertTrue((data.open_time[1:] - data.open_time[:-1] == FIFTEEN_MINUTES).all())
+            expected = [float(make_kline(t, FIFTEEN_MINUTES)[4]) for t in data.open_time[-REPLAYED:]]
+            self.assertEqual(data.close[-REPLAYED:].tolist(), expected)
+            close_times = [close_time for name, close_time, _ in received if name == symbol]
+            # Candle terakhir hasil isi REST diteruskan saat terhubung, lalu setiap candle tertutup berurutan
+            self.assertGreaterEqual(close_times[0], START + HISTORY * FIFTEEN_MINUTES - 1)
+            self.assertEqual(close_times, sorted(set(close_times)))
+            self.assertEqual(close_times[-1], last_close_time)
+
+        # Latency event tertutup -> on_candle
+        latencies = [at - server.sent_at[(f"{symbol.lower()}@kline_15m", close_time + 1 - FIFTEEN_MINUTES)]
+                     for symbol, close_time, at in received
+                     if (f"{symbol.lower()}@kline_15m", close_time + 1 - FIFTEEN_MINUTES) in server.sent_at]
+        self.assertTrue(latencies)
+        self.assertLess(max(latencies), 1.0)
+
+    def test_reader_hands_off_without_io_and_drops_oldest(self):
+        emitted = []
+        klines = [make_kline(START + i * FIFTEEN_MINUTES, FIFTEEN_MINUTES) for i in range(HISTORY, HISTORY + 3)]
+        sync_candle_store(CandleStore("AAAUSDT", "15m", self.tmp.name), base_url=self.rest.url)
+        self.rest.last_open_time = START + (HISTORY + 2) * FIFTEEN_MINUTES
+
+        async def scenario():
+            stream = KlineStream([("AAAUSDT", "15m")], lambda *args: emitted.append(args), root=self.tmp.name,
+                                 base_url=self.rest.url, pending_candles=2)
+            stream.wakeups = {("AAAUSDT", "15m"): asyncio.Event()}
+            loop_thread = threading.current_thread()
+            store_threads = []
+            append = CandleStore.append
+
+            def recording_append(store, candles):
+                store_threads.append(threading.current_thread())
+                return append(store, candles)
+
+            with mock.patch.object(CandleStore, 'append', recording_append):
+                for kline in klines:
+                    stream.handle_message(stream_event("aaausdt@kline_15m", kline, "15m", True))
+                self.assertEqual(store_threads, [])  # Reader tidak menyentuh candle store
+                self.assertEqual(stream.dropped, 1)
+                task = asyncio.create_task(stream.persist_stream(("AAAUSDT", "15m")))
+                for _ in range(100):
+                    if emitted:
+                        break
+                    await asyncio.sleep(0.02)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            self.assertTrue(store_threads)
+            self.assertNotIn(loop_thread, store_threads)
+            return stream
+
+        stream = asyncio.run(scenario())
+        # Candle tertua yang dibuang diisi ulang dari REST sebagai celah
+        self.assertEqual(stream.gap_fills, 1)
+        data = CandleStore("AAAUSDT", "15m", self.tmp.name).series()
+        self.assertEqual(len(data), HISTORY + 3)
+        self.assertEqual(emitted[-1][2]['close_time'], START + (HISTORY + 3) * FIFTEEN_MINUTES - 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from fake_binance import FakeKlineServer, make_kline
+from fake_binance_ws import FakeKlineStreamServer
+from src.data.candle_store import CandleStore
+from src.strategy.live_engine import LatestSlot, LiveEngine, load_live_state
+from src.strategy.scanner import analyze_symbol
+
+FIFTEEN_MINUTES = 15 * 60 * 1000
+
+class TestLiveEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, "live_state.json")
+        now = int(time.time() * 1000)
+        self.server = FakeKlineServer(now - 1200 * FIFTEEN_MINUTES, now)
+        self.server.__enter__()
+        self.streams = [("AAAUSDT", "15m"), ("BBBUSDT", "15m"), ("AAAUSDT", "1h")]
+
+    def tearDown(self):
+        self.server.__exit__()
+        self.tmp.cleanup()
+
+    def engine(self, notifier, analysis_workers=1, **kwargs):
+        return LiveEngine(self.streams, root=self.tmp.name, lookback=300, analysis_workers=analysis_workers,
+                          fetch_workers=2, notify_workers=2, grace_seconds=0.0, retry_seconds=0.05, max_retries=2,
+                          notifier=notifier, state_file=self.state_file, source="rest", base_url=self.server.url,
+                          **kwargs)
+
+    def run_engine(self, engine, timeout: float):
+        timer = threading.Timer(timeout, engine.stop)
+        timer.start()
+        try:
+            asyncio.run(engine.run())
+        finally:
+            timer.cancel()
+
+    def test_streams_flow_through_all_stages(self):
+        notified = []
+        lock = threading.Lock()
+
+        def notifier(result):
+            with lock:
+                notified.append(result)
+                if len(notified) == len(self.streams):
+                    engine.stop()
+
+        engine = self.engine(notifier)
+        self.run_engine(engine, timeout=30)
+        self.assertEqual(sorted((r['symbol'], r['interval']) for r in notified), sorted(self.streams))
+
+        state = load_live_state(self.state_file)
+        self.assertEqual(set(state), {"AAAUSDT_15m", "BBBUSDT_15m", "AAAUSDT_1h"})
+        for result in notified:
+            store = CandleStore(result['symbol'], result['interval'], self.tmp.name)
+            self.assertEqual(result['close_time'], store.last_close_time())
+            self.assertEqual(state[f"{result['symbol']}_{result['interval']}"]['close_time'], result['close_time'])
+            expected = analyze_symbol(result['symbol'], result['interval'], engine.higher_interval_for(result['interval']),
+                                      300, self.tmp.name)
+            self.assertAlmostEqual(result['confidence'], expected['confidence'], places=12)
+            self.assertEqual(result['signal'], expected['signal'])
+
+        # Restart: candle yang sudah diproses tidak dianalisis atau dikirim ulang, analyzer dipulihkan dari state
+        repeated = []
+        restarted = self.engine(repeated.append)
+        self.run_engine(restarted, timeout=1.0)
+        self.assertEqual(repeated, [])
+        self.assertEqual(set(restarted.analyzers), set(state))
+        for key, analyzer in restarted.analyzers.items():
+            self.assertEqual(analyzer.snapshot(), state[key]['analyzer'])
+
+    def test_slow_notifier_does_not_block_other_streams(self):
+        finished = []
+        release = threading.Event()
+
+        def notifier(result):
+            if result['symbol'] == "AAAUSDT" and result['interval'] == "15m":
+                release.wait(10)
+            finished.append(result['symbol'] + result['interval'])
+            if len(finished) == 2:
+                release.set()
+            elif len(finished) == 3:
+                engine.stop()
+
+        engine = self.engine(notifier)
+        self.run_engine(engine, timeout=30)
+        self.assertEqual(finished[-1], "AAAUSDT15m")
+
+    def test_latest_slot_coalesces_and_never_blocks(self):
+        async def scenario():
+            slot = LatestSlot()
+            for close_time in (1, 2, 3):
+                slot.put(close_time)  # Tanpa await: penyerahan tidak pernah menunggu
+            self.assertEqual(await slot.get(), 3)
+            self.assertEqual(slot.replaced, 2)
+            join = asyncio.create_task(slot.join())
+            await asyncio.sleep(0)
+            self.assertFalse(join.done())
+            slot.task_done()
+            await asyncio.wait_for(join, 1)
+
+        asyncio.run(scenario())
+
+    def test_slow_analysis_does_not_delay_other_streams(self):
+        finished = []
+        release = threading.Event()
+
+        def notifier(result):
+            finished.append(result['symbol'] + result['interval'])
+            if len(finished) == 2:
+                release.set()
+            elif len(finished) == 3:
+                engine.stop()
+
+        engine = self.engine(notifier, analysis_workers=2)
+        analyze_stream = engine.analyze_stream
+
+        def slow_analyze_stream(symbol, interval):
+            if (symbol, interval) == ("AAAUSDT", "15m"):
+                release.wait(10)
+            return analyze_stream(symbol, interval)
+
+        engine.analyze_stream = slow_analyze_stream
+        self.run_engine(engine, timeout=30)
+        self.assertEqual(finished[-1], "AAAUSDT15m")
+
+    def test_websocket_closed_candle_to_signal_latency(self):
+        start = 1_600_000_000_000 - 1_600_000_000_000 % FIFTEEN_MINUTES
+        rest = FakeKlineServer(start, start + 299 * FIFTEEN_MINUTES)
+        klines = {'15m': [make_kline(start + i * FIFTEEN_MINUTES, FIFTEEN_MINUTES) for i in range(300, 306)]}
+        last_close_time = start + 306 * FIFTEEN_MINUTES - 1
+        notified = []
+
+        def on_closed(open_time):
+            rest.last_open_time = max(rest.last_open_time, open_time)
+
+        def notifier(result):
+            notified.append((result['symbol'], result['close_time'], time.monotonic()))
+            if sum(close_time == last_close_time for _, close_time, _ in notified) == 2:
+                engine.stop()
+
+        with rest, FakeKlineStreamServer(klines, pace=0.2, on_closed=on_closed) as stream_server:
+            engine = LiveEngine([("AAAUSDT", "15m"), ("BBBUSDT", "15m")], root=self.tmp.name, lookback=300,
+                                analysis_workers=1, notify_workers=2, notifier=notifier, state_file=self.state_file,
+                                source="websocket", ws_url=stream_server.url, base_url=rest.url)
+            self.run_engine(engine, timeout=30)
+
+        self.assertEqual(engine.kline_stream.connections, 1)
+        latencies = []
+        for symbol, close_time, at in notified:
+            sent_at = stream_server.sent_at.get((f"{symbol.lower()}@kline_15m", close_time + 1 - FIFTEEN_MINUTES))
+            if sent_at is not None:
+                latencies.append(at - sent_at)
+        self.assertGreaterEqual(len(latencies), 2)
+        self.assertLess(max(latencies), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
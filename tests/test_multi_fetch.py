@@ -0,0 +1,35 @@
+import time
+import unittest
+from fake_binance import FakeKlineServer
+from src.data.binance_api import iter_ohlcv_matrix, fetch_ohlcv_matrix
+
+START = 1_600_000_000_000
+
+class TestMultiFetch(unittest.TestCase):
+
+    def test_matrix_fetch_costs_about_one_round_trip(self):
+        symbols, intervals = ["BTCUSDT", "ETHUSDT"], ["15m", "1h", "4h"]
+        with FakeKlineServer(START, START + 10 ** 9, delay=0.3) as server:
+            started = time.monotonic()
+            results, errors = fetch_ohlcv_matrix(symbols, intervals, 20, max_workers=6, base_url=server.url)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(errors, {})
+        self.assertEqual(set(results), {(s, i) for s in symbols for i in intervals})
+        self.assertTrue(all(len(candles) == 20 for candles in results.values()))
+        self.assertLess(elapsed, 0.3 * 3)
+
+    def test_failures_are_reported_per_combination(self):
+        with FakeKlineServer(START, START + 10 ** 9) as server:
+            server.queued_responses = [(400, {})]
+            outcomes = list(iter_ohlcv_matrix(["BTCUSDT"], ["15m", "1h"], 10, max_workers=1, base_url=server.url))
+
+        self.assertEqual(len(outcomes), 2)
+        failed = [o for o in outcomes if o[3] is not None]
+        succeeded = [o for o in outcomes if o[3] is None]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0][2], [])
+        self.assertEqual(len(succeeded[0][2]), 10)
+
+if __name__ == '__main__':
+    unittest.main()
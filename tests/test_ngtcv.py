@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.indicators.ngtcv import calculate_ngtCV, calculate_average_volume, rolling_volume_baseline, calculate_ngtcv_series, average_ngtcv
+from src.indicators.pipeline import IndicatorPipeline
+from src.indicators.streaming import StreamingNgtCV
+
+class TestNgtCVSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(120, seed=21)
+        self.columns = [np.array([c[key] for c in self.data]) for key in ('open', 'high', 'low', 'close', 'volume')]
+        self.volumes = self.columns[4].tolist()
+
+    def test_rolling_baseline_matches_average_volume(self):
+        baseline = rolling_volume_baseline(self.volumes, 20)
+        for i in range(len(self.volumes)):
+            self.assertAlmostEqual(baseline[i], calculate_average_volume(self.volumes[:i], 20), places=8)
+
+    def test_series_matches_scalar_with_historical_volumes(self):
+        ngtcv, body_ratio, wick_ratio, volume_factor = calculate_ngtcv_series(*self.columns)
+        for i, candle in enumerate(self.data):
+            expected, body_size, expected_wick, expected_volume = calculate_ngtCV(dict(candle, historical_volumes=self.volumes[:i]))
+            self.assertAlmostEqual(ngtcv[i], expected, places=12)
+            self.assertAlmostEqual(wick_ratio[i], expected_wick, places=12)
+            self.assertAlmostEqual(volume_factor[i], expected_volume, places=10)
+            candle_range = candle['high'] - candle['low']
+            self.assertAlmostEqual(body_ratio[i], body_size / candle_range if candle_range > 0 else 0.0, places=12)
+
+    def test_average_of_last_three(self):
+        ngtcv = calculate_ngtcv_series(*self.columns)[0]
+        averaged = average_ngtcv(ngtcv, 3)
+        self.assertTrue(np.isnan(averaged[:2]).all())
+        self.assertAlmostEqual(averaged[-1], sum(ngtcv[-3:]) / 3, places=12)
+        self.assertAlmostEqual(IndicatorPipeline(self.data).ngtcv_average(3), averaged[-1], places=12)
+
+    def test_streaming_matches_batch(self):
+        averaged = average_ngtcv(calculate_ngtcv_series(*self.columns)[0], 3)
+        indicator = StreamingNgtCV()
+        for i, candle in enumerate(self.data):
+            indicator.update(candle)
+            if i == 60:
+                indicator = StreamingNgtCV.restore(indicator.snapshot())
+            if i >= 2:
+                self.assertAlmostEqual(indicator.value, averaged[i], places=12)
+
+if __name__ == '__main__':
+    unittest.main()
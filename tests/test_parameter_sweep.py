@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.backtest.engine import run_signal_backtest
+from src.backtest.shared_arrays import SharedArrays, attach_shared_arrays
+from src.backtest.sweep import expand_grid, group_by_score_parameters, run_parameter_sweep, format_sweep_table
+from src.data.candle_series import CandleSeries
+from src.strategy.signal_generator import analyze_market_history, score_market_history
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.data = CandleSeries.from_candles(make_candles(900, seed=5))
+        self.higher = CandleSeries.from_candles(make_candles(240, seed=55, interval_ms=60 * 60 * 1000))
+        self.grid = {
+            'min_confidence': [0.3, 0.5],
+            'ema_short_period': [9, 12],
+            'atr_multiplier_sl': [1.5, 2],
+            'atr_multiplier_tp': [3],
+        }
+
+    def test_grid_grouping(self):
+        combinations = expand_grid(self.grid)
+        self.assertEqual(len(combinations), 8)
+        groups = group_by_score_parameters(combinations)
+        # Multiplier SL/TP tidak memengaruhi sinyal: 4 set sinyal, masing-masing 2 backtest
+        self.assertEqual(len(groups), 4)
+        self.assertTrue(all(len(trades) == 2 for _, trades in groups))
+        with self.assertRaises(ValueError):
+            expand_grid({'unknown': [1]})
+
+    def test_default_parameters_match_direct_backtest(self):
+        rows = run_parameter_sweep(self.data, {}, self.higher, max_workers=1)
+        self.assertEqual(len(rows), 1)
+        signals = score_market_history(analyze_market_history(self.data, self.higher))['signal']
+        history = analyze_market_history(self.data, self.higher)
+        expected = run_signal_backtest(self.data, signals, history['atr'])['stats']
+        for key, value in expected.items():
+            self.assertEqual(rows[0][key], value)
+
+    def test_parameters_reach_scoring(self):
+        history = analyze_market_history(self.data, self.higher, ema_periods=(9,))
+        rows = run_parameter_sweep(self.data, {'min_confidence': [0.3], 'ema_short_period': [9]}, self.higher,
+                                   max_workers=1)
+        signals = score_market_history(history, min_confidence=0.3, ema_short_period=9)['signal']
+        expected = run_signal_backtest(self.data, signals, history['atr'])['stats']
+        self.assertEqual(rows[0]['total_trades'], expected['total_trades'])
+        self.assertEqual(rows[0]['net_pnl'], expected['net_pnl'])
+
+    def test_process_pool_matches_serial(self):
+        serial = run_parameter_sweep(self.data, self.grid, self.higher, max_workers=1)
+        parallel = run_parameter_sweep(self.data, self.grid, self.higher, max_workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([row['rank'] for row in serial], list(range(1, 9)))
+        net_pnl = [row['net_pnl'] for row in serial]
+        self.assertEqual(net_pnl, sorted(net_pnl, reverse=True))
+        self.assertGreater(max(row['total_trades'] for row in serial), 0)
+        self.assertEqual(len(format_sweep_table(serial, top=3).splitlines()), 4)
+
+    def test_shared_arrays_roundtrip(self):
+        arrays = {'close': np.arange(5, dtype=float), 'label': np.array(["A", "BB"]), 'flag': np.array([True, False])}
+        with SharedArrays(arrays) as shared:
+            attached, blocks = attach_shared_arrays(shared.spec)
+            for key, values in arrays.items():
+                np.testing.assert_array_equal(attached[key], values)
+            self.assertFalse(attached['close'].flags.writeable)
+            del attached
+            for block in blocks:
+                block.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.indicators import pipeline as pipeline_module
+from src.indicators.pipeline import IndicatorPipeline
+from src.indicators.technical import calculate_rsi, calculate_ema, calculate_macd, calculate_adx, ema_series
+from src.indicators.atr import calculate_atr
+from src.indicators.ngtcv import calculate_ngtCV
+from src.indicators.support_resistance import get_nearest_support_resistance, is_near_support_resistance
+
+class TestIndicatorPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(300, seed=9)
+        self.closes = [c['close'] for c in self.data]
+        self.highs = [c['high'] for c in self.data]
+        self.lows = [c['low'] for c in self.data]
+
+    def test_ema_series_matches_pandas(self):
+        expected = pd.Series(self.closes).ewm(span=26, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(ema_series(self.closes, 26), expected, rtol=1e-12)
+
+    def test_nodes_match_scalar_functions(self):
+        for data in (self.data, CandleSeries.from_candles(self.data)):
+            pipeline = IndicatorPipeline(data)
+            for period in (12, 26, 50, 200, 500):
+                self.assertAlmostEqual(pipeline.ema(period), calculate_ema(self.closes, period), places=8)
+            for actual, expected in zip(pipeline.macd(), calculate_macd(self.closes)):
+                self.assertAlmostEqual(actual, expected, places=8)
+            self.assertEqual(pipeline.rsi(), calculate_rsi(self.closes))
+            self.assertAlmostEqual(pipeline.atr(), calculate_atr(self.data), places=10)
+            self.assertAlmostEqual(pipeline.adx(), calculate_adx(self.highs, self.lows, self.closes), places=10)
+            self.assertEqual(pipeline.support_resistance(), get_nearest_support_resistance(self.closes[-1], self.data))
+            self.assertEqual(pipeline.sr_position(), is_near_support_resistance(self.closes[-1], self.data))
+            volumes = [c['volume'] for c in self.data]
+            expected_ngtcv = sum(
+                calculate_ngtCV(dict(self.data[i], historical_volumes=volumes[:i]))[0] for i in range(len(self.data) - 3, len(self.data))
+            ) / 3
+            self.assertAlmostEqual(pipeline.ngtcv_average(3), expected_ngtcv, places=12)
+
+    def test_shared_intermediates_computed_once(self):
+        pipeline = IndicatorPipeline(self.data)
+        with mock.patch.object(pipeline_module, 'ema_series', wraps=ema_series) as ema_spy, \
+             mock.patch.object(pipeline_module, 'true_range', wraps=pipeline_module.true_range) as tr_spy:
+            pipeline.ema(12)
+            pipeline.ema(26)
+            pipeline.macd()
+            pipeline.macd()
+            pipeline.atr()
+            pipeline.adx()
+        self.assertEqual(sorted(call.args[1] for call in ema_spy.call_args_list), [12, 26])
+        self.assertEqual(tr_spy.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from fake_binance import FakeKlineServer
+from src.data.binance_api import fetch_klines
+from src.data.rate_limiter import WeightScheduler, kline_request_weight, PRIORITY_LIVE, PRIORITY_BACKFILL
+
+START = 1_600_000_000_000
+
+class TestWeightScheduler(unittest.TestCase):
+
+    def test_kline_weight_table(self):
+        self.assertEqual(kline_request_weight(50), 1)
+        self.assertEqual(kline_request_weight(300), 2)
+        self.assertEqual(kline_request_weight(1000), 5)
+
+    def test_acquire_waits_for_refill(self):
+        scheduler = WeightScheduler(weight_limit=10, window_seconds=1.0, safety_margin=1.0)
+        scheduler.acquire(10)
+        started = time.monotonic()
+        scheduler.acquire(5)
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_used_weight_header_drains_bucket(self):
+        scheduler = WeightScheduler(weight_limit=100, window_seconds=60.0, safety_margin=1.0)
+        scheduler.update_from_headers({'X-MBX-USED-WEIGHT-1M': '95'})
+        self.assertLessEqual(scheduler.tokens, 5.1)
+
+    def test_live_requests_are_served_before_backfill(self):
+        scheduler = WeightScheduler(weight_limit=10, window_seconds=0.5, safety_margin=1.0)
+        scheduler.acquire(10)
+        order = []
+
+        def worker(name, priority):
+            scheduler.acquire(10, priority)
+            order.append(name)
+
+        backfill = [threading.Thread(target=worker, args=(f"backfill-{i}", PRIORITY_BACKFILL)) for i in range(2)]
+        for thread in backfill:
+            thread.start()
+        time.sleep(0.05)
+        live = threading.Thread(target=worker, args=("live", PRIORITY_LIVE))
+        live.start()
+        for thread in backfill + [live]:
+            thread.join(timeout=5)
+        self.assertEqual(order[0], "live")
+
+    def test_429_blocks_for_retry_after_then_retries(self):
+        scheduler = WeightScheduler(weight_limit=6000, window_seconds=60.0)
+        with FakeKlineServer(START, START + 10 ** 8) as server, \
+                mock.patch('src.data.binance_api.get_weight_scheduler', return_value=scheduler):
+            server.queued_responses = [(429, {'Retry-After': '1'})]
+            started = time.monotonic()
+            candles = fetch_klines("BTCUSDT", "1m", 10, base_url=server.url)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(candles), 10)
+        self.assertEqual(len(server.requests), 2)
+        self.assertGreaterEqual(elapsed, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.data.resample import resample_candles, CandleResampler, bucket_open_time
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+START = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+
+def naive_resample(candles, interval_ms):
+    buckets = {}
+    for candle in candles:
+        buckets.setdefault(candle['open_time'] // interval_ms * interval_ms, []).append(candle)
+    result = []
+    for open_time, group in sorted(buckets.items()):
+        if len(group) * (group[0]['close_time'] - group[0]['open_time'] + 1) != interval_ms:
+            continue  # Bucket tidak lengkap
+        result.append({
+            'open_time': open_time,
+            'open': group[0]['open'],
+            'high': max(c['high'] for c in group),
+            'low': min(c['low'] for c in group),
+            'close': group[-1]['close'],
+            'volume': sum(c['volume'] for c in group),
+            'close_time': open_time + interval_ms - 1,
+            'quote_asset_volume': sum(c['quote_asset_volume'] for c in group),
+            'number_of_trades': sum(c['number_of_trades'] for c in group),
+            'taker_buy_base_asset_volume': sum(c['taker_buy_base_asset_volume'] for c in group),
+            'taker_buy_quote_asset_volume': sum(c['taker_buy_quote_asset_volume'] for c in group),
+        })
+    return result
+
+class TestResample(unittest.TestCase):
+
+    def assertCandlesEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertEqual(a.keys(), e.keys())
+            for key in e:
+                self.assertAlmostEqual(a[key], e[key], delta=abs(e[key]) * 1e-12, msg=key)
+
+    def test_matches_naive_groupby(self):
+        # Dimulai di tengah jam dan berakhir di tengah jam: bucket pertama dan terakhir tidak lengkap
+        base = make_candles(1000, seed=2, start_time=START + 30 * MINUTE_MS)
+        for interval, interval_ms in (('1h', HOUR_MS), ('4h', 4 * HOUR_MS), ('1d', DAY_MS)):
+            resampled = resample_candles(base, interval).to_candles()
+            self.assertCandlesEqual(resampled, naive_resample(base, interval_ms))
+        self.assertEqual(resample_candles(base, '1h')[0]['open_time'], START + HOUR_MS)
+
+    def test_from_one_minute_candles(self):
+        base = CandleSeries.from_candles(make_candles(3 * 24 * 60, seed=3, interval_ms=MINUTE_MS, start_time=START))
+        daily = resample_candles(base, '1d')
+        self.assertEqual(len(daily), 3)
+        self.assertEqual(daily[1]['high'], float(base.high[1440:2880].max()))
+        self.assertEqual(daily[2]['number_of_trades'], int(base.column('number_of_trades')[2880:].sum()))
+
+    def test_partial_last_bucket(self):
+        base = make_candles(10, seed=4, start_time=START)
+        self.assertEqual(len(resample_candles(base, '1h')), 2)
+        partial = resample_candles(base, '1h', include_partial=True)
+        self.assertEqual(len(partial), 3)
+        self.assertEqual(partial[2]['close'], base[-1]['close'])
+
+    def test_weekly_buckets_start_on_monday(self):
+        monday = 1_699_833_600_000  # 2023-11-13 00:00 UTC (Senin)
+        self.assertEqual(bucket_open_time(monday + 3 * DAY_MS, '1w'), monday)
+
+    def test_incremental_matches_batch(self):
+        base = make_candles(800, seed=5, start_time=START + 45 * MINUTE_MS)
+        expected = resample_candles(base, '1h').to_candles()
+
+        resampler = CandleResampler('1h')
+        completed = [resampler.update(candle) for candle in base]
+        self.assertCandlesEqual([c for c in completed if c is not None], expected)
+
+        warmed = CandleResampler('1h')
+        warmed.extend(CandleSeries.from_candles(base[:500]))
+        warmed.extend(CandleSeries.from_candles(base))  # Candle yang sudah diproses dilewati
+        self.assertCandlesEqual(warmed.series().to_candles(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from candle_factory import make_candles
+from fake_binance import FakeKlineServer
+from src.data.binance_api import fetch_top_symbols
+from src.data.candle_store import CandleStore
+from src.data.resample import resample_candles
+from src.strategy.scanner import MarketScanner, chunk_symbols
+from src.strategy.signal_generator import analyze_market
+
+FIFTEEN_MINUTES = 15 * 60 * 1000
+START = 1_600_000_000_000 - 1_600_000_000_000 % FIFTEEN_MINUTES
+
+class TestScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.symbols = [f"COIN{i}USDT" for i in range(12)]
+        self.data = {}
+        for i, symbol in enumerate(self.symbols):
+            candles = make_candles(500, seed=i, start_time=START)
+            CandleStore(symbol, "15m", root=self.tmp.name).append(candles)
+            self.data[symbol] = candles
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks(self):
+        self.assertEqual(chunk_symbols(list("abcde"), 2), [['a', 'b'], ['c', 'd'], ['e']])
+
+    def test_results_match_analyze_market_and_are_ranked(self):
+        scanner = MarketScanner(self.symbols + ["EMPTYUSDT"], root=self.tmp.name, max_workers=1)
+        results = scanner.analyze()
+        self.assertEqual(set(scanner.errors), {"EMPTYUSDT"})
+        self.assertEqual(len(results), len(self.symbols))
+        confidences = [result['confidence'] for result in results]
+        self.assertEqual(confidences, sorted(confidences, reverse=True))
+        for result in results:
+            data = self.data[result['symbol']]
+            trend, confidence, indicators = analyze_market(data, resample_candles(data, "1h"))
+            self.assertEqual(result['trend'], trend)
+            self.assertAlmostEqual(result['confidence'], confidence, places=12)
+            self.assertEqual(result['close_time'], data[-1]['close_time'])
+
+    def test_process_pool_matches_in_process(self):
+        serial = MarketScanner(self.symbols, root=self.tmp.name, max_workers=1).analyze()
+        with MarketScanner(self.symbols, root=self.tmp.name, max_workers=2) as scanner:
+            parallel = scanner.analyze()
+            # Pool dipakai ulang pada scan berikutnya
+            executor = scanner.executor
+            self.assertEqual(scanner.analyze(), parallel)
+            self.assertIs(scanner.executor, executor)
+        self.assertIsNone(scanner.executor)
+        self.assertEqual([r['symbol'] for r in parallel], [r['symbol'] for r in serial])
+        self.assertEqual([r['confidence'] for r in parallel], [r['confidence'] for r in serial])
+
+    def test_sync_and_top_symbols(self):
+        with FakeKlineServer(START, START + 520 * FIFTEEN_MINUTES) as server:
+            server.tickers = [
+                {'symbol': 'COIN0USDT', 'quoteVolume': '100.0'},
+                {'symbol': 'COIN1USDT', 'quoteVolume': '900.0'},
+                {'symbol': 'COIN1BTC', 'quoteVolume': '5000.0'},
+                {'symbol': 'COIN2USDT', 'quoteVolume': '300.0'},
+            ]
+            self.assertEqual(fetch_top_symbols("USDT", 2, base_url=server.url), ['COIN1USDT', 'COIN2USDT'])
+            scanner = MarketScanner(['COIN0USDT', 'NEWUSDT'], root=self.tmp.name, max_workers=1, base_url=server.url)
+            added = scanner.sync()
+        self.assertEqual(added, {'COIN0USDT': 21, 'NEWUSDT': 521})
+        self.assertEqual(len(CandleStore('NEWUSDT', "15m", root=self.tmp.name)), 521)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import unittest
+from datetime import datetime, timezone
+from src.utils.scheduler import CandleScheduler, candle_open_time, next_candle_boundary
+
+def utc_ms(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestCandleBoundaries(unittest.TestCase):
+
+    def test_fixed_intervals(self):
+        now = utc_ms(2024, 3, 14, 10, 7, 30)
+        self.assertEqual(next_candle_boundary(now, "15m"), utc_ms(2024, 3, 14, 10, 15))
+        self.assertEqual(next_candle_boundary(now, "1h"), utc_ms(2024, 3, 14, 11))
+        self.assertEqual(next_candle_boundary(now, "4h"), utc_ms(2024, 3, 14, 12))
+        self.assertEqual(next_candle_boundary(now, "1d"), utc_ms(2024, 3, 15))
+        # Tepat di batas: candle baru saja dibuka, batas berikutnya satu interval kemudian
+        self.assertEqual(next_candle_boundary(utc_ms(2024, 3, 14, 10, 15), "15m"), utc_ms(2024, 3, 14, 10, 30))
+        self.assertEqual(candle_open_time(now, "15m"), utc_ms(2024, 3, 14, 10))
+
+    def test_week_and_month(self):
+        now = utc_ms(2024, 3, 14, 10)  # Kamis
+        self.assertEqual(candle_open_time(now, "1w"), utc_ms(2024, 3, 11))  # Senin
+        self.assertEqual(next_candle_boundary(now, "1w"), utc_ms(2024, 3, 18))
+        self.assertEqual(candle_open_time(now, "1M"), utc_ms(2024, 3, 1))
+        self.assertEqual(next_candle_boundary(now, "1M"), utc_ms(2024, 4, 1))
+        self.assertEqual(next_candle_boundary(utc_ms(2024, 12, 31, 23), "1M"), utc_ms(2025, 1, 1))
+        with self.assertRaises(ValueError):
+            CandleScheduler().add_job("x", "7x", lambda close_time: True)
+
+class TestCandleScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(utc_ms(2024, 3, 14, 10, 7, 30) / 1000)
+        self.scheduler = CandleScheduler(grace_seconds=2.0, retry_seconds=1.0, max_retries=2, clock=self.clock)
+        self.calls = []
+
+    def job(self, name, result=True):
+        def callback(close_time):
+            self.calls.append((name, close_time))
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return callback
+
+    def test_jobs_wake_at_boundary_plus_grace(self):
+        self.scheduler.add_job(("BTCUSDT", "15m"), "15m", self.job("btc"))
+        self.scheduler.add_job(("ETHUSDT", "15m"), "15m", self.job("eth"))
+        self.scheduler.add_job(("BTCUSDT", "1h"), "1h", self.job("btc1h"))
+        boundary = utc_ms(2024, 3, 14, 10, 15) / 1000
+        self.assertEqual(self.scheduler.next_due(), boundary + 2.0)
+        self.assertEqual(self.scheduler.run_pending(), 0)
+
+        # Pemrosesan lambat tidak menggeser jadwal berikutnya
+        self.clock.now = boundary + 2.5
+        self.assertEqual(self.scheduler.run_pending(), 2)
+        self.assertEqual(self.calls, [("btc", utc_ms(2024, 3, 14, 10, 15) - 1), ("eth", utc_ms(2024, 3, 14, 10, 15) - 1)])
+        self.assertEqual(self.scheduler.next_due(), boundary + 15 * 60 + 2.0)
+
+        self.clock.now = utc_ms(2024, 3, 14, 11, 0, 3) / 1000
+        self.assertEqual(self.scheduler.run_pending(), 3)
+        self.assertIn(("btc1h", utc_ms(2024, 3, 14, 11) - 1), self.calls)
+
+    def test_run_now_processes_last_closed_candle(self):
+        self.scheduler.add_job("btc", "15m", self.job("btc"), run_now=True)
+        self.scheduler.run_pending()
+        self.assertEqual(self.calls, [("btc", utc_ms(2024, 3, 14, 10) - 1)])
+
+    def test_retry_until_candle_closed(self):
+        self.scheduler.add_job("btc", "15m", self.job("btc", result=False))
+        boundary = utc_ms(2024, 3, 14, 10, 15) / 1000
+        for attempt in range(3):
+            self.clock.now = self.scheduler.next_due()
+            self.scheduler.run_pending()
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual({close_time for _, close_time in self.calls}, {utc_ms(2024, 3, 14, 10, 15) - 1})
+        self.assertEqual(self.clock.now, boundary + 2.0 + 2 * 1.0)
+        # Batas percobaan habis: menunggu candle berikutnya
+        self.assertEqual(self.scheduler.next_due(), boundary + 15 * 60 + 2.0)
+
+    def test_failing_job_is_retried_and_removed_job_skipped(self):
+        self.scheduler.add_job("bad", "15m", self.job("bad", result=RuntimeError("boom")))
+        self.scheduler.add_job("gone", "15m", self.job("gone"))
+        self.scheduler.remove_job("gone")
+        self.clock.now = self.scheduler.next_due()
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        self.assertEqual(self.scheduler.next_due(), self.clock.now + 1.0)
+
+    def test_run_and_stop(self):
+        scheduler = CandleScheduler(grace_seconds=0.05)
+        fired = threading.Event()
+        scheduler.add_job("fast", "1s", lambda close_time: fired.set() or True)
+        thread = threading.Thread(target=scheduler.run)
+        thread.start()
+        self.assertTrue(fired.wait(3))
+        scheduler.stop()
+        thread.join(3)
+        self.assertFalse(thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import json
+import math
+import unittest
+from unittest import mock
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.data.resample import resample_candles
+from src.indicators.technical import calculate_rsi, calculate_ema, calculate_macd, calculate_adx
+from src.indicators.atr import calculate_atr
+from src.indicators.streaming import (
+    StreamingEMA, StreamingRSI, StreamingATR, StreamingADX, StreamingMACD, StreamingIndicatorSet
+)
+from src.strategy.signal_generator import StreamingMarketAnalyzer, analyze_market, sync_streaming_analyzer
+
+HOUR_ALIGNED_START = 1_699_999_200_000
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(260)
+
+    def test_values_match_scalar_functions(self):
+        """Nilai setelah setiap update sama dengan fungsi skalar pada data[:i+1]"""
+        ema, rsi, atr, adx, macd = StreamingEMA(26), StreamingRSI(), StreamingATR(), StreamingADX(), StreamingMACD()
+        for i, candle in enumerate(self.data):
+            for indicator in (ema, rsi, atr, adx, macd):
+                indicator.update(candle)
+            window = self.data[:i + 1]
+            closes = [c['close'] for c in window]
+            self.assertAlmostEqual(ema.value, calculate_ema(closes, 26), places=8)
+            self.assertAlmostEqual(rsi.value, calculate_rsi(closes), places=8)
+            self.assertAlmostEqual(atr.value, calculate_atr(window), places=8)
+            expected_adx = calculate_adx([c['high'] for c in window], [c['low'] for c in window], closes)
+            self.assertAlmostEqual(adx.value, expected_adx, places=8)
+            for actual, expected in zip(macd.value, calculate_macd(closes)):
+                self.assertAlmostEqual(actual, expected, places=8)
+
+    def test_snapshot_restore_resumes_without_warmup(self):
+        indicators = StreamingIndicatorSet()
+        for candle in self.data[:200]:
+            indicators.update(candle)
+
+        state = json.loads(json.dumps(indicators.snapshot()))
+        restored = StreamingIndicatorSet.restore(state)
+        for candle in self.data[200:]:
+            indicators.update(candle)
+            restored.update(candle)
+        self.assertEqual(restored.values, indicators.values)
+
+    def test_restore_requires_ngtcv_state(self):
+        indicators = StreamingIndicatorSet()
+        for candle in self.data[:30]:
+            indicators.update(candle)
+        state = indicators.snapshot()
+        del state['ngtcv']
+        with self.assertRaises(KeyError):
+            StreamingIndicatorSet.restore(state)
+
+    def test_duplicate_candle_is_ignored(self):
+        indicators = StreamingIndicatorSet()
+        for candle in self.data[:50]:
+            indicators.update(candle)
+        before = indicators.values
+        self.assertFalse(indicators.update(self.data[49]))
+        self.assertEqual(indicators.values, before)
+
+    def test_values_do_not_rescan_windows(self):
+        indicators = StreamingIndicatorSet()
+        for candle in self.data[:-50]:
+            indicators.update(candle)
+        rescan = AssertionError("window dijumlah ulang")
+        with mock.patch('builtins.sum', side_effect=rescan), \
+                mock.patch('src.indicators.ngtcv.calculate_average_volume', side_effect=rescan):
+            for candle in self.data[-50:]:
+                indicators.update(candle)
+            indicators.values
+
+    def test_running_sums_stay_accurate_over_long_streams(self):
+        data = make_candles(5000, seed=11)
+        rsi, atr, macd = StreamingRSI(), StreamingATR(), StreamingMACD()
+        for candle in data:
+            for indicator in (rsi, atr, macd):
+                indicator.update(candle)
+        closes = [c['close'] for c in data]
+        self.assertAlmostEqual(rsi.value, calculate_rsi(closes), places=8)
+        self.assertAlmostEqual(atr.value, calculate_atr(data), places=8)
+        for actual, expected in zip(macd.value, calculate_macd(closes)):
+            self.assertAlmostEqual(actual, expected, places=8)
+
+def assert_same_analysis(test, actual, expected):
+    test.assertEqual(actual[0], expected[0])
+    test.assertAlmostEqual(actual[1], expected[1], places=9)
+    test.assertEqual(set(actual[2]), set(expected[2]))
+    for key, value in expected[2].items():
+        if isinstance(value, float):
+            test.assertTrue(math.isclose(actual[2][key], value, rel_tol=1e-9, abs_tol=1e-9), key)
+        else:
+            test.assertEqual(actual[2][key], value, key)
+
+class TestStreamingMarketAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(500, seed=5, start_time=HOUR_ALIGNED_START)
+
+    def test_matches_analyze_market_per_candle(self):
+        analyzer = StreamingMarketAnalyzer('1h', window=1000)
+        for i, candle in enumerate(self.data):
+            analyzer.update(candle)
+            if i >= 190:
+                window = self.data[:i + 1]
+                assert_same_analysis(self, analyzer.analyze(), analyze_market(window, resample_candles(window, '1h')))
+
+    def test_window_shorter_than_stream(self):
+        """
+        Level support/resistance, RSI, ATR, ngtCV dan engulfing mengikuti window terakhir;
+        EMA, MACD, ADX dan EMA 50 higher timeframe berlanjut sepanjang stream
+        """
+        analyzer = StreamingMarketAnalyzer('1h', window=250)
+        windowed_keys = ('rsi', 'atr', 'ngtcv', 'sr_position', 'is_bullish_engulfing', 'is_bearish_engulfing')
+        stream_keys = ('ema_short', 'ema_long', 'ema_trend_long', 'macd_line', 'signal_line', 'macd_histogram', 'adx')
+        for i, candle in enumerate(self.data):
+            analyzer.update(candle)
+            if i < 249:
+                continue
+            actual = analyzer.analyze()[2]
+            window, history = self.data[i - 249:i + 1], self.data[:i + 1]
+            for keys, data in ((windowed_keys, window), (stream_keys, history)):
+                expected = analyze_market(data, resample_candles(data, '1h'))[2]
+                for key in keys:
+                    if key not in actual or key not in expected:
+                        continue
+                    if isinstance(expected[key], float):
+                        self.assertTrue(math.isclose(actual[key], expected[key], rel_tol=1e-9, abs_tol=1e-9), (i, key))
+                    else:
+                        self.assertEqual(actual[key], expected[key], (i, key))
+
+    def test_ngtcv_average_rejects_other_counts(self):
+        analyzer = StreamingMarketAnalyzer('1h', window=300)
+        for candle in self.data[:10]:
+            analyzer.update(candle)
+        self.assertEqual(analyzer.ngtcv_average(3), analyzer.indicators.ngtcv.value)
+        with self.assertRaises(ValueError):
+            analyzer.ngtcv_average(5)
+
+    def test_snapshot_restore_resumes_without_warmup(self):
+        analyzer = StreamingMarketAnalyzer('1h', window=300)
+        for candle in self.data[:350]:
+            analyzer.update(candle)
+        restored = StreamingMarketAnalyzer.restore(json.loads(json.dumps(analyzer.snapshot())))
+        for candle in self.data[350:]:
+            analyzer.update(candle)
+            restored.update(candle)
+            self.assertEqual(restored.analyze(), analyzer.analyze())
+
+    def test_sync_processes_only_new_candles(self):
+        series = CandleSeries.from_candles(self.data)
+        analyzer = sync_streaming_analyzer(StreamingMarketAnalyzer('1h', window=300), series[:400])
+        self.assertEqual(analyzer.count, 300)  # Warm-up dari window terakhir
+        window = self.data[100:400]
+        assert_same_analysis(self, analyzer.analyze(), analyze_market(window, resample_candles(window, '1h')))
+
+        with mock.patch.object(analyzer, 'update', wraps=analyzer.update) as update:
+            self.assertIs(sync_streaming_analyzer(analyzer, series), analyzer)
+        self.assertEqual(update.call_count, 100)
+        # Analyzer yang tidak bersambung dengan series diganti dan di-warm-up ulang
+        self.assertIsNot(sync_streaming_analyzer(analyzer, series[:250]), analyzer)
+
+if __name__ == '__main__':
+    unittest.main()
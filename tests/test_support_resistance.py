@@ -0,0 +1,88 @@
+import json
+import unittest
+from unittest import mock
+import numpy as np
+from candle_factory import make_candles
+from src.indicators.pipeline import IndicatorPipeline
+from src.indicators.support_resistance import (
+    rolling_min, rolling_max, detect_pivots, find_pivot_points, PivotDetector,
+    get_nearest_support_resistance, is_near_support_resistance
+)
+
+def naive_pivot_points(data, period=10):
+    """Implementasi loop bersarang lama sebagai referensi"""
+    highs = [c['high'] for c in data]
+    lows = [c['low'] for c in data]
+    supports, resistances = [], []
+    for i in range(period, len(data) - period):
+        window = [j for j in range(i - period, i + period + 1) if j != i]
+        if all(lows[j] > lows[i] for j in window):
+            supports.append(lows[i])
+        elif all(highs[j] < highs[i] for j in window):
+            resistances.append(highs[i])
+    return supports, resistances
+
+class TestSupportResistance(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(400, seed=3)
+
+    def test_rolling_extremes_match_naive(self):
+        values = np.random.default_rng(1).normal(size=103)
+        for window in (1, 4, 10, 103):
+            expected_min = [values[i:i + window].min() for i in range(len(values) - window + 1)]
+            expected_max = [values[i:i + window].max() for i in range(len(values) - window + 1)]
+            np.testing.assert_array_equal(rolling_min(values, window), expected_min)
+            np.testing.assert_array_equal(rolling_max(values, window), expected_max)
+
+    def test_pivots_match_nested_loop(self):
+        for period in (3, 10):
+            self.assertEqual(find_pivot_points(self.data, period), naive_pivot_points(self.data, period))
+
+    def test_equal_lows_are_not_pivots(self):
+        lows = np.array([5, 4, 3, 2, 2, 3, 4, 5], dtype=float)
+        is_low, _ = detect_pivots(lows + 10, lows, period=2)
+        self.assertFalse(is_low.any())
+
+    def test_incremental_detector_matches_full_rescan(self):
+        detector = PivotDetector()
+        for i, candle in enumerate(self.data):
+            detector.update(candle)
+            price = candle['close']
+            window = self.data[:i + 1]
+            self.assertEqual(detector.nearest(price), get_nearest_support_resistance(price, window))
+            self.assertEqual(detector.position(price), is_near_support_resistance(price, window))
+
+    def test_windowed_detector_matches_window_rescan(self):
+        detector = PivotDetector(window=120)
+        for i, candle in enumerate(self.data):
+            detector.update(candle)
+            price = candle['close']
+            window = self.data[max(0, i + 1 - 120):i + 1]
+            self.assertEqual(detector.nearest(price), get_nearest_support_resistance(price, window))
+
+    def test_snapshot_restore_continues_detection(self):
+        detector = PivotDetector(window=120)
+        for candle in self.data[:250]:
+            detector.update(candle)
+        restored = PivotDetector.restore(json.loads(json.dumps(detector.snapshot())))
+        for candle in self.data[250:]:
+            detector.update(candle)
+            restored.update(candle)
+            self.assertEqual(restored.nearest(candle['close']), detector.nearest(candle['close']))
+
+    def test_pipeline_reads_levels_from_matching_detector(self):
+        window = self.data[-150:]
+        detector = PivotDetector(window=150)
+        for candle in self.data:
+            detector.update(candle)
+        expected = IndicatorPipeline(window).support_resistance()
+        with mock.patch('src.indicators.pipeline.detect_pivots') as rescan:
+            self.assertEqual(IndicatorPipeline(window, pivots=detector).support_resistance(), expected)
+        rescan.assert_not_called()
+        # Detektor yang tidak mengikuti window ini diabaikan
+        self.assertEqual(IndicatorPipeline(window[:-1], pivots=detector).support_resistance(),
+                         IndicatorPipeline(window[:-1]).support_resistance())
+
+if __name__ == '__main__':
+    unittest.main()
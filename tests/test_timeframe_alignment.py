@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.data.candle_series import CandleSeries
+from src.data.timeframe_alignment import TimeframeAlignment, last_closed_index, closed_higher_window
+from src.indicators.full_history import ema_history
+from src.indicators.technical import calculate_ema
+from src.strategy.signal_generator import analyze_market, analyze_market_history
+
+HOUR_MS = 60 * 60 * 1000
+
+class TestTimeframeAlignment(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_candles(400, seed=4)
+        self.higher = make_candles(120, seed=5, interval_ms=HOUR_MS)
+
+    def test_maps_to_last_closed_higher_bar(self):
+        alignment = TimeframeAlignment(self.data, self.higher)
+        for i, candle in enumerate(self.data):
+            closed = [j for j, h in enumerate(self.higher) if h['close_time'] <= candle['close_time']]
+            self.assertEqual(alignment.higher_index_at(i), closed[-1] if closed else -1)
+        # Candle 15m ke-4 menutup bersamaan dengan candle 1h pertama
+        self.assertEqual(alignment.higher_index_at(2), -1)
+        self.assertEqual(alignment.higher_index_at(3), 0)
+        self.assertEqual(last_closed_index([10, 20, 30], 25), 1)
+
+    def test_aligned_ema_has_no_lookahead(self):
+        alignment = TimeframeAlignment(CandleSeries.from_candles(self.data), CandleSeries.from_candles(self.higher))
+        higher_closes = [h['close'] for h in self.higher]
+        aligned = alignment.align(ema_history(higher_closes, 50), min_closed=50)
+        for i in range(len(self.data)):
+            window = closed_higher_window(self.higher, self.data[i]['close_time'])
+            if len(window) < 50:
+                self.assertTrue(np.isnan(aligned[i]))
+            else:
+                self.assertAlmostEqual(aligned[i], calculate_ema([h['close'] for h in window], 50), places=8)
+
+    def test_future_higher_candles_do_not_change_analysis(self):
+        history = analyze_market_history(self.data, self.higher)
+        i = 300
+        closed = closed_higher_window(self.higher, self.data[i]['close_time'])
+        self.assertEqual(analyze_market(self.data[:i + 1], self.higher), analyze_market(self.data[:i + 1], closed))
+        expected_ema = calculate_ema([h['close'] for h in closed], 50)
+        self.assertAlmostEqual(history['higher_ema_50'][i], expected_ema, places=8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from candle_factory import make_candles
+from src.backtest.engine import run_signal_backtest
+from src.backtest.sweep import sweep_arrays, backtest_parameters
+from src.backtest.walk_forward import walk_forward_windows, run_walk_forward
+from src.data.candle_series import CandleSeries
+from src.strategy.signal_generator import score_market_history
+
+class TestWalkForward(unittest.TestCase):
+
+    def setUp(self):
+        self.data = CandleSeries.from_candles(make_candles(1400, seed=5))
+        self.higher = CandleSeries.from_candles(make_candles(360, seed=55, interval_ms=60 * 60 * 1000))
+        self.grid = {'min_confidence': [0.3, 0.5], 'atr_multiplier_tp': [2, 3]}
+
+    def test_windows(self):
+        windows = walk_forward_windows(1000, train_bars=400, test_bars=250, start=100)
+        self.assertEqual(windows, [(100, 500, 500, 750), (350, 750, 750, 1000)])
+        self.assertEqual(walk_forward_windows(1000, train_bars=400, test_bars=300, start=100)[-1], (400, 800, 800, 1000))
+        self.assertEqual(walk_forward_windows(300, train_bars=400, test_bars=100), [])
+
+    def test_slice_matches_full_history(self):
+        """Backtest atas potongan array sama dengan sinyal histori penuh yang dipotong"""
+        arrays = sweep_arrays(self.data, self.higher)
+        history = {key: values for key, values in arrays.items() if not key.startswith('candle_')}
+        signals = score_market_history(history, min_confidence=0.3)['signal']
+        score_params = {'min_confidence': 0.3}
+        trade_params = [{'atr_multiplier_sl': 2, 'atr_multiplier_tp': 3}]
+        for start, stop in ((0, 700), (150, 900), (700, 1400)):
+            result = backtest_parameters(arrays, score_params, trade_params, None, start, stop)[0]
+            expected = run_signal_backtest(self.data[start:stop], signals[start:stop], history['atr'][start:stop])
+            self.assertEqual(result['trades'], expected['trades'])
+            np.testing.assert_allclose(result['equity'], expected['equity'])
+
+    def test_walk_forward(self):
+        result = run_walk_forward(self.data, self.grid, self.higher, train_bars=500, test_bars=200, max_workers=1)
+        windows = result['windows']
+        self.assertEqual(len(windows), 4)
+        self.assertEqual(windows[0]['train_start'], 199)
+        for previous, window in zip(windows, windows[1:]):
+            self.assertEqual(window['test_start'], previous['test_end'])
+        self.assertEqual(len(result['equity']), len(result['equity_index']))
+        self.assertEqual(result['equity_index'][0], windows[0]['test_start'])
+        self.assertEqual(result['equity_index'][-1], len(self.data) - 1)
+
+        # Trade out-of-sample berada di dalam window test masing-masing (index histori penuh)
+        for trade in result['trades']:
+            self.assertTrue(any(w['test_start'] <= trade['entry_index'] <= trade['exit_index'] < w['test_end'] for w in windows))
+        self.assertGreater(len(result['trades']), 0)
+        total_pnl = sum(trade['pnl'] for trade in result['trades'])
+        self.assertAlmostEqual(result['equity'][-1], 10000.0 + total_pnl, places=6)
+        self.assertAlmostEqual(result['stats']['net_pnl'], total_pnl, places=6)
+        self.assertAlmostEqual(sum(w['test_stats']['net_pnl'] for w in windows), total_pnl, places=6)
+
+        parallel = run_walk_forward(self.data, self.grid, self.higher, train_bars=500, test_bars=200, max_workers=2)
+        self.assertEqual(parallel['windows'], windows)
+        self.assertEqual(parallel['trades'], result['trades'])
+
+    def test_data_too_short(self):
+        with self.assertRaises(ValueError):
+            run_walk_forward(self.data[:600], self.grid, train_bars=500, test_bars=200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,16 @@
-import time
 import sys
 import json
 from datetime import datetime
 from typing import Optional, Tuple
 
 # Import modules
-from config import SYMBOL, INTERVAL, LIMIT, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from config import SYMBOL, INTERVAL, HIGHER_INTERVAL, LIMIT, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 from src.utils.logger import setup_logger
-from src.data.binance_api import fetch_ohlcv_data
-from src.strategy.signal_generator import analyze_market, generate_signal, evaluate_prediction
+from src.data.candle_store import CandleStore, sync_candle_store
+from src.strategy.signal_generator import (StreamingMarketAnalyzer, sync_streaming_analyzer, generate_signal,
+                                           evaluate_prediction)
 from src.notifications.telegram import send_telegram, format_signal_message
+from src.utils.scheduler import CandleScheduler
 
 # Setup logger
 logger = setup_logger()
@@ -23,9 +24,7 @@ class TradingBot:
     """
     def __init__(self):
         self.logger = setup_logger()
-        self.sleep_seconds = 900  # 15m default
-        if INTERVAL == "1h":
-            self.sleep_seconds = 3600
+        self.scheduler: Optional[CandleScheduler] = None
 
         # Initialize prediction stats
         self.prediction_stats = {
@@ -35,6 +34,11 @@ class TradingBot:
             'win_rate': 0.0
         }
 
+        # Candle store lokal: setiap siklus hanya candle baru yang diunduh
+        self.candle_store = CandleStore(SYMBOL, INTERVAL)
+        # Indikator, pivot dan higher timeframe diperbarui inkremental per candle tertutup (state ikut disimpan)
+        self.analyzer = StreamingMarketAnalyzer(HIGHER_INTERVAL, LIMIT)
+
         # Initialize state
         self.previous_prediction = None
         self.previous_candle = None
@@ -56,100 +60,108 @@ class TradingBot:
         send_telegram(f"🚀 Bot Started\nSymbol: {SYMBOL}\nInterval: {INTERVAL}", TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
 
         # Load state from file if available
-        self.previous_prediction, self.previous_candle, self.prediction_stats = load_state()
+        self.previous_prediction, self.previous_candle, self.prediction_stats, analyzer_state = load_state()
+        if analyzer_state:
+            try:
+                self.analyzer = StreamingMarketAnalyzer.restore(analyzer_state)
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.error(f"Error restoring analyzer state: {e}, warming up from candle store")
 
         self.main_loop()
 
     def main_loop(self):
         """
-        Main execution loop
+        Main execution loop: analisis dijalankan tepat setelah setiap candle INTERVAL tertutup
         """
-        while True:
-            try:
-                self.logger.info(f"Fetching data...")
-                data = fetch_ohlcv_data(SYMBOL, INTERVAL, LIMIT)
-
-                if not data:
-                    self.logger.warning("No data received, retrying in 60s...")
-                    time.sleep(60)
-                    continue
-
-                current_candle = data[-1]
-                current_price = current_candle['close']
-
-                # 1. Evaluate Previous Prediction
-                if self.previous_prediction and self.previous_candle:
-                    # Ambil ATR dari indikator sebelumnya jika tersedia
-                    atr_value = self.previous_indicators.get('atr') if hasattr(self, 'previous_indicators') else None
-                    is_correct, pct_change = evaluate_prediction(self.previous_candle, current_candle, self.previous_prediction, atr_value)
-
-                    if is_correct is not None:
-                        if is_correct:
-                            self.prediction_stats['correct'] += 1
-                            self.logger.info(f"✅ Prediction CORRECT (+{pct_change:.2f}%)")
-                        else:
-                            self.prediction_stats['incorrect'] += 1
-                            self.logger.info(f"❌ Prediction INCORRECT (-{pct_change:.2f}%)")
-
-                        self.prediction_stats['total'] += 1
-                        self.prediction_stats['win_rate'] = (self.prediction_stats['correct'] / self.prediction_stats['total']) * 100
-
-                        # Send accuracy update
-                        acc_msg = f"📊 Accuracy Update:\nWin Rate: {self.prediction_stats['win_rate']:.1f}%\n({self.prediction_stats['correct']}/{self.prediction_stats['total']})"
-                        send_telegram(acc_msg, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
-
-                        # Save state after updating stats
-                        save_state(self.previous_prediction, self.previous_candle, self.prediction_stats)
-
-                # 2. Analyze Market
-                trend, confidence, indicators = analyze_market(data)
-                self.logger.info(f"Analysis: {trend} (Conf: {confidence:.2f}) | RSI: {indicators.get('rsi', 0):.1f}")
-                
-                # 3. Generate Signal
-                signal, conf = generate_signal((trend, confidence, indicators))
-                
-                if signal != "HOLD":
-                    self.logger.info(f"🔔 SIGNAL: {signal}")
-                    # Tambahkan informasi posisi terhadap support/resistance ke dalam pesan
-                    sr_position = indicators.get('sr_position', 'AWAY_FROM_LEVELS')
-                    msg = format_signal_message(SYMBOL, INTERVAL, signal, conf, current_price, indicators, sr_position)
-                    send_telegram(msg, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
-                
-                # 4. Store State
-                self.previous_prediction = (signal, conf)
-                self.previous_candle = current_candle
-                self.previous_indicators = indicators
-                
-                # Save state to file
-                save_state(self.previous_prediction, self.previous_candle, self.prediction_stats)
-
-                # Wait for next candle with interruptible sleep
-                self.logger.info(f"Waiting {self.sleep_seconds}s...")
-                # Use a loop with short sleep intervals to allow interruption
-                slept = 0
-                sleep_interval = 1  # 1 second intervals
-                while slept < self.sleep_seconds:
-                    time.sleep(sleep_interval)
-                    slept += sleep_interval
-                    # Check for keyboard interrupt in each iteration
-                    if slept % 10 == 0:  # Every 10 seconds, log remaining time
-                        self.logger.debug(f"Sleeping... {self.sleep_seconds - slept}s remaining")
-
-            except KeyboardInterrupt:
-                self.logger.info("Bot stopped by user")
-                send_telegram("🛑 Bot Stopped", TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected error: {e}", exc_info=True)
-                time.sleep(60)
-
-def save_state(previous_prediction, previous_candle, prediction_stats):
+        self.scheduler = CandleScheduler()
+        # Candle terakhir yang sudah tertutup langsung diproses saat start
+        self.scheduler.add_job((SYMBOL, INTERVAL), INTERVAL, self.on_candle_close, run_now=True)
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            self.logger.info("Bot stopped by user")
+            send_telegram("🛑 Bot Stopped", TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+
+    def on_candle_close(self, close_time: int) -> bool:
+        """
+        Dipanggil scheduler setelah batas interval. Candle dengan close_time tersebut harus sudah
+        tertutup dan tersimpan di candle store sebelum dianalisis.
+        Returns: False jika candle belum tersedia (scheduler mencoba lagi)
+        """
+        self.logger.info(f"Fetching data...")
+        sync_candle_store(self.candle_store)
+        last_close_time = self.candle_store.last_close_time()
+        if last_close_time is None or last_close_time < close_time:
+            self.logger.info(f"Candle {close_time} belum tertutup di Binance, menunggu...")
+            return False
+        if self.previous_candle and self.previous_candle['close_time'] >= last_close_time:
+            self.logger.info("Candle terakhir sudah diproses")
+            return True
+
+        self.analyzer = sync_streaming_analyzer(self.analyzer, self.candle_store.series())
+        self.process_candle(self.candle_store.tail(1)[0])
+        return True
+
+    def process_candle(self, current_candle):
+        """
+        Evaluasi prediksi sebelumnya, analisis candle terakhir yang tertutup, kirim sinyal, simpan state
+        """
+        current_price = current_candle['close']
+
+        # 1. Evaluate Previous Prediction
+        if self.previous_prediction and self.previous_candle:
+            # Ambil ATR dari indikator sebelumnya jika tersedia
+            atr_value = self.previous_indicators.get('atr') if hasattr(self, 'previous_indicators') else None
+            is_correct, pct_change = evaluate_prediction(self.previous_candle, current_candle, self.previous_prediction, atr_value)
+
+            if is_correct is not None:
+                if is_correct:
+                    self.prediction_stats['correct'] += 1
+                    self.logger.info(f"✅ Prediction CORRECT (+{pct_change:.2f}%)")
+                else:
+                    self.prediction_stats['incorrect'] += 1
+                    self.logger.info(f"❌ Prediction INCORRECT (-{pct_change:.2f}%)")
+
+                self.prediction_stats['total'] += 1
+                self.prediction_stats['win_rate'] = (self.prediction_stats['correct'] / self.prediction_stats['total']) * 100
+
+                # Send accuracy update
+                acc_msg = f"📊 Accuracy Update:\nWin Rate: {self.prediction_stats['win_rate']:.1f}%\n({self.prediction_stats['correct']}/{self.prediction_stats['total']})"
+                send_telegram(acc_msg, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+
+                # Save state after updating stats
+                save_state(self.previous_prediction, self.previous_candle, self.prediction_stats, self.analyzer.snapshot())
+
+        # 2. Analyze Market
+        trend, confidence, indicators = self.analyzer.analyze()
+        self.logger.info(f"Analysis: {trend} (Conf: {confidence:.2f}) | RSI: {indicators.get('rsi', 0):.1f}")
+
+        # 3. Generate Signal
+        signal, conf = generate_signal((trend, confidence, indicators))
+
+        if signal != "HOLD":
+            self.logger.info(f"🔔 SIGNAL: {signal}")
+            # Tambahkan informasi posisi terhadap support/resistance ke dalam pesan
+            sr_position = indicators.get('sr_position', 'AWAY_FROM_LEVELS')
+            msg = format_signal_message(SYMBOL, INTERVAL, signal, conf, current_price, indicators, sr_position)
+            send_telegram(msg, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+
+        # 4. Store State
+        self.previous_prediction = (signal, conf)
+        self.previous_candle = current_candle
+        self.previous_indicators = indicators
+
+        # Save state to file
+        save_state(self.previous_prediction, self.previous_candle, self.prediction_stats, self.analyzer.snapshot())
+
+def save_state(previous_prediction, previous_candle, prediction_stats, analyzer_state=None):
     """Save bot state to JSON file"""
     try:
         state = {
             'previous_prediction': previous_prediction,
             'previous_candle': previous_candle,
-            'prediction_stats': prediction_stats
+            'prediction_stats': prediction_stats,
+            'analyzer': analyzer_state
         }
         # Create directory if it doesn't exist
         import os
@@ -171,7 +183,7 @@ def load_state():
                 'incorrect': 0,
                 'total': 0,
                 'win_rate': 0.0
-            })
+            }), state.get('analyzer')
     except FileNotFoundError:
         logger.info("State file not found, starting with fresh state")
         return None, None, {
@@ -179,7 +191,7 @@ def load_state():
             'incorrect': 0,
             'total': 0,
             'win_rate': 0.0
-        }
+        }, None
     except Exception as e:
         logger.error(f"Error loading state: {e}, starting with fresh state")
         return None, None, {
@@ -187,7 +199,7 @@ def load_state():
             'incorrect': 0,
             'total': 0,
             'win_rate': 0.0
-        }
+        }, None
 
 def main_loop():
     """
@@ -0,0 +1,45 @@
+import datetime
+import logging
+import sys
+from backtest import load_backtest_data
+from parameter_sweep import PARAMETER_GRID
+from src.backtest.walk_forward import run_walk_forward
+from config import SYMBOL, INTERVAL, WALK_FORWARD_TRAIN_BARS, WALK_FORWARD_TEST_BARS
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger()
+
+def format_time(timestamp_ms: int) -> str:
+    return datetime.datetime.fromtimestamp(timestamp_ms / 1000).strftime('%Y-%m-%d %H:%M')
+
+def run(days: int = 90):
+    logger.info(f"Starting walk-forward optimization for {SYMBOL} {INTERVAL} ({days} days)...")
+    data, higher_timeframe_data = load_backtest_data(days)
+    if not data:
+        logger.error("Failed to fetch data")
+        return
+
+    result = run_walk_forward(data, PARAMETER_GRID, higher_timeframe_data)
+    close_times = data.close_time
+    logger.info("-" * 40)
+    logger.info(f"WALK-FORWARD RESULTS (train {WALK_FORWARD_TRAIN_BARS} / test {WALK_FORWARD_TEST_BARS} candles)")
+    logger.info("-" * 40)
+    for window in result['windows']:
+        test = window['test_stats']
+        logger.info(f"{format_time(close_times[window['test_start']])} - {format_time(close_times[window['test_end'] - 1])} | "
+                    f"Train PnL: {window['train_stats']['net_pnl']:.2f} | Test PnL: {test['net_pnl']:.2f} "
+                    f"({test['total_trades']} trades, win {test['win_rate']:.1f}%) | Params: {window['params']}")
+
+    stats = result['stats']
+    logger.info("-" * 40)
+    logger.info(f"Out-of-sample trades: {stats['total_trades']}")
+    logger.info(f"Win Rate: {stats['win_rate']:.2f}%")
+    logger.info(f"Net PnL: {stats['net_pnl']:.2f} ({stats['net_pnl_pct']:.2f}%)")
+    logger.info(f"Profit Factor: {stats['profit_factor']:.2f}")
+    logger.info(f"Max Drawdown: {stats['max_drawdown_pct']:.2f}%")
+    logger.info("-" * 40)
+    return result
+
+if __name__ == "__main__":
+    # Opsional: python walk_forward.py <jumlah_hari>
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 90)